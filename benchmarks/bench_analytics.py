@@ -0,0 +1,106 @@
+"""
+Compare the SQL and columnar analytics engines and measure the snapshot's footprint.
+
+Usage (from the repository root):
+    python benchmarks/bench_analytics.py --employees 100000 1000000
+
+For each size it seeds one SQLite database and times, on an app per engine:
+  summary:    /salary-metrics/summary with per-pair metrics
+  by-country: exact median and percentiles of one country
+  histogram:  20 buckets over all salaries
+  payroll:    the full /payroll/run stream
+It also reports the snapshot rebuild, save and memory-mapped load times, the
+catch-up time after a bulk salary adjustment, and the bytes per employee.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from datagen import generate_employees  # noqa: E402
+from app import create_app, db  # noqa: E402
+from services import (  # noqa: E402
+    bulk_adjust_salaries_service,
+    create_employees_bulk_service,
+    get_salary_histogram,
+    get_salary_metrics_by_country,
+    get_salary_metrics_summary,
+    rebuild_analytics_snapshot_service,
+    run_payroll_service
+)
+
+
+def _best_of(repeats: int, run) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+        db.session.remove()
+    return best * 1000
+
+
+def _timed(run) -> float:
+    started = time.perf_counter()
+    run()
+    return (time.perf_counter() - started) * 1000
+
+
+def _cases():
+    return {
+        'summary': lambda: get_salary_metrics_summary(include_pairs=True),
+        'by-country': lambda: get_salary_metrics_by_country('India', exact=True),
+        'histogram': lambda: get_salary_histogram(bucket_count=20),
+        'payroll': lambda: sum(1 for _ in run_payroll_service())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    
+    for size in args.employees:
+        with tempfile.TemporaryDirectory() as tmp:
+            config = {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}", 'METRICS_ENABLED': False}
+            snapshot_path = os.path.join(tmp, 'snapshot')
+            sql_app = create_app(config)
+            columnar_app = create_app({**config, 'ANALYTICS_ENGINE': 'columnar'})
+            warm_app = create_app({**config, 'ANALYTICS_ENGINE': 'columnar', 'ANALYTICS_SNAPSHOT_PATH': snapshot_path})
+            
+            with sql_app.app_context():
+                db.create_all()
+                create_employees_bulk_service(generate_employees(size), chunk_size=5000)
+                sql = {name: _best_of(args.repeats, run) for name, run in _cases().items()}
+            
+            with columnar_app.app_context():
+                rebuild = _timed(rebuild_analytics_snapshot_service)
+                columnar = {name: _best_of(args.repeats, run) for name, run in _cases().items()}
+                snapshot = columnar_app.extensions['analytics_snapshot']
+                save = _timed(lambda: snapshot.save(snapshot_path))
+                stats = snapshot.stats()
+                adjusted = bulk_adjust_salaries_service(country='Canada', percent=1)['affected']
+                db.session.remove()
+                catch_up = _timed(lambda: get_salary_metrics_summary())
+            
+            with warm_app.app_context():
+                warm_load = _timed(lambda: get_salary_metrics_summary())
+            
+            print(f'{size} employees:')
+            for name in sql:
+                print(f'  {name:<12} sql {sql[name]:9.1f} ms   columnar {columnar[name]:9.1f} ms  '
+                      f'({sql[name] / columnar[name]:.1f}x)')
+            print(f"  snapshot: {stats['bytes'] / 2 ** 20:.1f} MiB, {stats['bytes_per_row']} bytes per employee "
+                  f"({stats['bytes_per_row'] * 10 ** 6 / 2 ** 20:.1f} MiB per million)")
+            print(f'  rebuild {rebuild:.0f} ms, save {save:.0f} ms')
+            print(f'  first summary after {adjusted} salaries were adjusted (change log replay): {catch_up:.0f} ms')
+            print(f'  new process: memory-mapped load, replay and first summary {warm_load:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Compare concurrent request throughput of the sync views and the async views (ASYNC_MODE).
+
+Usage (from the repository root):
+    python benchmarks/bench_async.py --requests 3000 --concurrency 32
+
+Both modes are served by werkzeug's threaded server over HTTP, against copies
+of the same seeded SQLite database. "sync" is the default app (Flask-SQLAlchemy
+sessions on the request threads); "async" runs the async views on the
+process-wide event loop with the pooled aiosqlite engine. Workloads:
+    get   - GET /api/employees/<id> for random IDs (read-through cache)
+    list  - GET /api/employees?limit=50&after=<random> (one query per request)
+    mixed - list pages, plus one salary update per ten requests
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from datagen import generate_employees  # noqa: E402
+from app import create_app, db  # noqa: E402
+from services import create_employees_bulk_service  # noqa: E402
+
+MODES = {
+    'sync': {},
+    'async': {'ASYNC_MODE': True},
+}
+WORKLOADS = ('get', 'list', 'mixed')
+
+
+def _seed(path: str, employees: int):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'PAYROLL_JOB_WORKERS': 0})
+    with app.app_context():
+        db.create_all()
+        create_employees_bulk_service(generate_employees(employees))
+        db.session.execute(db.text('PRAGMA wal_checkpoint(TRUNCATE)'))
+        db.engine.dispose()
+
+
+def _serve(app):
+    """Start a threaded werkzeug server for an app; returns (port, stop)"""
+    from werkzeug.serving import make_server
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+
+def _requests(workload: str, port: int, employees: int, count: int):
+    """(method, url, body) per request, the same for every mode"""
+    rng = random.Random(0)
+    base = f'http://127.0.0.1:{port}/api/employees'
+    for i in range(count):
+        if workload == 'get':
+            yield 'GET', f'{base}/{rng.randint(1, employees)}', None
+        elif workload == 'mixed' and i % 10 == 0:
+            yield 'PUT', f'{base}/{rng.randint(1, employees)}', f'{{"salary": {rng.randint(1000, 200000)}}}'.encode()
+        else:
+            yield 'GET', f'{base}?limit=50&after={rng.randint(0, max(0, employees - 50))}', None
+
+
+def _run(path: str, overrides: dict, workload: str, employees: int, count: int, concurrency: int) -> float:
+    """Return requests per second for one mode and workload"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'PAYROLL_JOB_WORKERS': 0, **overrides})
+    port, stop = _serve(app)
+    
+    def send(item):
+        method, url, body = item
+        request = urllib.request.Request(url, data=body, method=method, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request) as response:
+            response.read()
+    
+    try:
+        items = list(_requests(workload, port, employees, count))
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(send, items[:concurrency]))  # warm up connections and the cache
+            started = time.perf_counter()
+            list(pool.map(send, items))
+            elapsed = time.perf_counter() - started
+    finally:
+        stop()
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        seeded = os.path.join(tmp, 'seed.db')
+        _seed(seeded, args.employees)
+        for workload in args.workloads:
+            for mode, overrides in MODES.items():
+                path = os.path.join(tmp, f'{workload}-{mode}.db')
+                shutil.copy(seeded, path)
+                rate = _run(path, overrides, workload, args.employees, args.requests, args.concurrency)
+                print(f'{workload:>5} {mode:>5}: {rate:,.0f} req/s '
+                      f'({args.requests} requests, concurrency {args.concurrency})')
+
+
+if __name__ == '__main__':
+    main()
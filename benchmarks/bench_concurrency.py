@@ -0,0 +1,104 @@
+"""
+Measure read throughput while writes are happening, with and without the SQLite tuning.
+
+Usage (from the repository root):
+    python benchmarks/bench_concurrency.py --readers 8 --seconds 5
+
+One writer thread commits single-employee updates in a loop while reader
+threads page through employees. The "baseline" mode uses SQLite's defaults
+(rollback journal, synchronous=FULL); "tuned" uses the application defaults
+(WAL, synchronous=NORMAL, mmap and a larger page cache).
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from datagen import generate_employees  # noqa: E402
+from app import create_app, db  # noqa: E402
+from services import (  # noqa: E402
+    create_employees_bulk_service,
+    get_employees_page_service,
+    update_employee_service
+)
+
+MODES = {
+    'baseline': {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_MMAP_SIZE': 0,
+        'SQLITE_CACHE_SIZE': -2000,
+    },
+    'tuned': {},
+}
+
+
+def _run(uri: str, overrides: dict, employees: int, readers: int, seconds: float):
+    """Return (reads/s, writes/s) for one configuration"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': uri, **overrides})
+    with app.app_context():
+        db.create_all()
+        create_employees_bulk_service(generate_employees(employees))
+    
+    stop = threading.Event()
+    counts = {'reads': 0, 'writes': 0}
+    lock = threading.Lock()
+    
+    def reader(seed):
+        rng = random.Random(seed)
+        done = 0
+        with app.app_context():
+            while not stop.is_set():
+                get_employees_page_service(limit=50, after=rng.randint(0, employees - 50))
+                db.session.remove()
+                done += 1
+        with lock:
+            counts['reads'] += done
+    
+    def writer():
+        rng = random.Random(-1)
+        done = 0
+        with app.app_context():
+            while not stop.is_set():
+                update_employee_service(rng.randint(1, employees), {'salary': rng.uniform(1000, 100000)})
+                db.session.remove()
+                done += 1
+        with lock:
+            counts['writes'] += done
+    
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    with app.app_context():
+        db.engine.dispose()
+    return counts['reads'] / seconds, counts['writes'] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+    
+    for mode, overrides in MODES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            reads, writes = _run(uri, overrides, args.employees, args.readers, args.seconds)
+        print(f'{mode:>8}: {reads:,.0f} reads/s, {writes:,.0f} writes/s '
+              f'({args.readers} readers, 1 writer, {args.seconds:g}s)')
+
+
+if __name__ == '__main__':
+    main()
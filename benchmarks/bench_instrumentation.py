@@ -0,0 +1,59 @@
+"""
+Measure the per-request overhead of the latency/SQL instrumentation.
+
+Usage (from the repository root):
+    python benchmarks/bench_instrumentation.py --requests 5000
+
+Runs the same mix of requests through the test client with METRICS_ENABLED
+off and on, and reports the mean time per request and the difference.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from datagen import generate_employees  # noqa: E402
+from app import create_app, db  # noqa: E402
+from services import create_employees_bulk_service  # noqa: E402
+
+# Cache-hot single lookups (no SQL) and small list pages (one SELECT each)
+PATHS = ('/api/employees/1', '/api/employees?limit=20', '/api/employees/1/calculate-salary')
+
+
+def _mean_request_time(metrics_enabled: bool, requests: int, repeats: int) -> float:
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'METRICS_ENABLED': metrics_enabled,
+        'SLOW_REQUEST_THRESHOLD_MS': 0
+    })
+    with app.app_context():
+        db.create_all()
+        create_employees_bulk_service(generate_employees(100))
+        client = app.test_client()
+        best = float('inf')
+        for _ in range(repeats):
+            started = time.perf_counter()
+            for i in range(requests):
+                client.get(PATHS[i % len(PATHS)])
+            best = min(best, (time.perf_counter() - started) / requests)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    
+    off = _mean_request_time(False, args.requests, args.repeats)
+    on = _mean_request_time(True, args.requests, args.repeats)
+    print(f'metrics off: {off * 1e6:,.1f} us/request')
+    print(f'metrics on:  {on * 1e6:,.1f} us/request')
+    print(f'overhead:    {(on - off) * 1e6:,.1f} us/request ({(on / off - 1) * 100:.1f}%)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare the ORM + stdlib JSON list path with the Core tuple + fast encoder path.
+
+Usage (from the repository root):
+    python benchmarks/bench_serialization.py --employees 10000 100000
+
+For each size it times building a full employee list response:
+  orm+json:    Employee.query.all() -> to_dict() -> Flask's default JSON provider
+  core+json:   column tuples via get_employees_page_service -> stdlib encoder
+  core+orjson: column tuples via get_employees_page_service -> orjson encoder
+and the same for the NDJSON export endpoint with each encoder.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from datagen import generate_employees  # noqa: E402
+from app import create_app, db  # noqa: E402
+from models import Employee  # noqa: E402
+from serialization import FastJSONProvider  # noqa: E402
+from services import create_employees_bulk_service, get_employees_page_service  # noqa: E402
+
+
+def _best_of(repeats: int, run) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+        db.session.remove()
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    
+    for size in args.employees:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app({
+                'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                'METRICS_ENABLED': False
+            })
+            with app.test_request_context():
+                db.create_all()
+                create_employees_bulk_service(generate_employees(size), chunk_size=5000)
+                default = DefaultJSONProvider(app)
+                stdlib = FastJSONProvider(app, 'json')
+                fast = FastJSONProvider(app, 'orjson')
+                
+                timings = {
+                    'orm+json': _best_of(args.repeats, lambda: default.response(
+                        [employee.to_dict() for employee in Employee.query.all()]).get_data()),
+                    'core+json': _best_of(args.repeats, lambda: stdlib.response(
+                        get_employees_page_service()).get_data()),
+                    'core+orjson': _best_of(args.repeats, lambda: fast.response(
+                        get_employees_page_service()).get_data()),
+                }
+                client = app.test_client()
+                for name, provider in (('json', stdlib), ('orjson', fast)):
+                    app.json = provider
+                    timings[f'export ndjson ({name})'] = _best_of(
+                        args.repeats, lambda: client.get('/api/employees/export').get_data())
+            
+            baseline = timings['orm+json']
+            print(f'{size} employees:')
+            for name, elapsed in timings.items():
+                print(f'  {name:<22} {elapsed:9.1f} ms' + (f'  ({baseline / elapsed:.1f}x orm+json)'
+                                                         if not name.startswith('export') else ''))
+
+
+if __name__ == '__main__':
+    main()
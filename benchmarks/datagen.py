@@ -0,0 +1,85 @@
+"""
+Seeded generator of realistic synthetic employees for benchmarks.
+
+Countries, job titles and salaries are skewed like a real payroll: a few
+countries and junior titles dominate, and salaries are log-normal around a
+base that depends on both the job title and the country. The same seed and
+size always produce the same rows.
+"""
+
+from typing import Dict, List
+import numpy as np
+
+# Country -> (share of employees, salary multiplier)
+COUNTRIES = {
+    'India': (0.42, 0.35),
+    'United States': (0.28, 1.0),
+    'United Kingdom': (0.08, 0.8),
+    'Germany': (0.07, 0.85),
+    'Canada': (0.05, 0.8),
+    'Singapore': (0.04, 0.9),
+    'Brazil': (0.03, 0.3),
+    'Australia': (0.02, 0.85),
+    'Japan': (0.01, 0.75),
+}
+
+# Job title -> (share of employees, base salary)
+JOB_TITLES = {
+    'Software Engineer': (0.30, 110000),
+    'Senior Software Engineer': (0.15, 150000),
+    'Support Engineer': (0.12, 60000),
+    'QA Engineer': (0.10, 80000),
+    'Data Analyst': (0.08, 85000),
+    'Product Manager': (0.06, 140000),
+    'Designer': (0.06, 95000),
+    'Sales Executive': (0.06, 70000),
+    'Engineering Manager': (0.04, 180000),
+    'HR Specialist': (0.02, 65000),
+    'Director': (0.01, 250000),
+}
+
+FIRST_NAMES = ('Aarav', 'Priya', 'John', 'Maria', 'Wei', 'Fatima', 'Lukas', 'Emma', 'Kenji', 'Olivia',
+               'Rahul', 'Sofia', 'David', 'Ananya', 'Carlos', 'Hannah', 'Arjun', 'Chloe', 'Mateo', 'Zara')
+LAST_NAMES = ('Sharma', 'Smith', 'Garcia', 'Chen', 'Patel', 'Müller', 'Johnson', 'Silva', 'Tanaka', 'Brown',
+              'Khan', 'Williams', 'Singh', 'Martin', 'Lee', 'Davis', 'Kumar', 'Wilson', 'Rossi', 'Taylor')
+
+# Spread of salaries around their base (sigma of the underlying normal)
+SALARY_SIGMA = 0.35
+
+
+def generate_employees(count: int, seed: int = 42) -> List[Dict]:
+    """
+    Generate employee rows in the shape accepted by create_employees_bulk_service.
+    
+    Args:
+        count: Number of employees
+        seed: Random seed
+    
+    Returns:
+        List of dicts with full_name, job_title, country and salary
+    """
+    rng = np.random.default_rng(seed)
+    countries = list(COUNTRIES)
+    titles = list(JOB_TITLES)
+    country_shares = np.array([share for share, _ in COUNTRIES.values()])
+    title_shares = np.array([share for share, _ in JOB_TITLES.values()])
+    
+    country_idx = rng.choice(len(countries), size=count, p=country_shares / country_shares.sum())
+    title_idx = rng.choice(len(titles), size=count, p=title_shares / title_shares.sum())
+    multipliers = np.array([multiplier for _, multiplier in COUNTRIES.values()])[country_idx]
+    bases = np.array([base for _, base in JOB_TITLES.values()], dtype=float)[title_idx]
+    salaries = np.round(rng.lognormal(np.log(bases * multipliers), SALARY_SIGMA), 2)
+    first = rng.integers(len(FIRST_NAMES), size=count)
+    last = rng.integers(len(LAST_NAMES), size=count)
+    
+    return [
+        {
+            'full_name': f'{FIRST_NAMES[first_name]} {LAST_NAMES[last_name]}',
+            'job_title': titles[title],
+            'country': countries[country],
+            'salary': salary
+        }
+        for first_name, last_name, title, country, salary in zip(
+            first.tolist(), last.tolist(), title_idx.tolist(), country_idx.tolist(), salaries.tolist()
+        )
+    ]
@@ -0,0 +1,292 @@
+"""
+Benchmark suite - times the services and endpoints at several dataset sizes.
+
+Usage (from the repository root):
+    python benchmarks/suite.py run --sizes 10000 100000 --output results.json
+    python benchmarks/suite.py run --sizes 10000 --baseline baseline.json
+    python benchmarks/suite.py compare baseline.json results.json --threshold 0.25
+
+`run` seeds a fresh SQLite database per size with datagen.generate_employees
+(same seed, same data), times every case and writes the results as JSON.
+`compare` (or `run --baseline`) matches cases by name and size and flags
+every case whose median got slower than the threshold; it exits with status
+1 when there are regressions so it can gate CI.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from datagen import generate_employees  # noqa: E402
+from app import create_app, db  # noqa: E402
+from services import (  # noqa: E402
+    bulk_adjust_salaries_service,
+    calculate_net_salary,
+    create_employees_bulk_service,
+    get_all_employees_service,
+    get_employees_page_service,
+    get_salary_histogram,
+    get_salary_metrics_by_country,
+    get_salary_metrics_summary,
+    rebuild_salary_aggregates_service,
+    run_payroll_service
+)
+
+DEFAULT_SIZES = (10000, 100000)
+# Cases that scan every employee run at most this many times
+HEAVY_REPEATS = 3
+# Fast cases are looped until one timing sample takes at least this long
+MIN_SAMPLE_SECONDS = 0.02
+
+
+class Case(NamedTuple):
+    name: str
+    kind: str  # 'service' or 'endpoint'
+    run: Callable[[], object]
+    heavy: bool = False
+
+
+def _consume(response):
+    """Read a (possibly streamed) test client response to the end"""
+    assert response.status_code < 400, response.status_code
+    response.get_data()
+
+
+def build_cases(client, size: int) -> List[Case]:
+    """All benchmark cases for a seeded database of the given size"""
+    middle = size // 2
+    salaries = [row['salary'] for row in get_employees_page_service(limit=1000, fields=['salary'])]
+    counter = iter(range(10 ** 9))
+    batch = list(range(1, size + 1, max(1, size // 300)))[:300]
+    batch_ids = ','.join(map(str, batch))
+    
+    return [
+        # Services
+        Case('service.get_employees_page', 'service',
+             lambda: get_employees_page_service(limit=100, after=middle)),
+        Case('service.get_employees_page_filtered', 'service',
+             lambda: get_employees_page_service(limit=100, country='Germany', min_salary=80000)),
+        Case('service.get_all_employees', 'service', get_all_employees_service, heavy=True),
+        Case('service.get_salary_metrics_by_country', 'service',
+             lambda: get_salary_metrics_by_country('India')),
+        Case('service.get_salary_metrics_by_country_exact', 'service',
+             lambda: get_salary_metrics_by_country('India', exact=True)),
+        Case('service.get_salary_metrics_summary', 'service',
+             lambda: get_salary_metrics_summary(include_pairs=True)),
+        Case('service.get_salary_histogram', 'service',
+             lambda: get_salary_histogram(bucket_count=20), heavy=True),
+        Case('service.calculate_net_salary_x1000', 'service',
+             lambda: [calculate_net_salary(salary, 'India') for salary in salaries]),
+        Case('service.run_payroll', 'service', lambda: list(run_payroll_service()), heavy=True),
+        Case('service.rebuild_salary_aggregates', 'service', rebuild_salary_aggregates_service, heavy=True),
+        Case('service.bulk_adjust_salaries_dry_run', 'service',
+             lambda: bulk_adjust_salaries_service(country='India', percent=5, dry_run=True)),
+        Case('service.bulk_adjust_salaries', 'service',
+             lambda: bulk_adjust_salaries_service(country='Germany', percent=0), heavy=True),
+        # Endpoints
+        Case('endpoint.get_employee', 'endpoint',
+             lambda: _consume(client.get(f'/api/employees/{middle}'))),
+        Case('endpoint.calculate_salary', 'endpoint',
+             lambda: _consume(client.get(f'/api/employees/{middle}/calculate-salary'))),
+        Case('endpoint.list_employees_page', 'endpoint',
+             lambda: _consume(client.get(f'/api/employees?limit=100&after={middle}'))),
+        Case('endpoint.list_employees_all', 'endpoint',
+             lambda: _consume(client.get('/api/employees')), heavy=True),
+        Case('endpoint.search_prefix', 'endpoint',
+             lambda: _consume(client.get('/api/employees/search?q=ku'))),
+        Case('endpoint.search_two_words', 'endpoint',
+             lambda: _consume(client.get('/api/employees/search?q=priya sha'))),
+        Case('endpoint.search_filtered', 'endpoint',
+             lambda: _consume(client.get('/api/employees/search?q=emma&country=Japan'))),
+        Case('endpoint.export_ndjson', 'endpoint',
+             lambda: _consume(client.get('/api/employees/export?format=ndjson')), heavy=True),
+        Case('endpoint.get_employees_by_ids', 'endpoint',
+             lambda: _consume(client.get(f'/api/employees?ids={batch_ids}'))),
+        Case('endpoint.calculate_salaries_by_ids', 'endpoint',
+             lambda: _consume(client.post('/api/employees/calculate-salary', json={'ids': batch}))),
+        Case('endpoint.salary_metrics', 'endpoint',
+             lambda: _consume(client.get('/api/salary-metrics?country=India'))),
+        Case('endpoint.salary_metrics_summary', 'endpoint',
+             lambda: _consume(client.get('/api/salary-metrics/summary'))),
+        Case('endpoint.salary_histogram', 'endpoint',
+             lambda: _consume(client.get('/api/salary-metrics/histogram?buckets=20')), heavy=True),
+        Case('endpoint.payroll_run', 'endpoint',
+             lambda: _consume(client.post('/api/payroll/run', json={})), heavy=True),
+        Case('endpoint.create_employee', 'endpoint',
+             lambda: _consume(client.post('/api/employees', json={
+                 'full_name': f'Bench {next(counter)}', 'job_title': 'Engineer',
+                 'country': 'India', 'salary': 50000
+             }))),
+        Case('endpoint.bulk_adjust_dry_run', 'endpoint',
+             lambda: _consume(client.post('/api/employees/bulk-adjust',
+                                          json={'job_title': 'Designer', 'percent': 3, 'dry_run': True}))),
+        Case('endpoint.update_employee', 'endpoint',
+             lambda: _consume(client.put(f'/api/employees/{middle}', json={'salary': 50000 + next(counter)}))),
+    ]
+
+
+def _time_case(case: Case, repeats: int) -> Dict:
+    """
+    Time a case, reporting milliseconds per call.
+    
+    Like timeit's autorange, fast cases are called in loops long enough for a
+    sample to take at least MIN_SAMPLE_SECONDS, which keeps timer and
+    scheduling noise out of sub-millisecond results.
+    """
+    started = time.perf_counter()
+    case.run()  # warm-up
+    elapsed = time.perf_counter() - started
+    number = 1 if case.heavy else max(1, min(1000, int(MIN_SAMPLE_SECONDS / max(elapsed, 1e-6))))
+    
+    timings = []
+    for _ in range(min(repeats, HEAVY_REPEATS) if case.heavy else repeats):
+        started = time.perf_counter()
+        for _ in range(number):
+            case.run()
+        timings.append((time.perf_counter() - started) * 1000 / number)
+    timings.sort()
+    return {
+        'repeats': len(timings),
+        'number': number,
+        'min_ms': round(timings[0], 4),
+        'median_ms': round(statistics.median(timings), 4),
+        'mean_ms': round(statistics.fmean(timings), 4),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+    }
+
+
+def run_suite(sizes: List[int], repeats: int, seed: int, pattern: str) -> Dict:
+    """Seed each size, time the matching cases and return the results document"""
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app({
+                'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                'METRICS_ENABLED': False
+            })
+            with app.app_context():
+                db.create_all()
+                started = time.perf_counter()
+                create_employees_bulk_service(generate_employees(size, seed), chunk_size=5000)
+                rebuild_salary_aggregates_service()
+                print(f'[{size}] seeded in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+                
+                for case in build_cases(app.test_client(), size):
+                    if not re.search(pattern, case.name):
+                        continue
+                    result = {'case': case.name, 'kind': case.kind, 'size': size, **_time_case(case, repeats)}
+                    results.append(result)
+                    print(f"[{size}] {case.name:<48} median {result['median_ms']:>10.3f} ms", file=sys.stderr)
+                db.session.remove()
+                db.engine.dispose()
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sqlite': sqlite3.sqlite_version,
+            'seed': seed,
+            'repeats': repeats,
+            'sizes': list(sizes),
+        },
+        'results': results
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float, min_delta_ms: float) -> List[Dict]:
+    """
+    Compare median timings case by case.
+    
+    A case regresses when its median grew by more than threshold (a fraction)
+    and by more than min_delta_ms, so sub-millisecond noise is not flagged.
+    
+    Returns:
+        One row per case present in both documents, with a 'status' of
+        'regression', 'improvement' or 'ok'
+    """
+    base = {(row['case'], row['size']): row for row in baseline['results']}
+    rows = []
+    for row in current['results']:
+        before = base.get((row['case'], row['size']))
+        if before is None:
+            continue
+        old, new = before['median_ms'], row['median_ms']
+        change = (new - old) / old if old else 0.0
+        if change > threshold and new - old > min_delta_ms:
+            status = 'regression'
+        elif change < -threshold and old - new > min_delta_ms:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'case': row['case'], 'size': row['size'], 'baseline_ms': old,
+                     'current_ms': new, 'change': round(change, 4), 'status': status})
+    return rows
+
+
+def _print_comparison(rows: List[Dict]) -> int:
+    """Print the comparison table and return the number of regressions"""
+    for row in rows:
+        marker = {'regression': '!!', 'improvement': '++', 'ok': '  '}[row['status']]
+        print(f"{marker} {row['case']:<48} {row['size']:>9} {row['baseline_ms']:>11.3f} ms "
+              f"-> {row['current_ms']:>11.3f} ms ({row['change'] * 100:+.1f}%)")
+    regressions = sum(row['status'] == 'regression' for row in rows)
+    print(f'{len(rows)} cases compared, {regressions} regressions')
+    return regressions
+
+
+def _load(path: str) -> Dict:
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run = commands.add_parser('run', help='Run the suite and write JSON results')
+    run.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    run.add_argument('--repeats', type=int, default=10)
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--cases', default='', help='Regex selecting case names')
+    run.add_argument('--output', default='benchmark-results.json')
+    run.add_argument('--baseline', help='Compare against this results file after running')
+    
+    compare_files = commands.add_parser('compare', help='Compare two results files')
+    compare_files.add_argument('baseline')
+    compare_files.add_argument('current')
+    
+    for command in (run, compare_files):
+        command.add_argument('--threshold', type=float, default=0.25,
+                             help='Slowdown (fraction of the baseline median) flagged as a regression')
+        command.add_argument('--min-delta-ms', type=float, default=0.05,
+                             help='Ignore changes smaller than this many milliseconds')
+    args = parser.parse_args()
+    
+    if args.command == 'run':
+        current = run_suite(args.sizes, args.repeats, args.seed, args.cases)
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(current, handle, indent=2)
+        print(f'Results written to {args.output}', file=sys.stderr)
+        if not args.baseline:
+            return
+        baseline = _load(args.baseline)
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+    
+    if _print_comparison(compare(baseline, current, args.threshold, args.min_delta_ms)):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""In-process salary aggregate store - count, sum, min and max per group"""
+
+import heapq
+import statistics
+import threading
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+from flask import current_app
+from constants import QUANTILE_RELATIVE_ACCURACY, EXACT_QUANTILE_THRESHOLD
+from sketches import QuantileSketch, exact_quantiles
+
+
+# Dimensions the store keeps groups for (Employee column names)
+DIMENSIONS = ('country', 'job_title')
+
+
+class GroupAggregate:
+    """
+    Running count, sum, min, max and quantile sketch for one group of salaries.
+    
+    Min and max must survive deletes, so each is kept in a heap with lazy
+    deletion: removed values are counted and discarded once they reach the
+    top of the heap.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.sketch = QuantileSketch(QUANTILE_RELATIVE_ACCURACY)
+        self._min_heap: List[float] = []
+        self._max_heap: List[float] = []
+        self._removed_min: Counter = Counter()
+        self._removed_max: Counter = Counter()
+        self._live: Counter = Counter()
+    
+    def add(self, salary: float):
+        """Add one salary to the group"""
+        self.count += 1
+        self.total += salary
+        self.sketch.add(salary)
+        self._live[salary] += 1
+        heapq.heappush(self._min_heap, salary)
+        heapq.heappush(self._max_heap, -salary)
+    
+    def holds(self, salary: float) -> bool:
+        """Whether the group has at least one occurrence of a salary"""
+        return self._live[salary] > 0
+    
+    def remove(self, salary: float):
+        """Remove one occurrence of a salary from the group (check holds() first)"""
+        self._live[salary] -= 1
+        if not self._live[salary]:
+            del self._live[salary]
+        self.count -= 1
+        self.total -= salary
+        self.sketch.remove(salary)
+        self._removed_min[salary] += 1
+        self._removed_max[salary] += 1
+        if len(self._min_heap) > 2 * self.count + 64:
+            self._compact()
+    
+    @property
+    def minimum(self) -> float:
+        """Smallest salary in the group"""
+        heap, removed = self._min_heap, self._removed_min
+        while removed[heap[0]]:
+            removed[heap[0]] -= 1
+            heapq.heappop(heap)
+        return heap[0]
+    
+    @property
+    def maximum(self) -> float:
+        """Largest salary in the group"""
+        heap, removed = self._max_heap, self._removed_max
+        while removed[-heap[0]]:
+            removed[-heap[0]] -= 1
+            heapq.heappop(heap)
+        return -heap[0]
+    
+    def values(self) -> List[float]:
+        """Every salary currently in the group, in no particular order"""
+        return list(self._live.elements())
+    
+    def _compact(self):
+        """Drop removed values from both heaps once they dominate the heap size"""
+        self._min_heap = self.values()
+        heapq.heapify(self._min_heap)
+        self._max_heap = [-salary for salary in self._min_heap]
+        heapq.heapify(self._max_heap)
+        self._removed_min.clear()
+        self._removed_max.clear()
+
+
+class SalaryAggregateStore:
+    """
+    Salary aggregates and quantile sketches per country and per job title,
+    kept up to date by the employee write services so percentile reads need
+    no query.
+    
+    The store starts empty and unloaded; it is filled from the database by
+    rebuild() (at startup, or lazily on first read). Writes made before the
+    store is loaded are ignored, since the rebuild reads them from the database.
+    """
+    
+    def __init__(self):
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._groups: Dict[str, Dict[str, GroupAggregate]] = {dimension: {} for dimension in DIMENSIONS}
+    
+    def rebuild(self, rows: Iterable[Tuple[str, str, float]]):
+        """
+        Replace the store contents.
+        
+        Args:
+            rows: (country, job_title, salary) for every employee
+        """
+        groups = {dimension: {} for dimension in DIMENSIONS}
+        for country, job_title, salary in rows:
+            self._add_to(groups, country, job_title, salary)
+        with self._lock:
+            self._groups = groups
+            self.loaded = True
+    
+    def reload(self, dimension: str, keys: Iterable[str], rows: Iterable[Tuple[str, float]]):
+        """
+        Replace some groups of one dimension, e.g. after another process wrote to them.
+        
+        Args:
+            dimension: 'country' or 'job_title'
+            keys: Group values to replace; those without rows are dropped
+            rows: (group value, salary) for every employee in those groups
+        """
+        groups: Dict[str, GroupAggregate] = {}
+        for key, salary in rows:
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = GroupAggregate()
+            group.add(salary)
+        with self._lock:
+            if not self.loaded:
+                return
+            for key in keys:
+                if key in groups:
+                    self._groups[dimension][key] = groups[key]
+                else:
+                    self._groups[dimension].pop(key, None)
+    
+    def invalidate(self):
+        """Drop the contents so the next read rebuilds the store from the database"""
+        with self._lock:
+            self._groups = {dimension: {} for dimension in DIMENSIONS}
+            self.loaded = False
+    
+    def add(self, country: str, job_title: str, salary: float):
+        """Record a new employee"""
+        with self._lock:
+            if self.loaded:
+                self._add_to(self._groups, country, job_title, salary)
+    
+    def remove(self, country: str, job_title: str, salary: float):
+        """
+        Record a deleted employee.
+        
+        A group or salary the store does not hold means the row was written
+        outside this process; the store is then dropped (as by invalidate())
+        so the next read rebuilds it from the database.
+        """
+        with self._lock:
+            if not self.loaded:
+                return
+            groups = [self._groups[dimension].get(key) for dimension, key in zip(DIMENSIONS, (country, job_title))]
+            if any(group is None or not group.holds(salary) for group in groups):
+                self._groups = {dimension: {} for dimension in DIMENSIONS}
+                self.loaded = False
+                return
+            for dimension, key, group in zip(DIMENSIONS, (country, job_title), groups):
+                group.remove(salary)
+                if not group.count:
+                    del self._groups[dimension][key]
+    
+    def get(self, dimension: str, key: str) -> Optional[Dict[str, float]]:
+        """
+        Get the aggregates for one group.
+        
+        Args:
+            dimension: 'country' or 'job_title'
+            key: Group value, e.g. 'India'
+        
+        Returns:
+            Dictionary with count, sum, min and max, or None if the group is empty
+        """
+        with self._lock:
+            group = self._groups[dimension].get(key)
+            return self._describe(group) if group is not None else None
+    
+    def combine(self, dimension: str, keys: Iterable[str], qs: Iterable[float],
+                exact: bool = False) -> Optional[Dict]:
+        """
+        Get the aggregates and quantiles of several groups taken together.
+        
+        Quantiles come from the merged sketches of the groups (relative error
+        QUANTILE_RELATIVE_ACCURACY). Combined groups of up to
+        EXACT_QUANTILE_THRESHOLD salaries, or any group when exact is set,
+        are answered exactly by sorting the salaries instead.
+        
+        Args:
+            dimension: 'country' or 'job_title'
+            keys: Group values to combine
+            qs: Quantiles between 0 and 1
+            exact: Always compute exact quantiles
+        
+        Returns:
+            Dictionary with count, sum, min, max, median, quantiles (keyed by q)
+            and method ('exact' or 'sketch'), or None if all groups are empty
+        """
+        qs = list(qs)
+        with self._lock:
+            groups = [group for group in map(self._groups[dimension].get, dict.fromkeys(keys)) if group is not None]
+            if not groups:
+                return None
+            combined = {
+                'count': sum(group.count for group in groups),
+                'sum': sum(group.total for group in groups),
+                'min': min(group.minimum for group in groups),
+                'max': max(group.maximum for group in groups)
+            }
+            if exact or combined['count'] <= EXACT_QUANTILE_THRESHOLD:
+                values = sorted(chain.from_iterable(group.values() for group in groups))
+            else:
+                values = None
+                sketch = groups[0].sketch.copy()
+                for group in groups[1:]:
+                    sketch.merge(group.sketch)
+        
+        if values is not None:
+            combined.update(method='exact', median=float(statistics.median(values)),
+                            quantiles=exact_quantiles(values, qs))
+        else:
+            estimates = sketch.quantiles(qs + [0.5])
+            combined.update(method='sketch', median=estimates[0.5],
+                            quantiles={q: estimates[q] for q in qs})
+        return combined
+    
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Get the aggregates for every group, keyed by dimension and group value"""
+        with self._lock:
+            return {
+                dimension: {key: self._describe(group) for key, group in groups.items()}
+                for dimension, groups in self._groups.items()
+            }
+    
+    @staticmethod
+    def _describe(group: GroupAggregate) -> Dict[str, float]:
+        return {
+            'count': group.count,
+            'sum': group.total,
+            'min': group.minimum,
+            'max': group.maximum
+        }
+    
+    @staticmethod
+    def _add_to(groups: Dict[str, Dict[str, GroupAggregate]], country: str, job_title: str, salary: float):
+        for dimension, key in zip(DIMENSIONS, (country, job_title)):
+            group = groups[dimension].get(key)
+            if group is None:
+                group = groups[dimension][key] = GroupAggregate()
+            group.add(salary)
+
+
+def get_aggregate_store() -> SalaryAggregateStore:
+    """Get the aggregate store of the current application"""
+    return current_app.extensions['salary_aggregates']
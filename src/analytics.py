@@ -0,0 +1,373 @@
+"""Columnar analytics snapshot - the employees table as NumPy arrays for vectorized metrics and payroll"""
+
+import json
+import os
+import threading
+import uuid
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from flask import current_app
+
+
+# Values of the ANALYTICS_ENGINE setting
+ANALYTICS_ENGINES = ('sql', 'columnar')
+
+# Dictionary-encoded dimensions (Employee column names)
+DIMENSIONS = ('country', 'job_title')
+
+
+class Columns(NamedTuple):
+    """Live rows of a snapshot, ordered by employee ID"""
+    ids: np.ndarray
+    salaries: np.ndarray
+    country: np.ndarray
+    job_title: np.ndarray
+
+
+class ColumnarSnapshot:
+    """
+    Compact in-memory copy of the employees table for analytics.
+    
+    Each column is one NumPy array: int64 IDs, float64 salaries, and country
+    and job title codes indexing per-dimension dictionaries (uint16 while a
+    dictionary has at most 65536 values). Rows stay ordered by ID, so a
+    change finds its row with one binary search. Deleted rows are only
+    flagged dead until they make up a quarter of the rows, then compacted.
+    
+    cursor is the employee change log sequence the snapshot is current up to.
+    The snapshot can be saved as .npy files and loaded memory-mapped
+    (copy-on-write), so a new process starts warm and only replays the
+    changes made since the save.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Directory of a saved snapshot to load on first use
+        """
+        self.path = path
+        self.loaded = False
+        self.cursor = 0
+        self._lock = threading.RLock()
+        self._size = 0
+        self._dead = 0
+        self._columns = self._allocate(0, np.uint16)
+        self._codes: Dict[str, Dict[str, int]] = {dimension: {} for dimension in DIMENSIONS}
+        self._names: Dict[str, np.ndarray] = {}
+        self._view: Optional[Columns] = None
+    
+    @staticmethod
+    def _allocate(capacity: int, code_dtype) -> Dict[str, np.ndarray]:
+        return {
+            'ids': np.empty(capacity, dtype=np.int64),
+            'salaries': np.empty(capacity, dtype=np.float64),
+            'country': np.empty(capacity, dtype=code_dtype),
+            'job_title': np.empty(capacity, dtype=code_dtype),
+            'live': np.empty(capacity, dtype=bool)
+        }
+    
+    def rebuild(self, batches: Iterable[Tuple[Sequence[int], Sequence[float], Sequence[str], Sequence[str]]],
+                cursor: int):
+        """
+        Replace the contents.
+        
+        Args:
+            batches: (ids, salaries, countries, job_titles) column batches
+                covering every employee in ID order
+            cursor: Change log sequence the batches are current up to
+        """
+        codes = {dimension: {} for dimension in DIMENSIONS}
+        parts = {name: [] for name in ('ids', 'salaries', 'country', 'job_title')}
+        for ids, salaries, countries, job_titles in batches:
+            parts['ids'].append(np.asarray(ids, dtype=np.int64))
+            parts['salaries'].append(np.asarray(salaries, dtype=np.float64))
+            for dimension, values in zip(DIMENSIONS, (countries, job_titles)):
+                lookup = codes[dimension]
+                parts[dimension].append(np.array([lookup.setdefault(value, len(lookup)) for value in values],
+                                                 dtype=np.uint32))
+        dtypes = {
+            'ids': np.int64,
+            'salaries': np.float64,
+            **{dimension: self._code_dtype(len(codes[dimension])) for dimension in DIMENSIONS}
+        }
+        columns = {
+            name: np.concatenate(chunks).astype(dtypes[name], copy=False) if chunks else np.empty(0, dtypes[name])
+            for name, chunks in parts.items()
+        }
+        columns['live'] = np.ones(len(columns['ids']), dtype=bool)
+        self._replace(columns, codes, cursor)
+    
+    def apply(self, changes: Iterable[Tuple[Optional[int], int, Optional[Tuple[str, str, float]]]]):
+        """
+        Apply employee changes as upserts and deletes.
+        
+        Args:
+            changes: (seq, employee_id, row) per change, where row is
+                (country, job_title, salary), or None for deletes. seq is the
+                change log sequence (changes at or before the cursor are
+                skipped, and the cursor advances) or None for changes not
+                read from the log.
+        """
+        with self._lock:
+            for seq, employee_id, row in changes:
+                if seq is not None:
+                    if seq <= self.cursor:
+                        continue
+                    self.cursor = seq
+                self._apply_one(employee_id, row)
+            if self._dead * 4 > self._size:
+                self._compact()
+            self._view = None
+    
+    def _apply_one(self, employee_id: int, row: Optional[Tuple[str, str, float]]):
+        columns = self._columns
+        position = int(np.searchsorted(columns['ids'][:self._size], employee_id))
+        found = position < self._size and columns['ids'][position] == employee_id
+        if row is None:
+            if found and columns['live'][position]:
+                columns['live'][position] = False
+                self._dead += 1
+            return
+        
+        country, job_title, salary = row
+        if not found:
+            if position < self._size:
+                # Out-of-order ID: insert into new buffers rather than shifting
+                # rows under views already handed out
+                self._columns = {name: np.insert(column[:self._size], position, 0)
+                                 for name, column in columns.items()}
+            else:
+                self._reserve(1)
+            columns = self._columns
+            columns['ids'][position] = employee_id
+            columns['live'][position] = True
+            self._size += 1
+        elif not columns['live'][position]:
+            columns['live'][position] = True
+            self._dead -= 1
+        columns['salaries'][position] = salary
+        columns['country'][position] = self._encode('country', country)
+        columns['job_title'][position] = self._encode('job_title', job_title)
+    
+    def _encode(self, dimension: str, value: str) -> int:
+        lookup = self._codes[dimension]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+            self._names.pop(dimension, None)
+            dtype = self._code_dtype(len(lookup))
+            if self._columns[dimension].dtype != dtype:
+                self._columns[dimension] = self._columns[dimension].astype(dtype)
+        return code
+    
+    @staticmethod
+    def _code_dtype(cardinality: int):
+        return np.uint16 if cardinality <= 1 << 16 else np.uint32
+    
+    def _reserve(self, count: int):
+        """Grow the column buffers (by at least a quarter) to fit count more rows"""
+        capacity = len(self._columns['ids'])
+        if self._size + count <= capacity:
+            return
+        capacity = max(self._size + count, capacity + capacity // 4 + 1024)
+        columns = self._allocate(capacity, self._columns['country'].dtype)
+        columns['job_title'] = columns['job_title'].astype(self._columns['job_title'].dtype)
+        for name, column in columns.items():
+            column[:self._size] = self._columns[name][:self._size]
+        self._columns = columns
+    
+    def _compact(self):
+        live = self._columns['live'][:self._size]
+        self._columns = {name: column[:self._size][live] for name, column in self._columns.items()}
+        self._size = len(self._columns['ids'])
+        self._dead = 0
+    
+    def _replace(self, columns: Dict[str, np.ndarray], codes: Dict[str, Dict[str, int]], cursor: int):
+        with self._lock:
+            self._columns = columns
+            self._codes = codes
+            self._names = {}
+            self._size = len(columns['ids'])
+            self._dead = int(len(columns['live']) - np.count_nonzero(columns['live']))
+            self._view = None
+            self.cursor = cursor
+            self.loaded = True
+    
+    def view(self) -> Tuple[Columns, Dict[str, np.ndarray]]:
+        """
+        Get the live rows and the dictionaries decoding their codes.
+        
+        The arrays must be treated as read-only. Later changes never move
+        rows already handed out, but updates of existing rows are written in
+        place and may show through.
+        """
+        with self._lock:
+            if self._view is None:
+                columns = {name: column[:self._size] for name, column in self._columns.items()}
+                if self._dead:
+                    live = columns['live']
+                    columns = {name: column[live] for name, column in columns.items()}
+                self._view = Columns(columns['ids'], columns['salaries'], columns['country'], columns['job_title'])
+            for dimension in DIMENSIONS:
+                if dimension not in self._names:
+                    self._names[dimension] = np.array(list(self._codes[dimension]), dtype=object)
+            return self._view, dict(self._names)
+    
+    def codes_of(self, dimension: str, values: Iterable[str]) -> List[int]:
+        """Codes of the given values that occur in the dictionary"""
+        with self._lock:
+            lookup = self._codes[dimension]
+            return [lookup[value] for value in dict.fromkeys(values) if value in lookup]
+    
+    def stats(self) -> Dict[str, int]:
+        """Row counts and memory footprint (bytes) of the column buffers"""
+        with self._lock:
+            used = sum(column[:self._size].nbytes for column in self._columns.values())
+            allocated = sum(column.nbytes for column in self._columns.values())
+            return {
+                'rows': self._size - self._dead,
+                'dead_rows': self._dead,
+                'bytes': used,
+                'allocated_bytes': allocated,
+                'bytes_per_row': round(used / self._size, 2) if self._size else 0,
+                'cursor': self.cursor
+            }
+    
+    def save(self, path: str):
+        """
+        Save the live rows as .npy files plus a meta.json, replacing any
+        earlier save in the directory atomically.
+        """
+        columns, names = self.view()
+        with self._lock:
+            cursor = self.cursor
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, 'meta.json')
+        previous = _read_meta(meta_path)
+        
+        token = uuid.uuid4().hex[:12]
+        for name, column in zip(Columns._fields, columns):
+            np.save(os.path.join(path, f'{name}-{token}.npy'), column)
+        meta = {
+            'token': token,
+            'cursor': cursor,
+            'rows': len(columns.ids),
+            'dictionaries': {dimension: names[dimension].tolist() for dimension in DIMENSIONS}
+        }
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as handle:
+            json.dump(meta, handle)
+        os.replace(meta_path + '.tmp', meta_path)
+        
+        if previous is not None:
+            for name in Columns._fields:
+                try:
+                    os.remove(os.path.join(path, f"{name}-{previous['token']}.npy"))
+                except FileNotFoundError:
+                    pass
+    
+    def load(self, path: str) -> bool:
+        """
+        Replace the contents with a saved snapshot, memory-mapped copy-on-write.
+        
+        Returns:
+            True if a saved snapshot was found
+        """
+        meta = _read_meta(os.path.join(path, 'meta.json'))
+        if meta is None:
+            return False
+        columns = {
+            name: np.load(os.path.join(path, f"{name}-{meta['token']}.npy"), mmap_mode='c')
+            for name in Columns._fields
+        }
+        columns['live'] = np.ones(meta['rows'], dtype=bool)
+        codes = {
+            dimension: {value: code for code, value in enumerate(meta['dictionaries'][dimension])}
+            for dimension in DIMENSIONS
+        }
+        self._replace(columns, codes, meta['cursor'])
+        return True
+
+
+def _read_meta(path: str) -> Optional[Dict]:
+    try:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def filter_mask(snapshot: ColumnarSnapshot, columns: Columns, country: Optional[str] = None,
+                job_title: Optional[str] = None, min_salary: Optional[float] = None,
+                max_salary: Optional[float] = None) -> Optional[np.ndarray]:
+    """
+    Boolean mask of the rows matching the employee list filters.
+    
+    Returns:
+        The mask, or None when no filter is given (every row matches)
+    """
+    mask = None
+    for dimension, value in (('country', country), ('job_title', job_title)):
+        if value is not None:
+            codes = snapshot.codes_of(dimension, [value])
+            matches = getattr(columns, dimension) == codes[0] if codes else np.zeros(len(columns.ids), dtype=bool)
+            mask = matches if mask is None else mask & matches
+    if min_salary is not None:
+        mask = columns.salaries >= min_salary if mask is None else mask & (columns.salaries >= min_salary)
+    if max_salary is not None:
+        mask = columns.salaries <= max_salary if mask is None else mask & (columns.salaries <= max_salary)
+    return mask
+
+
+def group_aggregates(columns: Columns, names: Dict[str, np.ndarray],
+                     dimensions: Sequence[str]) -> List[Tuple[Tuple[str, ...], int, float, float, float]]:
+    """
+    Count, sum, min and max salary per group of one or more dimensions.
+    
+    Rows are sorted once by group code (a stable radix sort for uint16
+    codes) and every aggregate is a reduceat over the group boundaries.
+    
+    Returns:
+        (group values, count, sum, min, max) per non-empty group, ordered by
+        group values
+    """
+    if not len(columns.ids):
+        return []
+    if len(dimensions) == 1:
+        key = getattr(columns, dimensions[0])
+    else:
+        key = np.zeros(len(columns.ids), dtype=np.int64)
+        for dimension in dimensions:
+            key = key * len(names[dimension]) + getattr(columns, dimension)
+    order = np.argsort(key, kind='stable')
+    keys = key[order]
+    salaries = columns.salaries[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    counts = np.diff(np.append(starts, len(keys)))
+    sums = np.add.reduceat(salaries, starts)
+    minimums = np.minimum.reduceat(salaries, starts)
+    maximums = np.maximum.reduceat(salaries, starts)
+    
+    groups = []
+    for index, start in enumerate(starts.tolist()):
+        row = order[start]
+        values = tuple(names[dimension][getattr(columns, dimension)[row]] for dimension in dimensions)
+        groups.append((values, int(counts[index]), float(sums[index]), float(minimums[index]),
+                       float(maximums[index])))
+    groups.sort(key=lambda group: group[0])
+    return groups
+
+
+def iter_row_batches(columns: Columns, mask: Optional[np.ndarray], chunk_size: int) -> Iterator[np.ndarray]:
+    """Row positions of the matching rows in ID order, chunk_size at a time"""
+    if mask is None:
+        for start in range(0, len(columns.ids), chunk_size):
+            yield np.arange(start, min(start + chunk_size, len(columns.ids)))
+    else:
+        rows = np.flatnonzero(mask)
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+
+def get_analytics_snapshot() -> Optional[ColumnarSnapshot]:
+    """Get the columnar snapshot of the current application (None unless ANALYTICS_ENGINE is 'columnar')"""
+    return current_app.extensions['analytics_snapshot']
@@ -1,16 +1,97 @@
+import os
+from typing import Dict, Union
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
 
 
-def create_app():
-    """Application factory"""
-    app = Flask(__name__)
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///employees.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+class SalaryApp(Flask):
+    """Flask application that runs async views on the process-wide event loop in ASYNC_MODE"""
+    
+    def async_to_sync(self, func):
+        if not self.config['ASYNC_MODE']:
+            return super().async_to_sync(func)
+        from async_services import run_on_async_loop
+        return run_on_async_loop(func)
+
+
+def create_app(config: Union[Dict, type, str, None] = None):
+    """
+    Application factory
+    
+    Settings are layered: the Config defaults (which read DATABASE_URL, DB_POOL_*
+    and SQLITE_* environment variables), then FLASK_-prefixed environment
+    variables, then the given config.
+    
+    Args:
+        config: Optional settings applied over the defaults before extensions
+            are initialised - a dictionary, a config object, or the name of one
+            of the objects in config.CONFIGS (defaults to the APP_CONFIG
+            environment variable)
+    """
+    from config import CONFIGS, Config
+    from database import configure_engine, engine_options
+    
+    app = SalaryApp(__name__)
+    app.config.from_object(Config)
+    app.config.from_prefixed_env()
+    config = config if config is not None else os.environ.get('APP_CONFIG')
+    if isinstance(config, str):
+        config = CONFIGS[config]
+    if isinstance(config, dict):
+        app.config.update(config)
+    elif config is not None:
+        app.config.from_object(config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+    
+    # Fast JSON encoding for jsonify and the NDJSON streams
+    from serialization import FastJSONProvider
+    app.json = FastJSONProvider(app, app.config['JSON_ENCODER'])
     
     db.init_app(app)
+    with app.app_context():
+        configure_engine(db.engine, app.config)
+        
+        # Per-endpoint latency and SQL metrics served at /metrics
+        if app.config['METRICS_ENABLED']:
+            from instrumentation import init_instrumentation
+            init_instrumentation(app, db.engine)
+    
+    # Async engine behind the async views, pooled for the life of the process
+    if app.config['ASYNC_MODE']:
+        from async_services import init_async_engine
+        init_async_engine(app)
+    
+    # In-process salary aggregates, filled from the database on first use
+    from aggregates import SalaryAggregateStore
+    app.extensions['salary_aggregates'] = SalaryAggregateStore()
+    
+    # Change log versions behind the employee cache
+    from versions import DataVersionTracker
+    sync_interval = app.config['EMPLOYEE_CACHE_SYNC_INTERVAL']
+    if app.config['EMPLOYEE_CACHE_TTL'] is not None:
+        sync_interval = min(sync_interval, app.config['EMPLOYEE_CACHE_TTL'])
+    app.extensions['data_version'] = DataVersionTracker(sync_interval)
+    
+    # Read-through LRU cache for single-employee lookups
+    from cache import LRUCache
+    app.extensions['employee_cache'] = LRUCache(app.config['EMPLOYEE_CACHE_SIZE'], app.config['EMPLOYEE_CACHE_TTL'])
+    
+    # Progressive TDS slabs, compiled once from the tax rules file
+    from tax import TaxRules
+    app.extensions['tax_rules'] = TaxRules.from_file(app.config['TAX_RULES_PATH'])
+    
+    # Thread pool for background payroll jobs
+    from jobs import JobRunner
+    app.extensions['job_runner'] = JobRunner(app, app.config['PAYROLL_JOB_WORKERS'])
+    
+    # Columnar analytics snapshot, loaded on first use
+    from analytics import ANALYTICS_ENGINES, ColumnarSnapshot
+    if app.config['ANALYTICS_ENGINE'] not in ANALYTICS_ENGINES:
+        raise ValueError(f"ANALYTICS_ENGINE must be one of {', '.join(ANALYTICS_ENGINES)}")
+    app.extensions['analytics_snapshot'] = (ColumnarSnapshot(app.config['ANALYTICS_SNAPSHOT_PATH'])
+                                            if app.config['ANALYTICS_ENGINE'] == 'columnar' else None)
     
     # Import models to ensure they're registered
     from models import Employee
@@ -22,6 +103,10 @@ def create_app():
     from routes import register_routes
     register_routes(app)
     
+    # Register CLI commands
+    from cli import register_commands
+    register_commands(app)
+    
     return app
 
 
@@ -29,4 +114,16 @@ if __name__ == '__main__':
     app = create_app()
     with app.app_context():
         db.create_all()
+        # Add the search index, salary summary and change log to databases
+        # created before they existed, and warm the salary aggregates
+        from services import (
+            ensure_change_log_service,
+            ensure_salary_summary_service,
+            ensure_search_index_service,
+            rebuild_salary_aggregates_service
+        )
+        ensure_search_index_service()
+        ensure_salary_summary_service()
+        ensure_change_log_service()
+        rebuild_salary_aggregates_service()
     app.run(debug=True)
@@ -0,0 +1,337 @@
+"""Async service layer - asyncio versions of the hot employee services for ASYNC_MODE"""
+
+import asyncio
+import os
+import threading
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, List, Optional, Tuple
+from flask import Flask, current_app
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from database import configure_engine
+from instrumentation import instrument_engine
+from models import Employee
+from versions import get_version_tracker
+from constants import ID_LOOKUP_CHUNK_SIZE
+from services import (
+    apply_employee_update,
+    build_changes_after_query,
+    build_employee_change_seq_query,
+    build_employees_by_ids_query,
+    build_employees_page_query,
+    build_latest_change_cursor_query,
+    cached_net_salary,
+    change_log_maintained_service,
+    lookup_cached_employee,
+    project_cached_employees,
+    record_employee_changes,
+    store_cached_employee
+)
+
+
+# Async drivers used when ASYNC_DATABASE_URI is not configured
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+# Session shared by the services one view coroutine calls (like db.session for a request)
+_scoped_session: ContextVar[Optional[AsyncSession]] = ContextVar('async_session', default=None)
+
+
+def get_async_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the process-wide event loop, starting its thread on first use.
+    
+    Async views and every async engine's connections live on this loop, so
+    pooled connections are reused across requests (Flask's default runs each
+    async view in a new event loop, which would need a new connection each time).
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='async-services', daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def _forget_async_loop():
+    global _loop
+    _loop = None
+
+
+# A forked worker does not inherit the loop's thread, so it starts its own
+os.register_at_fork(after_in_child=_forget_async_loop)
+
+
+def run_on_async_loop(func: Callable[..., Coroutine]) -> Callable[..., Any]:
+    """
+    Make a coroutine function callable from a request thread (the app's async_to_sync in ASYNC_MODE).
+    
+    The coroutine runs on the process-wide loop in a copy of the caller's
+    context, so the request and application contexts stay available to it,
+    and the async services it calls share one session, closed when it ends.
+    The request thread waits for the result while the loop serves other
+    requests' queries.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return asyncio.run_coroutine_threadsafe(_in_session_scope(func(*args, **kwargs)), get_async_loop()).result()
+    return wrapper
+
+
+async def _in_session_scope(coroutine: Coroutine) -> Any:
+    try:
+        return await coroutine
+    finally:
+        session = _scoped_session.get()
+        if session is not None:
+            await session.close()
+
+
+def init_async_engine(app: Flask) -> AsyncEngine:
+    """
+    Create the async engine of an application, once per process.
+    
+    The URI comes from ASYNC_DATABASE_URI, or from SQLALCHEMY_DATABASE_URI with
+    the matching async driver. The engine takes the sync engine's options
+    (pool size, overflow, recycle) and SQLite pragmas; its connections are only
+    used from the process-wide loop, so they are pooled across requests.
+    
+    Args:
+        app: Flask application instance
+    
+    Returns:
+        The async engine, also stored in app.extensions['async_engine']
+    """
+    uri = app.config['ASYNC_DATABASE_URI']
+    if uri is None:
+        url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f'No async driver known for {backend}; set ASYNC_DATABASE_URI')
+        url = url.set(drivername=ASYNC_DRIVERS[backend])
+    else:
+        url = make_url(uri)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        raise ValueError('ASYNC_MODE needs a database file or server: an in-memory SQLite database '
+                         'is private to one connection')
+    
+    engine = create_async_engine(url, **app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    configure_engine(engine.sync_engine, app.config)
+    if app.config['METRICS_ENABLED']:
+        instrument_engine(engine.sync_engine)
+    app.extensions['async_engine'] = engine
+    app.extensions['async_session'] = async_sessionmaker(engine, expire_on_commit=False)
+    return engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the async engine of the current application"""
+    return current_app.extensions['async_engine']
+
+
+@asynccontextmanager
+async def _session() -> AsyncIterator[AsyncSession]:
+    """The session of the current view coroutine, opened on first use"""
+    session = _scoped_session.get()
+    if session is None:
+        session = current_app.extensions['async_session']()
+        _scoped_session.set(session)
+    yield session
+
+
+async def _sync_data_versions_async() -> bool:
+    """Async version of services._sync_data_versions"""
+    if not change_log_maintained_service():
+        return False
+    tracker = get_version_tracker()
+    if not tracker.sync_due():
+        return True
+    async with _session() as session:
+        if not tracker.synced:
+            latest, purged_through = (await session.execute(build_latest_change_cursor_query())).one()
+            tracker.start(max(latest or 0, purged_through or 0))
+            return True
+        cursor = tracker.version
+        tracker.advance(cursor, (await session.execute(build_changes_after_query(cursor))).all())
+    return True
+
+
+async def get_data_etag_service_async() -> Optional[str]:
+    """Async version of get_data_etag_service"""
+    if not change_log_maintained_service():
+        return None
+    async with _session() as session:
+        latest, purged_through = (await session.execute(build_latest_change_cursor_query())).one()
+    return str(max(latest or 0, purged_through or 0))
+
+
+async def get_employee_etag_service_async(employee_id: int) -> Optional[str]:
+    """Async version of get_employee_etag_service"""
+    if not change_log_maintained_service():
+        return None
+    async with _session() as session:
+        seq = (await session.execute(build_employee_change_seq_query(employee_id))).scalar()
+    # The cached employee served with this tag must be at least as new
+    get_version_tracker().observe(employee_id, seq)
+    return f'{employee_id}-{seq}'
+
+
+async def create_employee_service_async(full_name: str, job_title: str, country: str, salary: float) -> Employee:
+    """
+    Create a new employee in the database.
+    
+    Args:
+        full_name: Employee full name
+        job_title: Job title
+        country: Country
+        salary: Salary amount
+    
+    Returns:
+        Created Employee object
+    """
+    employee = Employee(full_name=full_name, job_title=job_title, country=country, salary=salary)
+    async with _session() as session:
+        session.add(employee)
+        await session.commit()
+    record_employee_changes([(employee.id, None, (country, job_title, salary))])
+    return employee
+
+
+async def get_employee_dict_service_async(employee_id: int) -> Optional[Dict]:
+    """
+    Get an employee as a dictionary through the read-through LRU cache.
+    
+    Args:
+        employee_id: Employee ID
+    
+    Returns:
+        Employee dictionary or None if not found
+    """
+    entry = await _cached_employee_entry_async(employee_id)
+    return entry['employee'] if entry else None
+
+
+async def calculate_employee_salary_service_async(employee_id: int) -> Optional[Dict[str, float]]:
+    """
+    Calculate an employee's net salary, cached alongside the employee.
+    
+    Args:
+        employee_id: Employee ID
+    
+    Returns:
+        Dictionary containing gross_salary, tds, and net_salary, or None if not found
+    """
+    entry = await _cached_employee_entry_async(employee_id)
+    return cached_net_salary(entry) if entry else None
+
+
+async def get_employees_page_service_async(limit: Optional[int] = None, after: Optional[int] = None,
+                                           fields: Optional[List[str]] = None, country: Optional[str] = None,
+                                           job_title: Optional[str] = None, min_salary: Optional[float] = None,
+                                           max_salary: Optional[float] = None) -> List[Dict]:
+    """
+    Get employees ordered by ID using keyset pagination.
+    
+    Takes the same arguments as get_employees_page_service.
+    
+    Returns:
+        List of employee dictionaries
+    """
+    names, query = build_employees_page_query(limit, after, fields, country, job_title, min_salary, max_salary)
+    async with _session() as session:
+        result = await session.execute(query)
+        return [dict(zip(names, row)) for row in result]
+
+
+async def get_employees_by_ids_service_async(employee_ids: List[int],
+                                             fields: Optional[List[str]] = None) -> Tuple[List[Dict], List[int]]:
+    """
+    Get many employees by ID, through the LRU cache and one IN query per chunk of misses.
+    
+    Takes the same arguments as get_employees_by_ids_service.
+    
+    Returns:
+        Tuple of (employee dictionaries in the requested order, IDs not found)
+    """
+    await _sync_data_versions_async()
+    entries = {}
+    miss_versions = {}
+    for employee_id in employee_ids:
+        version, entry = lookup_cached_employee(employee_id)
+        if entry is None:
+            miss_versions[employee_id] = version
+        else:
+            entries[employee_id] = entry
+    
+    misses = list(miss_versions)
+    if misses:
+        async with _session() as session:
+            for start in range(0, len(misses), ID_LOOKUP_CHUNK_SIZE):
+                names, query = build_employees_by_ids_query(misses[start:start + ID_LOOKUP_CHUNK_SIZE])
+                for row in await session.execute(query):
+                    employee = dict(zip(names, row))
+                    entries[employee['id']] = store_cached_employee(employee['id'], miss_versions[employee['id']],
+                                                                    employee)
+    return project_cached_employees(entries, employee_ids, fields)
+
+
+async def update_employee_service_async(employee_id: int, data: Dict) -> Optional[Employee]:
+    """
+    Update an employee.
+    
+    Args:
+        employee_id: Employee ID
+        data: Dictionary with fields to update
+    
+    Returns:
+        Updated Employee object or None if not found
+    """
+    async with _session() as session:
+        employee = await session.get(Employee, employee_id)
+        if not employee:
+            return None
+        change = apply_employee_update(employee, data)
+        await session.commit()
+    record_employee_changes([change])
+    return employee
+
+
+async def delete_employee_service_async(employee_id: int) -> bool:
+    """
+    Delete an employee.
+    
+    Args:
+        employee_id: Employee ID
+    
+    Returns:
+        True if deleted, False if not found
+    """
+    async with _session() as session:
+        employee = await session.get(Employee, employee_id)
+        if not employee:
+            return False
+        old = (employee.country, employee.job_title, employee.salary)
+        await session.delete(employee)
+        await session.commit()
+    record_employee_changes([(employee_id, old, None)])
+    return True
+
+
+async def _cached_employee_entry_async(employee_id: int) -> Optional[Dict]:
+    """Async version of services._cached_employee_entry"""
+    await _sync_data_versions_async()
+    version, entry = lookup_cached_employee(employee_id)
+    if entry is not None:
+        return entry
+    
+    async with _session() as session:
+        employee = await session.get(Employee, employee_id)
+        return store_cached_employee(employee_id, version, employee.to_dict()) if employee else None
@@ -0,0 +1,222 @@
+"""CLI commands - registered on the application's `flask` command group"""
+
+import csv
+import hashlib
+import math
+import os
+import time
+from itertools import islice
+from typing import Dict
+import click
+from flask import Flask, current_app
+from flask.cli import with_appcontext
+from controllers import validate_employee_data
+from constants import IMPORT_CHUNK_SIZE
+from services import (
+    get_import_checkpoint_service,
+    import_employees_chunk_service,
+    complete_import_service,
+    reset_import_service,
+    rebuild_search_index_service,
+    rebuild_salary_summary_service,
+    verify_salary_summary_service,
+    get_payroll_job_service,
+    start_payroll_job_service,
+    compact_change_log_service,
+    save_analytics_snapshot_service
+)
+
+
+def _file_fingerprint(path: str) -> str:
+    """SHA-256 of the file contents, used to recognise a file across runs"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _parse_csv_row(row: Dict) -> Dict:
+    """
+    Turn a CSV row into the JSON shape validated by create_employee_controller.
+    
+    Empty cells count as missing fields and salary is parsed as a number;
+    unparseable or non-finite salaries are left as text so validation rejects them.
+    """
+    data = {
+        key.strip(): value.strip()
+        for key, value in row.items()
+        if key and isinstance(value, str) and value.strip()
+    }
+    if 'salary' in data:
+        try:
+            salary = float(data['salary'])
+        except ValueError:
+            salary = None
+        if salary is not None and math.isfinite(salary):
+            data['salary'] = salary
+    return data
+
+
+@click.command('import-employees')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', default=IMPORT_CHUNK_SIZE, show_default=True,
+              help='CSV rows committed per transaction.')
+@click.option('--restart', is_flag=True, help='Ignore earlier progress and import the file from the start.')
+@with_appcontext
+def import_employees_command(path: str, chunk_size: int, restart: bool):
+    """
+    Import employees from a CSV file with full_name, job_title, country and salary columns.
+    
+    The file is read as a stream and committed chunk by chunk. Progress is
+    stored with every chunk, so rerunning the command after a crash resumes
+    after the last committed chunk.
+    """
+    fingerprint = _file_fingerprint(path)
+    source = os.path.basename(path)
+    if restart:
+        reset_import_service(fingerprint)
+    
+    checkpoint = get_import_checkpoint_service(fingerprint)
+    if checkpoint is not None and checkpoint.completed:
+        click.echo(f'{source} was already imported ({checkpoint.employees_created} employees). '
+                   'Use --restart to import it again.')
+        return
+    skip = checkpoint.rows_processed if checkpoint is not None else 0
+    if skip:
+        click.echo(f'Resuming {source} after row {skip}')
+    
+    created = invalid = 0
+    started = time.perf_counter()
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        reader = csv.DictReader(handle)
+        # Skip rows committed by an earlier run
+        for _ in islice(reader, skip):
+            pass
+        rows_processed = skip
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                break
+            
+            rows = []
+            for offset, row in enumerate(chunk, start=rows_processed + 1):
+                data = _parse_csv_row(row)
+                error = validate_employee_data(data)
+                if error:
+                    invalid += 1
+                    click.echo(f'Row {offset}: {error}', err=True)
+                    continue
+                rows.append({
+                    'full_name': data['full_name'],
+                    'job_title': data['job_title'],
+                    'country': data['country'],
+                    'salary': float(data['salary'])
+                })
+            
+            rows_processed += len(chunk)
+            created += len(import_employees_chunk_service(fingerprint, source, rows, rows_processed))
+            rate = (rows_processed - skip) / max(time.perf_counter() - started, 1e-9)
+            click.echo(f'Committed {rows_processed} rows: {created} created, {invalid} invalid ({rate:,.0f} rows/s)')
+    
+    complete_import_service(fingerprint, source)
+    click.echo(f'Imported {source}: {created} created, {invalid} invalid')
+
+
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """Create the employee name search index if missing and rebuild it from the employees table."""
+    started = time.perf_counter()
+    rebuild_search_index_service()
+    click.echo(f'Rebuilt the employee search index in {time.perf_counter() - started:.1f}s')
+
+
+@click.command('rebuild-salary-summary')
+@with_appcontext
+def rebuild_salary_summary_command():
+    """Create the salary_summary table and triggers if missing and refill it from the employees table."""
+    started = time.perf_counter()
+    rebuild_salary_summary_service()
+    click.echo(f'Rebuilt the salary summary in {time.perf_counter() - started:.1f}s')
+
+
+@click.command('verify-salary-summary')
+@with_appcontext
+def verify_salary_summary_command():
+    """Compare salary_summary with live aggregates; exits with status 1 if any group differs."""
+    mismatches = verify_salary_summary_service()
+    for mismatch in mismatches:
+        click.echo(f"{mismatch['dimension']}={mismatch['group']}: summary {mismatch['cached']}, "
+                   f"actual {mismatch['actual']}", err=True)
+    if mismatches:
+        raise SystemExit(1)
+    click.echo('Salary summary matches the employees table')
+
+
+@click.command('resume-payroll-job')
+@click.argument('job_id', type=int)
+@with_appcontext
+def resume_payroll_job_command(job_id: int):
+    """Restart an interrupted or failed payroll job, skipping completed partitions, and wait for it."""
+    job = get_payroll_job_service(job_id)
+    if job is None:
+        raise click.ClickException(f'Payroll job {job_id} not found')
+    if job['status'] == 'completed':
+        click.echo(f'Payroll job {job_id} already completed ({job["payslips"]} payslips)')
+        return
+    
+    start_payroll_job_service(job_id)
+    while True:
+        job = get_payroll_job_service(job_id)
+        click.echo(f"{job['partitions']['completed']}/{job['partitions']['total']} partitions, "
+                   f"{job['payslips']} payslips ({job['payslips_per_second'] or 0:,.0f}/s)")
+        if not job['active']:
+            break
+        time.sleep(1)
+    if job['status'] != 'completed':
+        raise click.ClickException(f"Payroll job {job_id} {job['status']}: {job['error']}")
+
+
+@click.command('compact-change-log')
+@click.option('--retention-days', type=int, default=None,
+              help='Days of changes to keep (defaults to CHANGE_LOG_RETENTION_DAYS).')
+@with_appcontext
+def compact_change_log_command(retention_days: int):
+    """Drop superseded employee changes and changes older than the retention period (run it from cron)."""
+    if retention_days is None:
+        retention_days = current_app.config['CHANGE_LOG_RETENTION_DAYS']
+    result = compact_change_log_service(retention_days)
+    click.echo(f"Compacted {result['compacted']} superseded and expired {result['expired']} old changes; "
+               f"cursors before {result['purged_through']} must resync")
+
+
+@click.command('save-analytics-snapshot')
+@click.option('--path', default=None, help='Directory to save to (defaults to ANALYTICS_SNAPSHOT_PATH).')
+@with_appcontext
+def save_analytics_snapshot_command(path: str):
+    """Rebuild the columnar analytics snapshot and save it for new processes to load memory-mapped."""
+    path = path or current_app.config['ANALYTICS_SNAPSHOT_PATH']
+    if not path:
+        raise click.ClickException('Pass --path or set ANALYTICS_SNAPSHOT_PATH')
+    started = time.perf_counter()
+    stats = save_analytics_snapshot_service(path)
+    click.echo(f"Saved {stats['rows']} employees to {path} in {time.perf_counter() - started:.1f}s: "
+               f"{stats['bytes'] / 2 ** 20:.1f} MiB, {stats['bytes_per_row']} bytes per employee "
+               f"({stats['bytes_per_row'] * 10 ** 6 / 2 ** 20:.1f} MiB per million)")
+
+
+def register_commands(app: Flask):
+    """
+    Register all CLI commands with the Flask application.
+    
+    Args:
+        app: Flask application instance
+    """
+    app.cli.add_command(import_employees_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(rebuild_salary_summary_command)
+    app.cli.add_command(verify_salary_summary_command)
+    app.cli.add_command(resume_payroll_job_command)
+    app.cli.add_command(compact_change_log_command)
+    app.cli.add_command(save_analytics_snapshot_command)
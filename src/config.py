@@ -0,0 +1,113 @@
+"""Application configuration - defaults, environment overrides and named config objects"""
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    return value.strip().lower() in ('1', 'true', 'yes', 'on') if value else default
+
+
+class Config:
+    """
+    Default settings, overridable through environment variables.
+    
+    Any setting can also be overridden with a FLASK_-prefixed environment
+    variable (e.g. FLASK_DB_POOL_SIZE=20), or by passing a config object or
+    dictionary to create_app.
+    """
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///employees.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # Employee LRU cache. On SQLite entries are checked against the change log,
+    # read at most once per sync interval (capped at the TTL), so writes by
+    # other processes invalidate them within that interval; this process's
+    # writes invalidate them at once. Other backends have no change log and
+    # only see this process's writes: run a single writer process, or set a
+    # TTL no longer than the staleness you can accept.
+    EMPLOYEE_CACHE_SIZE = 4096
+    EMPLOYEE_CACHE_TTL = 300  # seconds
+    EMPLOYEE_CACHE_SYNC_INTERVAL = 0.5  # seconds
+    
+    # Serve the employee CRUD and salary endpoints with async views on an async
+    # engine (ASYNC_DATABASE_URI, defaulting to the database URI with an async
+    # driver such as aiosqlite). The views run on one event loop per process,
+    # which owns the engine's connection pool. Needs a database file or server.
+    ASYNC_MODE = _env_bool('ASYNC_MODE', False)
+    ASYNC_DATABASE_URI = os.environ.get('ASYNC_DATABASE_URI')
+    
+    # Per-country TDS slab tables (JSON, see tax_rules.json for the format)
+    TAX_RULES_PATH = os.environ.get('TAX_RULES_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                   'tax_rules.json'))
+    
+    # JSON encoder for responses and NDJSON streams: auto (orjson if installed), orjson or json
+    JSON_ENCODER = os.environ.get('JSON_ENCODER', 'auto')
+    
+    # SQLite connection pragmas, applied to every new connection. WAL lets
+    # readers run while a write is in progress, and synchronous=NORMAL only
+    # fsyncs at checkpoints (safe against corruption in WAL mode; the last
+    # commits may be lost on power failure).
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = _env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)  # bytes
+    SQLITE_CACHE_SIZE = _env_int('SQLITE_CACHE_SIZE', -64 * 1024)  # negative = KiB, i.e. 64 MiB
+    SQLITE_BUSY_TIMEOUT = _env_int('SQLITE_BUSY_TIMEOUT', 5000)  # milliseconds
+    
+    # Connection pool settings for server databases (PostgreSQL, MySQL)
+    DB_POOL_SIZE = _env_int('DB_POOL_SIZE', 10)
+    DB_MAX_OVERFLOW = _env_int('DB_MAX_OVERFLOW', 20)
+    DB_POOL_TIMEOUT = _env_int('DB_POOL_TIMEOUT', 30)  # seconds
+    DB_POOL_RECYCLE = _env_int('DB_POOL_RECYCLE', 1800)  # seconds
+    DB_POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', True)
+    
+    # Days of employee change log kept by compact-change-log; change feed
+    # cursors older than that get 410 Gone and must resync
+    CHANGE_LOG_RETENTION_DAYS = _env_int('CHANGE_LOG_RETENTION_DAYS', 30)
+    
+    # Threads running background payroll job partitions (0 runs them inline in
+    # the request). SQLite has a single writer, so more than one only helps on
+    # server databases.
+    PAYROLL_JOB_WORKERS = _env_int('PAYROLL_JOB_WORKERS', 1)
+    
+    # Engine behind the salary metrics, histogram and payroll endpoints: 'sql',
+    # or 'columnar' for an in-memory NumPy snapshot of the employees table
+    # (about 21 bytes per employee). On SQLite the snapshot catches up from the
+    # change log, and with ANALYTICS_SNAPSHOT_PATH set new processes load the
+    # copy saved by save-analytics-snapshot (memory-mapped) instead of
+    # rebuilding it.
+    ANALYTICS_ENGINE = os.environ.get('ANALYTICS_ENGINE', 'sql')
+    ANALYTICS_SNAPSHOT_PATH = os.environ.get('ANALYTICS_SNAPSHOT_PATH')
+    
+    # Request latency / SQL metrics at /metrics, and the slow-request log
+    # (requests at or above the threshold are logged with their SQL; 0 disables)
+    METRICS_ENABLED = _env_bool('METRICS_ENABLED', True)
+    SLOW_REQUEST_THRESHOLD_MS = _env_int('SLOW_REQUEST_THRESHOLD_MS', 500)
+    SLOW_REQUEST_MAX_STATEMENTS = _env_int('SLOW_REQUEST_MAX_STATEMENTS', 50)
+
+
+class DevelopmentConfig(Config):
+    DEBUG = True
+
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # One in-memory connection is shared, so jobs run inline
+    PAYROLL_JOB_WORKERS = 0
+
+
+class ProductionConfig(Config):
+    pass
+
+
+# Config objects selectable by name, e.g. APP_CONFIG=production
+CONFIGS = {
+    'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
+}
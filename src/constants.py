@@ -6,10 +6,71 @@ class Country:
     UNITED_STATES = 'United States'
 
 
-# TDS (Tax Deducted at Source) rates by country
-TDS_RATES = {
-    Country.INDIA: 0.10,  # 10%
-    Country.UNITED_STATES: 0.12,  # 12%
-    # Other countries have 0% TDS (default)
+# Number of rows inserted per transaction by bulk employee creation
+BULK_INSERT_CHUNK_SIZE = 500
+
+# Columns that can be requested with the fields= projection on employee lists
+EMPLOYEE_FIELDS = ('id', 'full_name', 'job_title', 'country', 'salary')
+
+# Largest page size accepted by keyset pagination on employee lists
+MAX_PAGE_LIMIT = 1000
+
+# Streaming export formats and their response mimetypes
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
 }
 
+# Number of rows fetched from the database cursor per round-trip during exports
+EXPORT_CHUNK_SIZE = 1000
+
+# Percentiles reported by the salary metrics endpoints
+SALARY_PERCENTILES = (50, 90, 99)
+
+# Relative error bound of the per-group quantile sketches (1%)
+QUANTILE_RELATIVE_ACCURACY = 0.01
+
+# Groups up to this size get exact percentiles instead of sketch estimates
+EXACT_QUANTILE_THRESHOLD = 1000
+
+# Bucket count used by salary histograms when no edges are given, and the largest allowed
+DEFAULT_HISTOGRAM_BUCKETS = 10
+MAX_HISTOGRAM_BUCKETS = 100
+
+# Number of employees computed per vectorized batch during payroll runs
+PAYROLL_CHUNK_SIZE = 10000
+
+# Employee IDs per partition of a background payroll job, and payslips per INSERT batch
+PAYROLL_JOB_PARTITION_SIZE = 10000
+PAYSLIP_INSERT_BATCH_SIZE = 1000
+
+# Page size of payslip listings by default, and the largest allowed
+DEFAULT_PAYSLIP_LIMIT = 100
+MAX_PAYSLIP_LIMIT = 1000
+
+# Change feed page size by default, and the largest allowed
+DEFAULT_CHANGES_LIMIT = 100
+MAX_CHANGES_LIMIT = 1000
+
+# Number of CSV rows committed per transaction by the employee import command
+IMPORT_CHUNK_SIZE = 1000
+
+# Upper bounds (seconds) of the request latency histogram buckets exposed at /metrics
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds of the SQL-statements-per-request histogram buckets exposed at /metrics
+SQL_QUERY_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+# Largest ID or cursor accepted in URLs and request parameters (the 64-bit
+# INTEGER range of SQLite and BIGINT columns); larger values cannot be bound
+MAX_ROW_ID = 2 ** 63 - 1
+
+# Largest number of employee IDs accepted by the batch lookup endpoints
+MAX_BATCH_IDS = 1000
+
+# Number of IDs per IN (...) query in batch lookups (stays below SQLite's bound-parameter limit)
+ID_LOOKUP_CHUNK_SIZE = 500
+
+# Number of matches returned by employee name search by default, and the largest allowed
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
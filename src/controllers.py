@@ -1,37 +1,108 @@
 """Controller layer - handles request/response logic and validation"""
 
-from flask import jsonify
-from typing import Dict, Optional, List, Tuple
+import csv
+import io
+import math
+import re
+from flask import current_app, jsonify
+from typing import Dict, Optional, List, Tuple, Union, Iterator
 from services import (
     create_employee_service,
-    get_employee_service,
-    get_all_employees_service,
+    get_employee_dict_service,
+    calculate_employee_salary_service,
+    get_employee_cache_stats_service,
+    get_request_metrics_service,
+    get_employees_page_service,
+    get_employees_by_ids_service,
+    calculate_salaries_by_ids_service,
+    iter_employees_service,
+    search_employees_service,
+    change_log_maintained_service,
+    get_employee_changes_service,
+    get_latest_change_cursor_service,
     update_employee_service,
+    bulk_adjust_salaries_service,
     delete_employee_service,
     calculate_net_salary,
     get_salary_metrics_by_country,
-    get_average_salary_by_job_title
+    get_average_salary_by_job_title,
+    get_salary_metrics_summary,
+    get_combined_salary_metrics,
+    get_salary_histogram,
+    run_payroll_service,
+    create_payroll_job_service,
+    start_payroll_job_service,
+    get_payroll_job_service,
+    get_payslips_service,
+    get_data_etag_service,
+    get_employee_etag_service,
+    create_employees_bulk_service
+)
+from async_services import (
+    create_employee_service_async,
+    get_employee_dict_service_async,
+    calculate_employee_salary_service_async,
+    get_employees_page_service_async,
+    get_employees_by_ids_service_async,
+    update_employee_service_async,
+    delete_employee_service_async,
+    get_data_etag_service_async,
+    get_employee_etag_service_async
+)
+from serialization import ndjson_chunks
+from constants import (
+    EMPLOYEE_FIELDS,
+    MAX_PAGE_LIMIT,
+    MAX_BATCH_IDS,
+    MAX_ROW_ID,
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+    DEFAULT_CHANGES_LIMIT,
+    MAX_CHANGES_LIMIT,
+    EXPORT_FORMATS,
+    EXPORT_CHUNK_SIZE,
+    DEFAULT_HISTOGRAM_BUCKETS,
+    MAX_HISTOGRAM_BUCKETS,
+    DEFAULT_PAYSLIP_LIMIT,
+    MAX_PAYSLIP_LIMIT
 )
 
 
-def create_employee_controller(data: Dict) -> Tuple[Dict, int]:
+def validate_employee_data(data: Dict) -> Optional[str]:
     """
-    Controller for creating an employee.
+    Validate the fields required to create an employee.
     
     Args:
-        data: Request JSON data
+        data: Employee JSON data
         
     Returns:
-        Tuple of (response_dict, status_code)
+        Error message, or None if the data is valid
     """
     # Validate required fields
     required_fields = ['full_name', 'job_title', 'country', 'salary']
-    if not data or not all(field in data for field in required_fields):
-        return {'error': 'Missing required fields'}, 400
+    if not data or not isinstance(data, dict) or not all(field in data for field in required_fields):
+        return 'Missing required fields'
     
     # Validate salary is positive
     if not isinstance(data['salary'], (int, float)) or data['salary'] < 0:
-        return {'error': 'Salary must be a positive number'}, 400
+        return 'Salary must be a positive number'
+    
+    return None
+
+
+def create_employee_controller(data: Dict) -> Tuple[Dict, int]:
+    """
+    Controller for creating an employee.
+    
+    Args:
+        data: Request JSON data
+        
+    Returns:
+        Tuple of (response_dict, status_code)
+    """
+    error = validate_employee_data(data)
+    if error:
+        return {'error': error}, 400
     
     # Call service to create employee
     employee = create_employee_service(
@@ -44,6 +115,45 @@ def create_employee_controller(data: Dict) -> Tuple[Dict, int]:
     return employee.to_dict(), 201
 
 
+def create_employees_bulk_controller(data: List[Dict]) -> Tuple[Dict, int]:
+    """
+    Controller for creating many employees in one request.
+    
+    Every row is validated with the same rules as create_employee_controller.
+    Valid rows are inserted in batches; invalid rows are reported by index.
+    
+    Args:
+        data: Request JSON data (list of employee objects)
+        
+    Returns:
+        Tuple of (response_dict, status_code)
+    """
+    if not isinstance(data, list) or not data:
+        return {'error': 'Expected a non-empty list of employees'}, 400
+    
+    rows = []
+    indexes = []
+    errors = []
+    for index, item in enumerate(data):
+        error = validate_employee_data(item)
+        if error:
+            errors.append({'index': index, 'error': error})
+            continue
+        rows.append({
+            'full_name': item['full_name'],
+            'job_title': item['job_title'],
+            'country': item['country'],
+            'salary': float(item['salary'])
+        })
+        indexes.append(index)
+    
+    ids = create_employees_bulk_service(rows) if rows else []
+    created = [{'index': index, 'id': employee_id} for index, employee_id in zip(indexes, ids)]
+    
+    status_code = 201 if created else 400
+    return {'created': created, 'errors': errors}, status_code
+
+
 def get_employee_controller(employee_id: int) -> Tuple[Dict, int]:
     """
     Controller for getting an employee by ID.
@@ -54,42 +164,273 @@ def get_employee_controller(employee_id: int) -> Tuple[Dict, int]:
     Returns:
         Tuple of (response_dict, status_code)
     """
-    employee = get_employee_service(employee_id)
+    employee = get_employee_dict_service(employee_id)
     if not employee:
         return {'error': 'Employee not found'}, 404
     
-    return employee.to_dict(), 200
+    return employee, 200
+
+
+def _parse_employee_list_args(limit: Optional[str], after: Optional[str], fields: Optional[str],
+                              country: Optional[str], job_title: Optional[str], min_salary: Optional[str],
+                              max_salary: Optional[str]) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Validate employee list query parameters.
+    
+    Returns:
+        Tuple of (keyword arguments for get_employees_page_service, error message)
+    """
+    try:
+        page_limit = int(limit) if limit is not None else None
+        cursor = int(after) if after is not None else None
+    except ValueError:
+        return None, 'limit and after must be integers'
+    
+    try:
+        salary_from = float(min_salary) if min_salary is not None else None
+        salary_to = float(max_salary) if max_salary is not None else None
+    except ValueError:
+        return None, 'min_salary and max_salary must be numbers'
+    
+    if page_limit is not None and not 1 <= page_limit <= MAX_PAGE_LIMIT:
+        return None, f'limit must be between 1 and {MAX_PAGE_LIMIT}'
+    if cursor is not None and abs(cursor) > MAX_ROW_ID:
+        return None, 'after is out of range'
+    
+    field_names = None
+    if fields:
+        field_names = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in field_names if name not in EMPLOYEE_FIELDS]
+        if unknown:
+            return None, f"Unknown fields: {', '.join(unknown)}"
+    
+    return {
+        'limit': page_limit,
+        'after': cursor,
+        'fields': field_names,
+        'country': country,
+        'job_title': job_title,
+        'min_salary': salary_from,
+        'max_salary': salary_to
+    }, None
 
 
-def get_all_employees_controller() -> Tuple[List[Dict], int]:
+def _parse_employee_ids(values: object) -> Tuple[Optional[List[int]], Optional[str]]:
+    """
+    Validate a list of employee IDs for the batch endpoints.
+    
+    Returns:
+        Tuple of (IDs without duplicates, in their original order, error message)
+    """
+    if not isinstance(values, list) or not values:
+        return None, 'ids must be a non-empty list of employee IDs'
+    if any(isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_ROW_ID for value in values):
+        return None, f'ids must be integers between 1 and {MAX_ROW_ID}'
+    
+    employee_ids = list(dict.fromkeys(values))
+    if len(employee_ids) > MAX_BATCH_IDS:
+        return None, f'At most {MAX_BATCH_IDS} ids can be requested at once'
+    return employee_ids, None
+
+
+def _parse_ids_arg(ids: str, query: Dict) -> Tuple[Optional[List[int]], Optional[str]]:
+    """Validate the comma-separated ids= list parameter, which only combines with fields="""
+    if any(value is not None for name, value in query.items() if name != 'fields'):
+        return None, 'ids can only be combined with fields'
+    try:
+        values = [int(value) for value in ids.split(',') if value.strip()]
+    except ValueError:
+        return None, 'ids must be a comma-separated list of integers'
+    return _parse_employee_ids(values)
+
+
+def _employee_list_response(employees: List[Dict], limit: Optional[int]) -> Union[List[Dict], Dict]:
+    """Return the full list, or a page with the cursor for the next page when limited"""
+    if limit is None:
+        return employees
+    
+    next_after = employees[-1]['id'] if len(employees) == limit else None
+    return {'employees': employees, 'next_after': next_after}
+
+
+def get_all_employees_controller(limit: Optional[str] = None, after: Optional[str] = None,
+                                 fields: Optional[str] = None, country: Optional[str] = None,
+                                 job_title: Optional[str] = None, min_salary: Optional[str] = None,
+                                 max_salary: Optional[str] = None,
+                                 ids: Optional[str] = None) -> Tuple[Union[List[Dict], Dict], int]:
     """
     Controller for getting all employees.
     
+    Without a limit the full list is returned. With a limit a single page is
+    returned together with the cursor for the next page. With ids only those
+    employees are returned, together with the IDs that were not found.
+    
+    Args:
+        limit: Optional page size
+        after: Optional keyset cursor (last employee ID of the previous page)
+        fields: Optional comma-separated list of fields to return
+        country: Optional country filter
+        job_title: Optional job title filter
+        min_salary: Optional lower salary bound (inclusive)
+        max_salary: Optional upper salary bound (inclusive)
+        ids: Optional comma-separated employee IDs to look up
+        
     Returns:
-        Tuple of (response_list, status_code)
+        Tuple of (response_list or page_dict, status_code)
     """
-    employees = get_all_employees_service()
-    return [emp.to_dict() for emp in employees], 200
+    query, error = _parse_employee_list_args(limit, after, fields, country, job_title, min_salary, max_salary)
+    if error:
+        return {'error': error}, 400
+    
+    if ids is not None:
+        employee_ids, error = _parse_ids_arg(ids, query)
+        if error:
+            return {'error': error}, 400
+        employees, missing = get_employees_by_ids_service(employee_ids, query['fields'])
+        return {'employees': employees, 'missing': missing}, 200
+    
+    employees = get_employees_page_service(**query)
+    return _employee_list_response(employees, query['limit']), 200
 
 
-def update_employee_controller(employee_id: int, data: Dict) -> Tuple[Dict, int]:
+def search_employees_controller(query_text: Optional[str], country: Optional[str] = None,
+                                job_title: Optional[str] = None, limit: Optional[str] = None) -> Tuple[Dict, int]:
     """
-    Controller for updating an employee.
+    Controller for searching employees by name.
     
     Args:
-        employee_id: Employee ID
-        data: Request JSON data
+        query_text: Search text; every word is matched as a name-word prefix
+        country: Optional country filter
+        job_title: Optional job title filter
+        limit: Optional maximum number of matches
         
     Returns:
         Tuple of (response_dict, status_code)
     """
+    if not query_text or not re.search(r'\w', query_text):
+        return {'error': 'q must contain at least one letter or digit'}, 400
+    
+    try:
+        match_limit = int(limit) if limit is not None else DEFAULT_SEARCH_LIMIT
+    except ValueError:
+        return {'error': 'limit must be an integer'}, 400
+    if not 1 <= match_limit <= MAX_SEARCH_LIMIT:
+        return {'error': f'limit must be between 1 and {MAX_SEARCH_LIMIT}'}, 400
+    
+    employees = search_employees_service(query_text, country=country, job_title=job_title, limit=match_limit)
+    return {'employees': employees}, 200
+
+
+def get_employee_changes_controller(since: Optional[str] = None,
+                                    limit: Optional[str] = None) -> Tuple[Dict, int]:
+    """
+    Controller for the employee change feed.
+    
+    Args:
+        since: Cursor of the last applied change, 0 / omitted for the start of
+            the log, or 'latest' to get the current cursor (e.g. before a full sync)
+        limit: Optional page size
+        
+    Returns:
+        Tuple of (page dict with changes, next_cursor and has_more, or error dict, status_code)
+    """
+    if not change_log_maintained_service():
+        return {'error': 'The change feed is only available on SQLite'}, 501
+    try:
+        page_limit = int(limit) if limit is not None else DEFAULT_CHANGES_LIMIT
+        cursor = int(since) if since not in (None, 'latest') else 0
+    except ValueError:
+        return {'error': "since must be an integer cursor or 'latest', and limit an integer"}, 400
+    if not 1 <= page_limit <= MAX_CHANGES_LIMIT:
+        return {'error': f'limit must be between 1 and {MAX_CHANGES_LIMIT}'}, 400
+    if not 0 <= cursor <= MAX_ROW_ID:
+        return {'error': f'since must be between 0 and {MAX_ROW_ID}'}, 400
+    
+    if since == 'latest':
+        return {'changes': [], 'next_cursor': get_latest_change_cursor_service(), 'has_more': False}, 200
+    
+    page = get_employee_changes_service(cursor, page_limit)
+    if page is None:
+        return {'error': 'Cursor expired by change log retention; resync from GET /api/employees'}, 410
+    return page, 200
+
+
+def export_employees_controller(export_format: Optional[str],
+                                include: Optional[str] = None) -> Tuple[Union[Iterator[Union[str, bytes]], Dict], int]:
+    """
+    Controller for streaming a full export of the employee table.
+    
+    Args:
+        export_format: 'ndjson' or 'csv'
+        include: Optional comma-separated extras; 'net_salary' adds the
+            calculate_net_salary output to every row
+        
+    Returns:
+        Tuple of (line generator or error dict, status_code)
+    """
+    export_format = export_format or 'ndjson'
+    if export_format not in EXPORT_FORMATS:
+        return {'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}, 400
+    
+    extras = [name.strip() for name in include.split(',') if name.strip()] if include else []
+    if any(name != 'net_salary' for name in extras):
+        return {'error': 'include only supports net_salary'}, 400
+    with_net_salary = 'net_salary' in extras
+    
+    def rows() -> Iterator[Dict]:
+        for employee in iter_employees_service():
+            if with_net_salary:
+                employee.update(calculate_net_salary(employee['salary'], employee['country']))
+            yield employee
+    
+    if export_format == 'ndjson':
+        return ndjson_chunks(current_app.json, rows(), EXPORT_CHUNK_SIZE), 200
+    
+    def csv_lines() -> Iterator[str]:
+        columns = list(EMPLOYEE_FIELDS)
+        if with_net_salary:
+            columns += ['gross_salary', 'tds', 'net_salary']
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+        for row in rows():
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    return csv_lines(), 200
+
+
+def _validate_update_data(data: Dict) -> Optional[str]:
+    """Validate the fields of an employee update, returning an error message or None"""
     if not data:
-        return {'error': 'No data provided'}, 400
+        return 'No data provided'
     
     # Validate salary if provided
     if 'salary' in data:
         if not isinstance(data['salary'], (int, float)) or data['salary'] < 0:
-            return {'error': 'Salary must be a positive number'}, 400
+            return 'Salary must be a positive number'
+    
+    return None
+
+
+def update_employee_controller(employee_id: int, data: Dict) -> Tuple[Dict, int]:
+    """
+    Controller for updating an employee.
+    
+    Args:
+        employee_id: Employee ID
+        data: Request JSON data
+        
+    Returns:
+        Tuple of (response_dict, status_code)
+    """
+    error = _validate_update_data(data)
+    if error:
+        return {'error': error}, 400
     
     employee = update_employee_service(employee_id, data)
     if not employee:
@@ -98,6 +439,43 @@ def update_employee_controller(employee_id: int, data: Dict) -> Tuple[Dict, int]
     return employee.to_dict(), 200
 
 
+def bulk_adjust_salaries_controller(data: Optional[Dict]) -> Tuple[Dict, int]:
+    """
+    Controller for adjusting the salaries of a group of employees at once.
+    
+    Args:
+        data: Request JSON with optional country, job_title, min_salary and
+            max_salary filters, exactly one of percent or amount, and an
+            optional dry_run flag
+        
+    Returns:
+        Tuple of (response_dict, status_code)
+    """
+    if not isinstance(data, dict):
+        return {'error': 'Request body must be a JSON object'}, 400
+    
+    unknown = set(data) - {'country', 'job_title', 'min_salary', 'max_salary', 'percent', 'amount', 'dry_run'}
+    if unknown:
+        return {'error': f"Unknown fields: {', '.join(sorted(unknown))}"}, 400
+    for name in ('country', 'job_title'):
+        if name in data and not isinstance(data[name], str):
+            return {'error': f'{name} must be a string'}, 400
+    for name in ('min_salary', 'max_salary', 'percent', 'amount'):
+        value = data.get(name)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                  or not math.isfinite(value)):
+            return {'error': f'{name} must be a number'}, 400
+    if (data.get('percent') is None) == (data.get('amount') is None):
+        return {'error': 'Provide exactly one of percent or amount'}, 400
+    if not isinstance(data.get('dry_run', False), bool):
+        return {'error': 'dry_run must be a boolean'}, 400
+    
+    result = bulk_adjust_salaries_service(**data)
+    if result['affected'] and result['min_salary_after'] < 0:
+        return {'error': 'Adjustment would make a salary negative', **result}, 400
+    return result, 200
+
+
 def delete_employee_controller(employee_id: int) -> Tuple[str, int]:
     """
     Controller for deleting an employee.
@@ -125,37 +503,406 @@ def calculate_salary_controller(employee_id: int) -> Tuple[Dict, int]:
     Returns:
         Tuple of (response_dict, status_code)
     """
-    employee = get_employee_service(employee_id)
-    if not employee:
+    salary_data = calculate_employee_salary_service(employee_id)
+    if not salary_data:
         return {'error': 'Employee not found'}, 404
     
-    salary_data = calculate_net_salary(employee.salary, employee.country)
     return salary_data, 200
 
 
-def get_salary_metrics_controller(country: Optional[str], job_title: Optional[str]) -> Tuple[Dict, int]:
+def calculate_salaries_controller(data: Optional[Dict]) -> Tuple[Dict, int]:
+    """
+    Controller for calculating the net salaries of many employees at once.
+    
+    Args:
+        data: Request JSON with an ids list
+        
+    Returns:
+        Tuple of (response_dict, status_code)
+    """
+    if not isinstance(data, dict):
+        return {'error': 'Request body must be a JSON object with ids'}, 400
+    
+    employee_ids, error = _parse_employee_ids(data.get('ids'))
+    if error:
+        return {'error': error}, 400
+    
+    salaries, missing = calculate_salaries_by_ids_service(employee_ids)
+    return {'salaries': salaries, 'missing': missing}, 200
+
+
+def get_salary_metrics_controller(countries: List[str], job_titles: List[str],
+                                  exact: Optional[str] = None) -> Tuple[Dict, int]:
     """
     Controller for getting salary metrics.
     
     Args:
-        country: Optional country name
-        job_title: Optional job title
+        countries: Country names; several are combined into one group
+        job_titles: Job titles; several are combined into one group
+        exact: Optional flag ('true'/'1') to force exact percentiles
         
     Returns:
         Tuple of (response_dict, status_code)
     """
-    if country:
-        metrics = get_salary_metrics_by_country(country)
+    exact_quantiles = (exact or '').lower() in ('1', 'true', 'yes')
+    countries = [country for country in countries if country]
+    job_titles = [job_title for job_title in job_titles if job_title]
+    
+    if len(countries) == 1:
+        metrics = get_salary_metrics_by_country(countries[0], exact=exact_quantiles)
         if not metrics:
             return {'error': 'No employees found for this country'}, 404
         return metrics, 200
     
-    elif job_title:
-        metrics = get_average_salary_by_job_title(job_title)
+    elif countries:
+        metrics = get_combined_salary_metrics('country', countries, exact=exact_quantiles)
+        if not metrics:
+            return {'error': 'No employees found for these countries'}, 404
+        return metrics, 200
+    
+    elif len(job_titles) == 1:
+        metrics = get_average_salary_by_job_title(job_titles[0], exact=exact_quantiles)
         if not metrics:
             return {'error': 'No employees found for this job title'}, 404
         return metrics, 200
     
+    elif job_titles:
+        metrics = get_combined_salary_metrics('job_title', job_titles, exact=exact_quantiles)
+        if not metrics:
+            return {'error': 'No employees found for these job titles'}, 404
+        return metrics, 200
+    
     else:
         return {'error': 'Please provide either country or job_title parameter'}, 400
 
+
+def get_salary_metrics_summary_controller(include_pairs: Optional[str] = None) -> Tuple[Dict, int]:
+    """
+    Controller for getting salary metrics for all countries and job titles.
+    
+    Args:
+        include_pairs: Optional flag ('true'/'1') to add country x job_title metrics
+        
+    Returns:
+        Tuple of (response_dict, status_code)
+    """
+    with_pairs = (include_pairs or '').lower() in ('1', 'true', 'yes')
+    return get_salary_metrics_summary(include_pairs=with_pairs), 200
+
+
+def get_salary_histogram_controller(country: Optional[str], job_title: Optional[str], edges: Optional[str] = None,
+                                    buckets: Optional[str] = None, scale: Optional[str] = None) -> Tuple[Dict, int]:
+    """
+    Controller for getting a salary histogram.
+    
+    Args:
+        country: Optional country filter
+        job_title: Optional job title filter
+        edges: Optional comma-separated, increasing bucket edges
+        buckets: Optional number of buckets when edges are not given
+        scale: Optional 'linear' (default) or 'log' spacing when edges are not given
+        
+    Returns:
+        Tuple of (response_dict, status_code)
+    """
+    scale = scale or 'linear'
+    if scale not in ('linear', 'log'):
+        return {'error': 'scale must be linear or log'}, 400
+    
+    edge_values = None
+    if edges:
+        try:
+            edge_values = [float(edge) for edge in edges.split(',')]
+        except ValueError:
+            return {'error': 'edges must be numbers'}, 400
+        if not all(math.isfinite(edge) for edge in edge_values):
+            return {'error': 'edges must be finite numbers'}, 400
+        if len(edge_values) < 2 or any(low >= high for low, high in zip(edge_values, edge_values[1:])):
+            return {'error': 'edges must contain at least two increasing values'}, 400
+        if len(edge_values) - 1 > MAX_HISTOGRAM_BUCKETS:
+            return {'error': f'At most {MAX_HISTOGRAM_BUCKETS} buckets are allowed'}, 400
+    
+    try:
+        bucket_count = int(buckets) if buckets is not None else DEFAULT_HISTOGRAM_BUCKETS
+    except ValueError:
+        return {'error': 'buckets must be an integer'}, 400
+    if not 1 <= bucket_count <= MAX_HISTOGRAM_BUCKETS:
+        return {'error': f'buckets must be between 1 and {MAX_HISTOGRAM_BUCKETS}'}, 400
+    
+    histogram = get_salary_histogram(
+        edges=edge_values,
+        bucket_count=bucket_count,
+        scale=scale,
+        country=country,
+        job_title=job_title
+    )
+    filters = {name: value for name, value in (('country', country), ('job_title', job_title)) if value}
+    return {**filters, **histogram}, 200
+
+
+def _validate_payroll_filters(data: Optional[Dict]) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Validate the optional JSON filters of a payroll run.
+    
+    Returns:
+        Tuple of (filters, error message)
+    """
+    filters = data or {}
+    if not isinstance(filters, dict):
+        return None, 'Filters must be a JSON object'
+    
+    unknown = set(filters) - {'country', 'job_title', 'min_salary', 'max_salary'}
+    if unknown:
+        return None, f"Unknown filters: {', '.join(sorted(unknown))}"
+    for name in ('country', 'job_title'):
+        if name in filters and not isinstance(filters[name], str):
+            return None, f'{name} must be a string'
+    for bound in ('min_salary', 'max_salary'):
+        value = filters.get(bound)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                  or not math.isfinite(value)):
+            return None, f'{bound} must be a number'
+    return filters, None
+
+
+def run_payroll_controller(data: Optional[Dict]) -> Tuple[Union[Iterator[bytes], Dict], int]:
+    """
+    Controller for running payroll over the whole workforce.
+    
+    Args:
+        data: Optional request JSON with country, job_title, min_salary and
+            max_salary filters
+        
+    Returns:
+        Tuple of (NDJSON line generator or error dict, status_code)
+    """
+    filters, error = _validate_payroll_filters(data)
+    if error:
+        return {'error': error}, 400
+    
+    provider = current_app.json
+    
+    def lines() -> Iterator[bytes]:
+        for record in run_payroll_service(**filters):
+            yield provider.dumps_lines(record['employees'] if 'employees' in record else [record])
+    
+    return lines(), 200
+
+
+def create_payroll_job_controller(data: Optional[Dict]) -> Tuple[Dict, int]:
+    """
+    Controller for enqueueing a background payroll run.
+    
+    Args:
+        data: Optional request JSON with country, job_title, min_salary and
+            max_salary filters
+        
+    Returns:
+        Tuple of (job status dict or error dict, status_code)
+    """
+    filters, error = _validate_payroll_filters(data)
+    if error:
+        return {'error': error}, 400
+    
+    job_id = create_payroll_job_service(filters)
+    return get_payroll_job_service(job_id), 202
+
+
+def get_payroll_job_controller(job_id: int) -> Tuple[Dict, int]:
+    """
+    Controller for the status and progress of a payroll job.
+    
+    Args:
+        job_id: Payroll job ID
+        
+    Returns:
+        Tuple of (job status dict or error dict, status_code)
+    """
+    job = get_payroll_job_service(job_id)
+    if not job:
+        return {'error': 'Payroll job not found'}, 404
+    return job, 200
+
+
+def resume_payroll_job_controller(job_id: int) -> Tuple[Dict, int]:
+    """
+    Controller for restarting an interrupted or failed payroll job.
+    
+    Partitions that already completed are skipped.
+    
+    Args:
+        job_id: Payroll job ID
+        
+    Returns:
+        Tuple of (job status dict or error dict, status_code)
+    """
+    job = get_payroll_job_service(job_id)
+    if not job:
+        return {'error': 'Payroll job not found'}, 404
+    if job['status'] == 'completed':
+        return {'error': 'Payroll job already completed'}, 409
+    if job['active']:
+        return {'error': 'Payroll job is still running'}, 409
+    
+    start_payroll_job_service(job_id)
+    return get_payroll_job_service(job_id), 202
+
+
+def get_payslips_controller(job_id: int, limit: Optional[str] = None,
+                            after: Optional[str] = None) -> Tuple[Dict, int]:
+    """
+    Controller for listing the payslips of a payroll job.
+    
+    Args:
+        job_id: Payroll job ID
+        limit: Optional page size
+        after: Optional keyset cursor (last employee ID of the previous page)
+        
+    Returns:
+        Tuple of (page dict with payslips and next_after, or error dict, status_code)
+    """
+    try:
+        page_limit = int(limit) if limit is not None else DEFAULT_PAYSLIP_LIMIT
+        cursor = int(after) if after is not None else None
+    except ValueError:
+        return {'error': 'limit and after must be integers'}, 400
+    if not 1 <= page_limit <= MAX_PAYSLIP_LIMIT:
+        return {'error': f'limit must be between 1 and {MAX_PAYSLIP_LIMIT}'}, 400
+    if cursor is not None and abs(cursor) > MAX_ROW_ID:
+        return {'error': 'after is out of range'}, 400
+    if not get_payroll_job_service(job_id):
+        return {'error': 'Payroll job not found'}, 404
+    
+    payslips = get_payslips_service(job_id, page_limit, cursor)
+    next_after = payslips[-1]['employee_id'] if len(payslips) == page_limit else None
+    return {'payslips': payslips, 'next_after': next_after}, 200
+
+
+def data_etag_controller(**_) -> Optional[str]:
+    """
+    Controller for the ETag of responses built from the whole employee table.
+    
+    Returns:
+        ETag string, or None if the data version is unknown
+    """
+    return get_data_etag_service()
+
+
+def employee_etag_controller(employee_id: int, **_) -> Optional[str]:
+    """
+    Controller for the ETag of responses built from a single employee.
+    
+    Args:
+        employee_id: Employee ID
+        
+    Returns:
+        ETag string, or None if the employee's version is unknown
+    """
+    return get_employee_etag_service(employee_id)
+
+
+def get_employee_cache_stats_controller() -> Tuple[Dict, int]:
+    """
+    Controller for getting the single-employee cache counters.
+    
+    Returns:
+        Tuple of (response_dict, status_code)
+    """
+    return get_employee_cache_stats_service(), 200
+
+
+def get_metrics_controller() -> Tuple[str, int]:
+    """
+    Controller for the request metrics in Prometheus text format.
+    
+    Returns:
+        Tuple of (exposition_text, status_code)
+    """
+    return get_request_metrics_service(), 200
+
+
+# Async controllers, used by the async views in ASYNC_MODE
+async def create_employee_controller_async(data: Dict) -> Tuple[Dict, int]:
+    """Async version of create_employee_controller"""
+    error = validate_employee_data(data)
+    if error:
+        return {'error': error}, 400
+    
+    employee = await create_employee_service_async(
+        full_name=data['full_name'],
+        job_title=data['job_title'],
+        country=data['country'],
+        salary=float(data['salary'])
+    )
+    return employee.to_dict(), 201
+
+
+async def get_employee_controller_async(employee_id: int) -> Tuple[Dict, int]:
+    """Async version of get_employee_controller"""
+    employee = await get_employee_dict_service_async(employee_id)
+    if not employee:
+        return {'error': 'Employee not found'}, 404
+    
+    return employee, 200
+
+
+async def get_all_employees_controller_async(limit: Optional[str] = None, after: Optional[str] = None,
+                                             fields: Optional[str] = None, country: Optional[str] = None,
+                                             job_title: Optional[str] = None, min_salary: Optional[str] = None,
+                                             max_salary: Optional[str] = None,
+                                             ids: Optional[str] = None) -> Tuple[Union[List[Dict], Dict], int]:
+    """Async version of get_all_employees_controller"""
+    query, error = _parse_employee_list_args(limit, after, fields, country, job_title, min_salary, max_salary)
+    if error:
+        return {'error': error}, 400
+    
+    if ids is not None:
+        employee_ids, error = _parse_ids_arg(ids, query)
+        if error:
+            return {'error': error}, 400
+        employees, missing = await get_employees_by_ids_service_async(employee_ids, query['fields'])
+        return {'employees': employees, 'missing': missing}, 200
+    
+    employees = await get_employees_page_service_async(**query)
+    return _employee_list_response(employees, query['limit']), 200
+
+
+async def update_employee_controller_async(employee_id: int, data: Dict) -> Tuple[Dict, int]:
+    """Async version of update_employee_controller"""
+    error = _validate_update_data(data)
+    if error:
+        return {'error': error}, 400
+    
+    employee = await update_employee_service_async(employee_id, data)
+    if not employee:
+        return {'error': 'Employee not found'}, 404
+    
+    return employee.to_dict(), 200
+
+
+async def delete_employee_controller_async(employee_id: int) -> Tuple[str, int]:
+    """Async version of delete_employee_controller"""
+    success = await delete_employee_service_async(employee_id)
+    if not success:
+        return {'error': 'Employee not found'}, 404
+    
+    return '', 204
+
+
+async def calculate_salary_controller_async(employee_id: int) -> Tuple[Dict, int]:
+    """Async version of calculate_salary_controller"""
+    salary_data = await calculate_employee_salary_service_async(employee_id)
+    if not salary_data:
+        return {'error': 'Employee not found'}, 404
+    
+    return salary_data, 200
+
+
+async def data_etag_controller_async(**_) -> Optional[str]:
+    """Async version of data_etag_controller"""
+    return await get_data_etag_service_async()
+
+
+async def employee_etag_controller_async(employee_id: int, **_) -> Optional[str]:
+    """Async version of employee_etag_controller"""
+    return await get_employee_etag_service_async(employee_id)
@@ -0,0 +1,74 @@
+"""Database engine setup - engine options and SQLite connection pragmas"""
+
+from typing import Any, Dict, Mapping
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+
+def engine_options(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Build SQLAlchemy engine options from the application config.
+    
+    Server databases get the DB_POOL_* settings. SQLite keeps SQLAlchemy's
+    default pool and is tuned through connection pragmas instead. Options set
+    explicitly in SQLALCHEMY_ENGINE_OPTIONS take precedence.
+    
+    Args:
+        config: Application config
+    
+    Returns:
+        Keyword arguments for create_engine
+    """
+    options: Dict[str, Any] = {}
+    if make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name() != 'sqlite':
+        options.update(
+            pool_size=config['DB_POOL_SIZE'],
+            max_overflow=config['DB_MAX_OVERFLOW'],
+            pool_timeout=config['DB_POOL_TIMEOUT'],
+            pool_recycle=config['DB_POOL_RECYCLE'],
+            pool_pre_ping=config['DB_POOL_PRE_PING']
+        )
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+def sqlite_pragmas(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    SQLite pragmas to run on every new connection, skipping unset ones.
+    
+    Args:
+        config: Application config
+    
+    Returns:
+        Pragma name -> value, in execution order
+    """
+    pragmas = {
+        'busy_timeout': config.get('SQLITE_BUSY_TIMEOUT'),
+        'journal_mode': config.get('SQLITE_JOURNAL_MODE'),
+        'synchronous': config.get('SQLITE_SYNCHRONOUS'),
+        'mmap_size': config.get('SQLITE_MMAP_SIZE'),
+        'cache_size': config.get('SQLITE_CACHE_SIZE'),
+    }
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def configure_engine(engine: Engine, config: Mapping[str, Any]):
+    """
+    Install the SQLite pragmas of the config on an engine (no-op for other backends).
+    
+    Args:
+        engine: Sync engine
+        config: Application config
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(config)
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
@@ -0,0 +1,183 @@
+"""Request instrumentation - latency and SQL histograms exported in Prometheus text format"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+from flask import Flask, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from constants import LATENCY_BUCKETS, SQL_QUERY_BUCKETS
+
+
+class Histogram:
+    """Prometheus-style histogram with fixed bucket bounds, one series per label set"""
+    
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+    
+    def observe(self, labels: Tuple[str, ...], value: float):
+        """Record one observation (callers hold the store lock)"""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+    
+    def render(self) -> List[str]:
+        """Exposition lines with cumulative bucket counts"""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{self.name}_bucket{{{base}{"," if base else ""}le="{le}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{base}}} {total!r}')
+            lines.append(f'{self.name}_count{{{base}}} {count}')
+        return lines
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    escaped = (
+        str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        for value in values
+    )
+    return ','.join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+class RequestMetrics:
+    """
+    Per-endpoint request latency, SQL statement count and SQL time.
+    
+    Observations are aggregated into histograms as requests finish, so memory
+    stays bounded by the number of endpoints, not the number of requests.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'Request latency in seconds.',
+            ('method', 'endpoint', 'status'), LATENCY_BUCKETS
+        )
+        self.sql_queries = Histogram(
+            'http_request_sql_queries', 'SQL statements executed per request.',
+            ('endpoint',), SQL_QUERY_BUCKETS
+        )
+        self.sql_time = Histogram(
+            'http_request_sql_duration_seconds', 'Time spent executing SQL per request, in seconds.',
+            ('endpoint',), LATENCY_BUCKETS
+        )
+    
+    def observe(self, method: str, endpoint: str, status: int, duration: float, queries: int, sql_duration: float):
+        """Record one finished request"""
+        with self._lock:
+            self.latency.observe((method, endpoint, str(status)), duration)
+            self.sql_queries.observe((endpoint,), queries)
+            self.sql_time.observe((endpoint,), sql_duration)
+    
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        with self._lock:
+            lines = self.latency.render() + self.sql_queries.render() + self.sql_time.render()
+        return '\n'.join(lines) + '\n'
+
+
+class _RequestTrace:
+    """SQL executed during the current request"""
+    __slots__ = ('started', 'queries', 'sql_duration', 'statements', 'status')
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_duration = 0.0
+        self.statements: List[Tuple[str, float]] = []
+        self.status = 500
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info['query_started'].pop()
+    if not has_request_context():
+        return
+    trace = g.get('_request_trace')
+    if trace is None:
+        return
+    trace.queries += 1
+    trace.sql_duration += duration
+    if len(trace.statements) < current_app.config['SLOW_REQUEST_MAX_STATEMENTS']:
+        trace.statements.append((statement, duration))
+
+
+def instrument_engine(engine: Engine):
+    """
+    Count and time the SQL statements an engine executes during requests.
+    
+    Args:
+        engine: Sync engine
+    """
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _start_trace():
+    g._request_trace = _RequestTrace()
+
+
+def _capture_status(response):
+    trace = g.get('_request_trace')
+    if trace is not None:
+        trace.status = response.status_code
+    return response
+
+
+def _finish_trace(exc):
+    """Record the request; runs after streamed responses have been sent"""
+    trace = g.pop('_request_trace', None)
+    if trace is None:
+        return
+    duration = time.perf_counter() - trace.started
+    endpoint = request.endpoint or 'unmatched'
+    get_request_metrics().observe(request.method, endpoint, trace.status, duration,
+                                  trace.queries, trace.sql_duration)
+    
+    threshold = current_app.config['SLOW_REQUEST_THRESHOLD_MS']
+    if threshold and duration * 1000 >= threshold:
+        statements = ''.join(
+            f'\n  [{sql_duration * 1000:.1f} ms] {statement}' for statement, sql_duration in trace.statements
+        )
+        current_app.logger.warning(
+            'Slow request %s %s -> %s took %.1f ms (%d SQL statements, %.1f ms in SQL)%s',
+            request.method, request.full_path.rstrip('?'), trace.status, duration * 1000,
+            trace.queries, trace.sql_duration * 1000, statements
+        )
+
+
+def init_instrumentation(app: Flask, engine: Engine):
+    """
+    Enable request metrics and the slow-request log for an application.
+    
+    Args:
+        app: Flask application instance
+        engine: The application's database engine
+    """
+    app.extensions['request_metrics'] = RequestMetrics()
+    instrument_engine(engine)
+    app.before_request(_start_trace)
+    app.after_request(_capture_status)
+    app.teardown_request(_finish_trace)
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Get the request metrics of the current application"""
+    return current_app.extensions['request_metrics']
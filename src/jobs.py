@@ -0,0 +1,60 @@
+"""Background job runner - a thread pool whose calls run inside an application context"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable
+from flask import Flask, current_app
+
+
+class JobRunner:
+    """
+    Runs background work for the application on a pool of threads.
+    
+    Work is submitted under a key (e.g. a job ID) so callers can tell whether
+    a key still has work queued or running in this process. Exceptions are
+    logged; the work itself is expected to record failures where they matter.
+    With 0 workers, submitted work runs inline in the caller.
+    """
+    
+    def __init__(self, app: Flask, workers: int):
+        self.app = app
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix='jobs') if workers > 0 else None
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, int] = {}
+    
+    def submit(self, key: Hashable, function: Callable, *args):
+        """Run function(*args) in the background under the given key"""
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + 1
+        if self._executor is None:
+            self._run(key, function, args)
+        else:
+            self._executor.submit(self._run, key, function, args)
+    
+    def is_active(self, key: Hashable) -> bool:
+        """Whether work submitted under key is still queued or running"""
+        with self._lock:
+            return key in self._pending
+    
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work, optionally waiting for queued work to finish"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+    
+    def _run(self, key: Hashable, function: Callable, args: tuple):
+        try:
+            with self.app.app_context():
+                function(*args)
+        except Exception:
+            self.app.logger.exception('Background job %s failed', key)
+        finally:
+            with self._lock:
+                self._pending[key] -= 1
+                if not self._pending[key]:
+                    del self._pending[key]
+
+
+def get_job_runner() -> JobRunner:
+    """Get the background job runner of the current application"""
+    return current_app.extensions['job_runner']
@@ -1,9 +1,17 @@
+from sqlalchemy import DDL, column, event, table
 from app import db
 
 
 class Employee(db.Model):
     """Employee model"""
     __tablename__ = 'employees'
+    __table_args__ = (
+        # Serve country / job title filters and per-group salary aggregates
+        # (MIN, MAX, AVG, salary ranges) straight from the index
+        db.Index('ix_employees_country_salary', 'country', 'salary'),
+        db.Index('ix_employees_job_title_salary', 'job_title', 'salary'),
+        db.Index('ix_employees_salary', 'salary'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     full_name = db.Column(db.String(100), nullable=False)
@@ -21,3 +29,203 @@ class Employee(db.Model):
             'salary': self.salary
         }
 
+
+# Full-text index on employee names: an SQLite FTS5 table reading its content
+# from employees, kept in sync by triggers (so bulk inserts and raw SQL writes
+# are indexed too). Prefix indexes make "jo*" style queries index lookups.
+EMPLOYEE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5("
+    "full_name, content='employees', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+    "CREATE TRIGGER IF NOT EXISTS employees_fts_insert AFTER INSERT ON employees BEGIN "
+    "INSERT INTO employees_fts(rowid, full_name) VALUES (new.id, new.full_name); END",
+    "CREATE TRIGGER IF NOT EXISTS employees_fts_delete AFTER DELETE ON employees BEGIN "
+    "INSERT INTO employees_fts(employees_fts, rowid, full_name) VALUES ('delete', old.id, old.full_name); END",
+    "CREATE TRIGGER IF NOT EXISTS employees_fts_update AFTER UPDATE OF full_name ON employees BEGIN "
+    "INSERT INTO employees_fts(employees_fts, rowid, full_name) VALUES ('delete', old.id, old.full_name); "
+    "INSERT INTO employees_fts(rowid, full_name) VALUES (new.id, new.full_name); END",
+)
+
+for statement in EMPLOYEE_SEARCH_DDL:
+    event.listen(Employee.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(Employee.__table__, 'before_drop',
+             DDL('DROP TABLE IF EXISTS employees_fts').execute_if(dialect='sqlite'))
+
+# The FTS5 table for use in queries (rank is FTS5's bm25 relevance, lower is better)
+employees_fts = table('employees_fts', column('rowid'), column('rank'))
+
+
+class SalarySummary(db.Model):
+    """Count, sum, min and max salary of one country or job title, maintained by triggers"""
+    __tablename__ = 'salary_summary'
+    
+    dimension = db.Column(db.String(20), primary_key=True)  # Employee column name: country or job_title
+    group_key = db.Column(db.String(100), primary_key=True)
+    employee_count = db.Column(db.Integer, nullable=False)
+    salary_sum = db.Column(db.Float, nullable=False)
+    min_salary = db.Column(db.Float, nullable=False)
+    max_salary = db.Column(db.Float, nullable=False)
+
+
+def _summary_add(dimension: str, row: str) -> str:
+    """Trigger statement adding employee `row` (new/old) to its salary_summary group"""
+    return (
+        f"INSERT INTO salary_summary(dimension, group_key, employee_count, salary_sum, min_salary, max_salary) "
+        f"VALUES ('{dimension}', {row}.{dimension}, 1, {row}.salary, {row}.salary, {row}.salary) "
+        f"ON CONFLICT(dimension, group_key) DO UPDATE SET "
+        f"employee_count = employee_count + 1, salary_sum = salary_sum + excluded.salary_sum, "
+        f"min_salary = MIN(min_salary, excluded.min_salary), max_salary = MAX(max_salary, excluded.max_salary);"
+    )
+
+
+def _summary_remove(dimension: str) -> str:
+    """
+    Trigger statements removing employee `old` from its salary_summary group.
+    
+    Min and max are only recomputed when the removed salary was the extreme
+    value, each with one seek on the (dimension, salary) index.
+    """
+    group = f"dimension = '{dimension}' AND group_key = old.{dimension}"
+    return (
+        f"UPDATE salary_summary SET employee_count = employee_count - 1, salary_sum = salary_sum - old.salary "
+        f"WHERE {group}; "
+        f"DELETE FROM salary_summary WHERE {group} AND employee_count = 0; "
+        f"UPDATE salary_summary SET min_salary = "
+        f"(SELECT MIN(salary) FROM employees WHERE {dimension} = old.{dimension}) "
+        f"WHERE {group} AND min_salary = old.salary; "
+        f"UPDATE salary_summary SET max_salary = "
+        f"(SELECT MAX(salary) FROM employees WHERE {dimension} = old.{dimension}) "
+        f"WHERE {group} AND max_salary = old.salary;"
+    )
+
+
+# Triggers keeping salary_summary in step with every write to employees,
+# including bulk inserts, set-based updates and raw SQL. An update is a
+# remove from the old groups followed by an add to the new ones.
+SALARY_SUMMARY_DIMENSIONS = ('country', 'job_title')
+SALARY_SUMMARY_TRIGGER_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS salary_summary_insert AFTER INSERT ON employees BEGIN "
+    + ' '.join(_summary_add(dimension, 'new') for dimension in SALARY_SUMMARY_DIMENSIONS) + " END",
+    "CREATE TRIGGER IF NOT EXISTS salary_summary_delete AFTER DELETE ON employees BEGIN "
+    + ' '.join(_summary_remove(dimension) for dimension in SALARY_SUMMARY_DIMENSIONS) + " END",
+    "CREATE TRIGGER IF NOT EXISTS salary_summary_update AFTER UPDATE OF country, job_title, salary ON employees BEGIN "
+    + ' '.join(_summary_remove(dimension) for dimension in SALARY_SUMMARY_DIMENSIONS) + ' '
+    + ' '.join(_summary_add(dimension, 'new') for dimension in SALARY_SUMMARY_DIMENSIONS) + " END",
+)
+
+for statement in SALARY_SUMMARY_TRIGGER_DDL:
+    event.listen(SalarySummary.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for trigger in ('salary_summary_insert', 'salary_summary_delete', 'salary_summary_update'):
+    event.listen(SalarySummary.__table__, 'before_drop',
+                 DDL(f'DROP TRIGGER IF EXISTS {trigger}').execute_if(dialect='sqlite'))
+
+
+class EmployeeChange(db.Model):
+    """
+    One committed write to an employee, in commit order (append-only change log).
+    
+    seq is AUTOINCREMENT, so numbers are never reused after compaction and
+    serve as change feed cursors. Inserts and updates carry the full row
+    after the write; deletes carry only the employee ID.
+    """
+    __tablename__ = 'employee_changes'
+    __table_args__ = {'sqlite_autoincrement': True}
+    
+    seq = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, nullable=False, index=True)
+    op = db.Column(db.String(10), nullable=False)  # insert, update or delete
+    full_name = db.Column(db.String(100))
+    job_title = db.Column(db.String(100))
+    country = db.Column(db.String(100))
+    salary = db.Column(db.Float)
+    changed_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class ChangeLogState(db.Model):
+    """Single row recording the newest change removed by retention (older cursors are expired)"""
+    __tablename__ = 'change_log_state'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    purged_through = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Triggers writing employee_changes in the same transaction as every write to
+# employees, whichever path made it (ORM, bulk insert, set-based UPDATE, raw SQL).
+_CHANGE_COLUMNS = "employee_id, op, full_name, job_title, country, salary, changed_at"
+_CHANGED_AT = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+CHANGE_LOG_TRIGGER_DDL = (
+    f"CREATE TRIGGER IF NOT EXISTS employee_changes_insert AFTER INSERT ON employees BEGIN "
+    f"INSERT INTO employee_changes({_CHANGE_COLUMNS}) VALUES "
+    f"(new.id, 'insert', new.full_name, new.job_title, new.country, new.salary, {_CHANGED_AT}); END",
+    f"CREATE TRIGGER IF NOT EXISTS employee_changes_update AFTER UPDATE ON employees "
+    f"WHEN old.full_name IS NOT new.full_name OR old.job_title IS NOT new.job_title "
+    f"OR old.country IS NOT new.country OR old.salary IS NOT new.salary BEGIN "
+    f"INSERT INTO employee_changes({_CHANGE_COLUMNS}) VALUES "
+    f"(new.id, 'update', new.full_name, new.job_title, new.country, new.salary, {_CHANGED_AT}); END",
+    f"CREATE TRIGGER IF NOT EXISTS employee_changes_delete AFTER DELETE ON employees BEGIN "
+    f"INSERT INTO employee_changes({_CHANGE_COLUMNS}) VALUES "
+    f"(old.id, 'delete', NULL, NULL, NULL, NULL, {_CHANGED_AT}); END",
+)
+
+for statement in CHANGE_LOG_TRIGGER_DDL:
+    # DDL applies %-formatting, so the strftime format is escaped
+    event.listen(EmployeeChange.__table__, 'after_create',
+                 DDL(statement.replace('%', '%%')).execute_if(dialect='sqlite'))
+for trigger in ('employee_changes_insert', 'employee_changes_update', 'employee_changes_delete'):
+    event.listen(EmployeeChange.__table__, 'before_drop',
+                 DDL(f'DROP TRIGGER IF EXISTS {trigger}').execute_if(dialect='sqlite'))
+
+
+class ImportCheckpoint(db.Model):
+    """Progress of a CSV employee import, committed with each chunk"""
+    __tablename__ = 'import_checkpoints'
+    
+    fingerprint = db.Column(db.String(64), primary_key=True)
+    source = db.Column(db.String(255), nullable=False)
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    employees_created = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Boolean, nullable=False, default=False)
+
+
+class PayrollJob(db.Model):
+    """A background payroll run, split into employee ID range partitions"""
+    __tablename__ = 'payroll_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed or failed
+    filters = db.Column(db.JSON, nullable=False, default=dict)
+    partition_size = db.Column(db.Integer, nullable=False)
+    partition_count = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
+    started_at = db.Column(db.DateTime)  # Start of the latest (re)start
+    finished_at = db.Column(db.DateTime)
+    error = db.Column(db.Text)
+
+
+class PayrollPartition(db.Model):
+    """
+    One employee ID range [start_id, end_id) of a payroll job.
+    
+    completed_at is set in the same transaction that writes the range's
+    payslips, so a restarted job skips exactly the partitions that finished.
+    """
+    __tablename__ = 'payroll_partitions'
+    
+    job_id = db.Column(db.Integer, db.ForeignKey('payroll_jobs.id', ondelete='CASCADE'), primary_key=True)
+    number = db.Column(db.Integer, primary_key=True)
+    start_id = db.Column(db.Integer, nullable=False)
+    end_id = db.Column(db.Integer, nullable=False)
+    payslip_count = db.Column(db.Integer, nullable=False, default=0)
+    completed_at = db.Column(db.DateTime)
+
+
+class Payslip(db.Model):
+    """Gross, TDS and net salary of one employee in one payroll job"""
+    __tablename__ = 'payslips'
+    
+    job_id = db.Column(db.Integer, db.ForeignKey('payroll_jobs.id', ondelete='CASCADE'), primary_key=True)
+    employee_id = db.Column(db.Integer, primary_key=True)
+    country = db.Column(db.String(100), nullable=False)
+    gross_salary = db.Column(db.Float, nullable=False)
+    tds = db.Column(db.Float, nullable=False)
+    net_salary = db.Column(db.Float, nullable=False)
@@ -0,0 +1,83 @@
+"""Batch payroll engine - vectorized gross/TDS/net computation for many employees"""
+
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from tax import TaxRules
+
+
+def compute_payroll(salaries: np.ndarray, countries: Sequence[str],
+                    rules: TaxRules) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute TDS and net salary for a whole batch in one vectorized pass.
+    
+    The arithmetic matches calculate_net_salary: tds comes from the same
+    slab tables (one searchsorted per country) and net = gross - tds, both
+    before rounding.
+    
+    Args:
+        salaries: Gross salary per employee
+        countries: Country name per employee
+        rules: Tax rules to apply
+    
+    Returns:
+        Tuple of (unrounded tds array, unrounded net salary array)
+    """
+    tds = rules.tax_array(salaries, countries)
+    return tds, salaries - tds
+
+
+class PayrollTotals:
+    """Running per-country totals of gross, TDS and net salary across batches"""
+    
+    def __init__(self):
+        self.employee_count = 0
+        self._totals: Dict[str, np.ndarray] = {}
+    
+    def add(self, salaries: np.ndarray, tds: np.ndarray, net: np.ndarray, countries: Sequence[str]):
+        """Add one computed batch to the totals"""
+        names, codes = np.unique(np.asarray(countries, dtype=object), return_inverse=True)
+        codes = codes.reshape(-1)
+        sums = np.stack([
+            np.bincount(codes, weights=column, minlength=len(names))
+            for column in (salaries, tds, net)
+        ], axis=1)
+        counts = np.bincount(codes, minlength=len(names))
+        for name, row, count in zip(names, sums, counts):
+            total = self._totals.setdefault(name, np.zeros(4))
+            total[:3] += row
+            total[3] += count
+        self.employee_count += len(salaries)
+    
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Totals per country, rounded like calculate_net_salary"""
+        return {
+            name: {
+                'employee_count': int(total[3]),
+                'gross_salary': round(float(total[0]), 2),
+                'tds': round(float(total[1]), 2),
+                'net_salary': round(float(total[2]), 2)
+            }
+            for name, total in sorted(self._totals.items())
+        }
+
+
+def payroll_rows(ids: np.ndarray, salaries: np.ndarray, tds: np.ndarray, net: np.ndarray,
+                 countries: Sequence[str]) -> List[Dict]:
+    """
+    Format a computed batch as calculate_net_salary-style dictionaries.
+    
+    Rounding uses the built-in round() per value, so results are identical
+    to calculate_net_salary (numpy's round can differ on halfway cases).
+    """
+    return [
+        {
+            'id': employee_id,
+            'country': country,
+            'gross_salary': gross,
+            'tds': round(tax, 2),
+            'net_salary': round(net_salary, 2)
+        }
+        for employee_id, country, gross, tax, net_salary in zip(
+            ids.tolist(), countries, salaries.tolist(), tds.tolist(), net.tolist()
+        )
+    ]
@@ -1,8 +1,23 @@
 """Routes package - registers all blueprints"""
 
 from flask import Flask
+from werkzeug.routing import IntegerConverter
+from constants import MAX_ROW_ID
 from .employee_routes import employee_bp
 from .salary_routes import salary_bp
+from .payroll_routes import payroll_bp
+from .metrics_routes import metrics_bp
+from .async_routes import ASYNC_VIEWS
+
+
+class RowIdConverter(IntegerConverter):
+    """<id:...> URL segment: an integer within MAX_ROW_ID, so larger IDs are a 404 instead of an overflow"""
+    
+    regex = r'\d{1,%d}' % len(str(MAX_ROW_ID))
+    
+    def __init__(self, map, **kwargs):
+        kwargs.setdefault('max', MAX_ROW_ID)
+        super().__init__(map, **kwargs)
 
 
 def register_routes(app: Flask):
@@ -12,6 +27,14 @@ def register_routes(app: Flask):
     Args:
         app: Flask application instance
     """
+    app.url_map.converters['id'] = RowIdConverter
     app.register_blueprint(employee_bp, url_prefix='/api')
     app.register_blueprint(salary_bp, url_prefix='/api')
+    app.register_blueprint(payroll_bp, url_prefix='/api')
+    if app.config.get('METRICS_ENABLED'):
+        app.register_blueprint(metrics_bp)
+    
+    # Serve the hot employee endpoints with async views on the async engine
+    if app.config.get('ASYNC_MODE'):
+        app.view_functions.update(ASYNC_VIEWS)
 
@@ -0,0 +1,77 @@
+"""Async routes - async versions of the hot employee views, swapped in for ASYNC_MODE"""
+
+from flask import request, jsonify
+from controllers import (
+    create_employee_controller_async,
+    get_employee_controller_async,
+    get_all_employees_controller_async,
+    update_employee_controller_async,
+    delete_employee_controller_async,
+    calculate_salary_controller_async,
+    data_etag_controller_async,
+    employee_etag_controller_async
+)
+from .conditional import conditional
+
+
+async def create_employee():
+    """Create a new employee"""
+    data = request.get_json()
+    response, status_code = await create_employee_controller_async(data)
+    return jsonify(response), status_code
+
+
+@conditional(employee_etag_controller_async)
+async def get_employee(employee_id):
+    """Get an employee by ID"""
+    response, status_code = await get_employee_controller_async(employee_id)
+    return jsonify(response), status_code
+
+
+@conditional(data_etag_controller_async)
+async def get_all_employees():
+    """Get all employees (same query parameters as the sync view)"""
+    response, status_code = await get_all_employees_controller_async(
+        limit=request.args.get('limit'),
+        after=request.args.get('after'),
+        fields=request.args.get('fields'),
+        country=request.args.get('country'),
+        job_title=request.args.get('job_title'),
+        min_salary=request.args.get('min_salary'),
+        max_salary=request.args.get('max_salary'),
+        ids=request.args.get('ids')
+    )
+    return jsonify(response), status_code
+
+
+async def update_employee(employee_id):
+    """Update an employee"""
+    data = request.get_json()
+    response, status_code = await update_employee_controller_async(employee_id, data)
+    return jsonify(response), status_code
+
+
+async def delete_employee(employee_id):
+    """Delete an employee"""
+    response, status_code = await delete_employee_controller_async(employee_id)
+    if status_code == 204:
+        return '', status_code
+    return jsonify(response), status_code
+
+
+@conditional(employee_etag_controller_async)
+async def calculate_salary(employee_id):
+    """Calculate deductions and net salary for an employee"""
+    response, status_code = await calculate_salary_controller_async(employee_id)
+    return jsonify(response), status_code
+
+
+# Endpoint name -> async view that replaces the sync view in ASYNC_MODE
+ASYNC_VIEWS = {
+    'employees.create_employee': create_employee,
+    'employees.get_employee': get_employee,
+    'employees.get_all_employees': get_all_employees,
+    'employees.update_employee': update_employee,
+    'employees.delete_employee': delete_employee,
+    'salary.calculate_salary': calculate_salary,
+}
@@ -0,0 +1,54 @@
+"""Conditional GET support - ETag / If-None-Match handling for route views"""
+
+import inspect
+from functools import wraps
+from typing import Callable, Optional
+from flask import Response, make_response, request
+
+
+def conditional(etag_for: Callable[..., Optional[str]]):
+    """
+    Answer If-None-Match with 304 Not Modified when the data has not changed.
+    
+    The ETag is computed before the view runs, so a matching request skips
+    the query and serialization entirely. Successful responses carry the ETag.
+    Works for both regular and async views; async views may take an async etag_for.
+    
+    Args:
+        etag_for: Function called with the view's URL arguments, returning the
+            ETag, or None when the data's version is unknown (the view then
+            always runs and the response has no ETag)
+    """
+    def not_modified(etag: str) -> Optional[Response]:
+        if not request.if_none_match.contains(etag):
+            return None
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    def tagged(result, etag: str) -> Response:
+        response = make_response(result)
+        if response.status_code == 200:
+            response.set_etag(etag)
+        return response
+    
+    def decorator(view):
+        if inspect.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(*args, **kwargs):
+                etag = etag_for(**kwargs)
+                if inspect.isawaitable(etag):
+                    etag = await etag
+                if etag is None:
+                    return await view(*args, **kwargs)
+                return not_modified(etag) or tagged(await view(*args, **kwargs), etag)
+            return async_wrapper
+        
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = etag_for(**kwargs)
+            if etag is None:
+                return view(*args, **kwargs)
+            return not_modified(etag) or tagged(view(*args, **kwargs), etag)
+        return wrapper
+    return decorator
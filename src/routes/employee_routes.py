@@ -1,13 +1,23 @@
 """Employee routes - handles employee CRUD operations"""
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from controllers import (
     create_employee_controller,
+    create_employees_bulk_controller,
     get_employee_controller,
     get_all_employees_controller,
+    export_employees_controller,
+    search_employees_controller,
+    get_employee_changes_controller,
     update_employee_controller,
-    delete_employee_controller
+    bulk_adjust_salaries_controller,
+    delete_employee_controller,
+    data_etag_controller,
+    employee_etag_controller,
+    get_employee_cache_stats_controller
 )
+from .conditional import conditional
+from constants import EXPORT_FORMATS
 
 employee_bp = Blueprint('employees', __name__)
 
@@ -20,7 +30,16 @@ def create_employee():
     return jsonify(response), status_code
 
 
-@employee_bp.route('/employees/<int:employee_id>', methods=['GET'])
+@employee_bp.route('/employees/bulk', methods=['POST'])
+def create_employees_bulk():
+    """Create many employees from a JSON array"""
+    data = request.get_json()
+    response, status_code = create_employees_bulk_controller(data)
+    return jsonify(response), status_code
+
+
+@employee_bp.route('/employees/<id:employee_id>', methods=['GET'])
+@conditional(employee_etag_controller)
 def get_employee(employee_id):
     """Get an employee by ID"""
     response, status_code = get_employee_controller(employee_id)
@@ -28,13 +47,88 @@ def get_employee(employee_id):
 
 
 @employee_bp.route('/employees', methods=['GET'])
+@conditional(data_etag_controller)
 def get_all_employees():
-    """Get all employees"""
-    response, status_code = get_all_employees_controller()
+    """
+    Get all employees.
+    
+    Query parameters:
+    - limit: Page size; enables keyset pagination
+    - after: ID of the last employee on the previous page
+    - fields: Comma-separated list of fields to return
+    - country, job_title: Exact-match filters
+    - min_salary, max_salary: Inclusive salary range filters
+    - ids: Comma-separated employee IDs to fetch in one batch (with optional
+      fields); returns the employees and the IDs that were not found
+    """
+    response, status_code = get_all_employees_controller(
+        limit=request.args.get('limit'),
+        after=request.args.get('after'),
+        fields=request.args.get('fields'),
+        country=request.args.get('country'),
+        job_title=request.args.get('job_title'),
+        min_salary=request.args.get('min_salary'),
+        max_salary=request.args.get('max_salary'),
+        ids=request.args.get('ids')
+    )
     return jsonify(response), status_code
 
 
-@employee_bp.route('/employees/<int:employee_id>', methods=['PUT'])
+@employee_bp.route('/employees/changes', methods=['GET'])
+def get_employee_changes():
+    """
+    Change feed for incremental sync: employee inserts, updates and deletes
+    after the ?since= cursor, oldest first, with the cursor for the next call.
+    """
+    response, status_code = get_employee_changes_controller(
+        since=request.args.get('since'),
+        limit=request.args.get('limit')
+    )
+    return jsonify(response), status_code
+
+
+@employee_bp.route('/employees/search', methods=['GET'])
+@conditional(data_etag_controller)
+def search_employees():
+    """
+    Search employees by name, best matches first.
+    
+    Query parameters:
+    - q: Search text; every word must match the start of a word in the name
+    - country, job_title: Exact-match filters
+    - limit: Maximum number of matches (default 20)
+    """
+    response, status_code = search_employees_controller(
+        request.args.get('q'),
+        country=request.args.get('country'),
+        job_title=request.args.get('job_title'),
+        limit=request.args.get('limit')
+    )
+    return jsonify(response), status_code
+
+
+@employee_bp.route('/employees/export', methods=['GET'])
+def export_employees():
+    """
+    Stream every employee as NDJSON or CSV.
+    
+    Query parameters:
+    - format: ndjson (default) or csv
+    - include: net_salary to add TDS and net salary to each row
+    """
+    export_format = request.args.get('format') or 'ndjson'
+    response, status_code = export_employees_controller(export_format, request.args.get('include'))
+    if status_code != 200:
+        return jsonify(response), status_code
+    
+    return Response(
+        stream_with_context(response),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename=employees.{export_format}'}
+    )
+
+
+@employee_bp.route('/employees/<id:employee_id>', methods=['PUT'])
 def update_employee(employee_id):
     """Update an employee"""
     data = request.get_json()
@@ -42,7 +136,20 @@ def update_employee(employee_id):
     return jsonify(response), status_code
 
 
-@employee_bp.route('/employees/<int:employee_id>', methods=['DELETE'])
+@employee_bp.route('/employees/bulk-adjust', methods=['POST'])
+def bulk_adjust_salaries():
+    """
+    Apply a percentage or fixed salary adjustment to a group of employees.
+    
+    JSON body: optional country, job_title, min_salary, max_salary filters;
+    exactly one of percent or amount; optional dry_run to only report the impact.
+    """
+    data = request.get_json(silent=True)
+    response, status_code = bulk_adjust_salaries_controller(data)
+    return jsonify(response), status_code
+
+
+@employee_bp.route('/employees/<id:employee_id>', methods=['DELETE'])
 def delete_employee(employee_id):
     """Delete an employee"""
     response, status_code = delete_employee_controller(employee_id)
@@ -50,3 +157,9 @@ def delete_employee(employee_id):
         return '', status_code
     return jsonify(response), status_code
 
+
+@employee_bp.route('/employees/cache-stats', methods=['GET'])
+def get_employee_cache_stats():
+    """Get hit/miss/eviction counters of the single-employee cache"""
+    response, status_code = get_employee_cache_stats_controller()
+    return jsonify(response), status_code
@@ -0,0 +1,13 @@
+"""Metrics routes - exposes request metrics for Prometheus"""
+
+from flask import Blueprint, Response
+from controllers import get_metrics_controller
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Request latency and SQL metrics in Prometheus text exposition format"""
+    response, status_code = get_metrics_controller()
+    return Response(response, status=status_code, mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,66 @@
+"""Payroll routes - handles batch payroll runs"""
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from controllers import (
+    run_payroll_controller,
+    create_payroll_job_controller,
+    get_payroll_job_controller,
+    resume_payroll_job_controller,
+    get_payslips_controller
+)
+
+payroll_bp = Blueprint('payroll', __name__)
+
+
+@payroll_bp.route('/payroll/run', methods=['POST'])
+def run_payroll():
+    """
+    Compute gross, TDS and net salary for every employee, streamed as NDJSON.
+    
+    Optional JSON body filters: country, job_title, min_salary, max_salary.
+    The last line holds totals per country.
+    """
+    data = request.get_json(silent=True)
+    response, status_code = run_payroll_controller(data)
+    if status_code != 200:
+        return jsonify(response), status_code
+    
+    return Response(stream_with_context(response), mimetype='application/x-ndjson')
+
+
+@payroll_bp.route('/payroll/jobs', methods=['POST'])
+def create_payroll_job():
+    """
+    Enqueue a background payroll run that stores a payslip per employee.
+    
+    Takes the same optional JSON filters as /payroll/run. Poll the returned
+    job for progress.
+    """
+    data = request.get_json(silent=True)
+    response, status_code = create_payroll_job_controller(data)
+    return jsonify(response), status_code
+
+
+@payroll_bp.route('/payroll/jobs/<id:job_id>', methods=['GET'])
+def get_payroll_job(job_id):
+    """Get the status, progress and throughput of a payroll job"""
+    response, status_code = get_payroll_job_controller(job_id)
+    return jsonify(response), status_code
+
+
+@payroll_bp.route('/payroll/jobs/<id:job_id>/resume', methods=['POST'])
+def resume_payroll_job(job_id):
+    """Restart an interrupted or failed payroll job, skipping completed partitions"""
+    response, status_code = resume_payroll_job_controller(job_id)
+    return jsonify(response), status_code
+
+
+@payroll_bp.route('/payroll/jobs/<id:job_id>/payslips', methods=['GET'])
+def get_payslips(job_id):
+    """List the payslips of a payroll job (limit / after keyset pagination)"""
+    response, status_code = get_payslips_controller(
+        job_id,
+        limit=request.args.get('limit'),
+        after=request.args.get('after')
+    )
+    return jsonify(response), status_code
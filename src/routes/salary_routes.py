@@ -3,30 +3,84 @@
 from flask import Blueprint, request, jsonify
 from controllers import (
     calculate_salary_controller,
-    get_salary_metrics_controller
+    calculate_salaries_controller,
+    get_salary_metrics_controller,
+    get_salary_metrics_summary_controller,
+    get_salary_histogram_controller,
+    data_etag_controller,
+    employee_etag_controller
 )
+from .conditional import conditional
 
 salary_bp = Blueprint('salary', __name__)
 
 
-@salary_bp.route('/employees/<int:employee_id>/calculate-salary', methods=['GET'])
+@salary_bp.route('/employees/<id:employee_id>/calculate-salary', methods=['GET'])
+@conditional(employee_etag_controller)
 def calculate_salary(employee_id):
     """Calculate deductions and net salary for an employee"""
     response, status_code = calculate_salary_controller(employee_id)
     return jsonify(response), status_code
 
 
+@salary_bp.route('/employees/calculate-salary', methods=['POST'])
+def calculate_salaries():
+    """Calculate deductions and net salary for a JSON list of employee ids"""
+    data = request.get_json(silent=True)
+    response, status_code = calculate_salaries_controller(data)
+    return jsonify(response), status_code
+
+
 @salary_bp.route('/salary-metrics', methods=['GET'])
+@conditional(data_etag_controller)
 def get_salary_metrics():
     """
     Get salary metrics by country or job title.
     
     Query parameters:
-    - country: Get min, max, and average salary for a country
-    - job_title: Get average salary for a job title
+    - country: Get min, max, average, median and percentile salaries for a country
+    - job_title: Get average, median and percentile salaries for a job title
+    - exact: true to compute exact percentiles instead of sketch estimates
+    
+    Repeat country (or job_title) to get metrics for the combined group.
+    """
+    countries = request.args.getlist('country')
+    job_titles = request.args.getlist('job_title')
+    response, status_code = get_salary_metrics_controller(countries, job_titles, request.args.get('exact'))
+    return jsonify(response), status_code
+
+
+
+@salary_bp.route('/salary-metrics/summary', methods=['GET'])
+@conditional(data_etag_controller)
+def get_salary_metrics_summary():
+    """
+    Get min, max, average and count for every country and job title.
+    
+    Query parameters:
+    - include_pairs: true to also return metrics per country and job title pair
     """
-    country = request.args.get('country')
-    job_title = request.args.get('job_title')
-    response, status_code = get_salary_metrics_controller(country, job_title)
+    response, status_code = get_salary_metrics_summary_controller(request.args.get('include_pairs'))
     return jsonify(response), status_code
 
+
+@salary_bp.route('/salary-metrics/histogram', methods=['GET'])
+@conditional(data_etag_controller)
+def get_salary_histogram():
+    """
+    Get a salary histogram.
+    
+    Query parameters:
+    - country, job_title: Optional filters
+    - edges: Comma-separated bucket edges, e.g. 0,50000,100000
+    - buckets: Number of buckets when edges are not given (default 10)
+    - scale: linear (default) or log spacing when edges are not given
+    """
+    response, status_code = get_salary_histogram_controller(
+        country=request.args.get('country'),
+        job_title=request.args.get('job_title'),
+        edges=request.args.get('edges'),
+        buckets=request.args.get('buckets'),
+        scale=request.args.get('scale')
+    )
+    return jsonify(response), status_code
@@ -0,0 +1,112 @@
+"""JSON serialization - Flask JSON provider with a pluggable fast encoder (orjson when installed)"""
+
+import json
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Encoders selectable with the JSON_ENCODER setting ('auto' picks the fastest installed)
+JSON_ENCODERS = ('orjson', 'json')
+
+
+def resolve_encoder(name: str) -> str:
+    """
+    Resolve a JSON_ENCODER setting to an installed encoder.
+    
+    Args:
+        name: 'auto', 'orjson' or 'json'
+    
+    Returns:
+        'orjson' or 'json'
+    """
+    if name == 'auto':
+        return 'orjson' if orjson is not None else 'json'
+    if name not in JSON_ENCODERS:
+        raise ValueError(f"JSON_ENCODER must be one of: auto, {', '.join(JSON_ENCODERS)}")
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_ENCODER is orjson but orjson is not installed')
+    return name
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Drop-in replacement for Flask's JSON provider that encodes with orjson.
+    
+    Output matches the default provider (sorted keys, compact outside debug
+    mode, Flask's fallbacks for dates and other types), except that non-ASCII
+    text is written as UTF-8 instead of \\u escapes. With the 'json' encoder it
+    behaves exactly like the default provider. Parsing is left to the stdlib.
+    """
+    
+    def __init__(self, app: Flask, encoder: str = 'auto'):
+        super().__init__(app)
+        self.encoder = resolve_encoder(encoder)
+    
+    def _orjson_options(self, sort_keys: bool, indent: bool) -> int:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps_bytes(self, obj: Any, indent: bool = False, sort_keys: bool = None) -> bytes:
+        """
+        Serialize data as compact (or 2-space indented) UTF-8 JSON.
+        
+        Args:
+            obj: The data to serialize
+            indent: Indent with two spaces instead of writing compact JSON
+            sort_keys: Sort object keys (defaults to the provider's sort_keys)
+        """
+        sort_keys = self.sort_keys if sort_keys is None else sort_keys
+        if self.encoder == 'orjson':
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options(sort_keys, indent))
+        separators = None if indent else (',', ':')
+        return super().dumps(obj, sort_keys=sort_keys, indent=2 if indent else None,
+                             separators=separators).encode('utf-8')
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if self.encoder == 'orjson' and not kwargs:
+            return self.dumps_bytes(obj).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indent=indent) + b'\n', mimetype=self.mimetype)
+    
+    def dumps_lines(self, rows: Iterable[Dict]) -> bytes:
+        """Serialize rows as NDJSON (one compact object per line, keys in row order)"""
+        if self.encoder == 'orjson':
+            options = self._orjson_options(sort_keys=False, indent=False) | orjson.OPT_APPEND_NEWLINE
+            return b''.join(orjson.dumps(row, default=self.default, option=options) for row in rows)
+        return ''.join(
+            json.dumps(row, default=self.default, separators=(',', ':')) + '\n' for row in rows
+        ).encode('utf-8')
+
+
+def ndjson_chunks(provider: FastJSONProvider, rows: Iterable[Dict], chunk_size: int) -> Iterator[bytes]:
+    """
+    Encode a stream of rows as NDJSON, chunk_size rows per yielded block.
+    
+    Args:
+        provider: The application's JSON provider (current_app.json)
+        rows: Rows to encode
+        chunk_size: Rows per yielded block
+    
+    Yields:
+        Encoded NDJSON blocks
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield provider.dumps_lines(chunk)
@@ -1,10 +1,178 @@
 """Service layer - handles business logic and database operations"""
 
-from typing import Dict, Optional, List
-from sqlalchemy import func
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, List, Iterator, Tuple
+import numpy as np
+from sqlalchemy import Select, case, delete, exists, func, insert, inspect, literal, literal_column, null, or_, select, text, update
+from sqlalchemy.orm import aliased
 from app import db
-from models import Employee
-from constants import TDS_RATES, Country
+from models import (
+    CHANGE_LOG_TRIGGER_DDL,
+    EMPLOYEE_SEARCH_DDL,
+    SALARY_SUMMARY_DIMENSIONS,
+    SALARY_SUMMARY_TRIGGER_DDL,
+    ChangeLogState,
+    Employee,
+    EmployeeChange,
+    ImportCheckpoint,
+    PayrollJob,
+    PayrollPartition,
+    Payslip,
+    SalarySummary,
+    employees_fts
+)
+from aggregates import DIMENSIONS, SalaryAggregateStore, get_aggregate_store
+from payroll import PayrollTotals, compute_payroll, payroll_rows
+from tax import get_tax_rules
+from versions import get_version_tracker
+from cache import get_employee_cache
+from instrumentation import get_request_metrics
+from jobs import get_job_runner
+from analytics import Columns, ColumnarSnapshot, filter_mask, get_analytics_snapshot, group_aggregates, iter_row_batches
+from constants import (
+    Country,
+    BULK_INSERT_CHUNK_SIZE,
+    EMPLOYEE_FIELDS,
+    EXPORT_CHUNK_SIZE,
+    ID_LOOKUP_CHUNK_SIZE,
+    DEFAULT_SEARCH_LIMIT,
+    DEFAULT_CHANGES_LIMIT,
+    SALARY_PERCENTILES,
+    DEFAULT_HISTOGRAM_BUCKETS,
+    PAYROLL_CHUNK_SIZE,
+    PAYROLL_JOB_PARTITION_SIZE,
+    PAYSLIP_INSERT_BATCH_SIZE,
+    DEFAULT_PAYSLIP_LIMIT
+)
+
+
+def record_employee_changes(changes: List[Tuple[int, Optional[Tuple[str, str, float]],
+                                              Optional[Tuple[str, str, float]]]]):
+    """
+    Apply committed employee writes to the in-process salary aggregates (and
+    the analytics snapshot when there is no change log to replay) and bump
+    the data version used for ETags.
+    
+    Args:
+        changes: (employee_id, old, new) per written employee, where old and new
+            are (country, job_title, salary); old is None for inserts and new
+            is None for deletes
+    """
+    store = get_aggregate_store()
+    for _, old, new in changes:
+        if old is not None:
+            store.remove(*old)
+        if new is not None:
+            store.add(*new)
+    snapshot = get_analytics_snapshot()
+    if snapshot is not None and snapshot.loaded and not change_log_maintained_service():
+        # Without a change log there is nothing to catch up from later
+        snapshot.apply((None, employee_id, new) for employee_id, _, new in changes)
+    if not change_log_maintained_service():
+        # With a change log, versions move when _sync_data_versions reads it
+        get_version_tracker().bump(employee_id for employee_id, _, _ in changes)
+    cache = get_employee_cache()
+    for employee_id, _, _ in changes:
+        cache.invalidate(employee_id)
+
+
+def _sync_data_versions() -> bool:
+    """
+    Catch the data versions up with the employee change log.
+    
+    One statement reads the changes after the tracker's version, plus a
+    marker row when retention purged changes it has not seen. It runs at
+    most once per EMPLOYEE_CACHE_SYNC_INTERVAL, so most cache hits make no
+    query at all.
+    
+    Returns:
+        True if the versions are current with the database, False when there
+        is no change log (they then only count this process's writes)
+    """
+    if not change_log_maintained_service():
+        return False
+    tracker = get_version_tracker()
+    if not tracker.sync_due():
+        return True
+    if not tracker.synced:
+        tracker.start(get_latest_change_cursor_service())
+        return True
+    cursor = tracker.version
+    tracker.advance(cursor, db.session.execute(build_changes_after_query(cursor)).all())
+    return True
+
+
+def build_changes_after_query(cursor: int) -> Select:
+    """
+    Build the query used by _sync_data_versions to read the changes after a cursor.
+    
+    Returns:
+        SELECT of (seq, employee_id) rows, with employee_id NULL on a row
+        marking changes purged after the cursor
+    """
+    purged = select(ChangeLogState.purged_through, null()).where(ChangeLogState.purged_through > cursor)
+    changed = select(EmployeeChange.seq, EmployeeChange.employee_id).where(EmployeeChange.seq > cursor)
+    return purged.union_all(changed)
+
+
+def get_data_etag_service() -> Optional[str]:
+    """
+    Get the ETag of data that depends on the whole employee table.
+    
+    The tag is the newest change log sequence number (or the purge point),
+    so every process serving the same database issues the same tag.
+    
+    Returns:
+        ETag string, changed by every employee write in any process, or None
+        when the data version cannot be proven current (no change log)
+    """
+    if not change_log_maintained_service():
+        return None
+    return str(get_latest_change_cursor_service())
+
+
+def get_employee_etag_service(employee_id: int) -> Optional[str]:
+    """
+    Get the ETag of data that depends on one employee.
+    
+    Args:
+        employee_id: Employee ID
+        
+    Returns:
+        ETag string, changed by every write to this employee in any process,
+        or None when the version cannot be proven current (no change log)
+    """
+    if not change_log_maintained_service():
+        return None
+    seq = get_employee_change_seq_service(employee_id)
+    # The cached employee served with this tag must be at least as new
+    get_version_tracker().observe(employee_id, seq)
+    return f'{employee_id}-{seq}'
+
+
+def get_employee_change_seq_service(employee_id: int) -> int:
+    """
+    Get the sequence number of the last logged change to one employee.
+    
+    Employees whose changes were all purged by retention (or that predate
+    the change log) fall back to the purge point, which is shared by every
+    process and only moves forward.
+    
+    Args:
+        employee_id: Employee ID
+        
+    Returns:
+        Change log sequence number (0 if there has been none)
+    """
+    return db.session.execute(build_employee_change_seq_query(employee_id)).scalar()
+
+
+def build_employee_change_seq_query(employee_id: int) -> Select:
+    """Build the query used by get_employee_change_seq_service"""
+    purged = select(ChangeLogState.purged_through).where(ChangeLogState.id == 1).scalar_subquery()
+    return select(func.coalesce(func.max(EmployeeChange.seq), purged, 0)).where(EmployeeChange.employee_id == employee_id)
 
 
 # Database operations (CRUD)
@@ -29,30 +197,726 @@ def create_employee_service(full_name: str, job_title: str, country: str, salary
     )
     db.session.add(employee)
     db.session.commit()
+    record_employee_changes([(employee.id, None, (country, job_title, salary))])
     return employee
 
 
-def get_employee_service(employee_id: int) -> Optional[Employee]:
+def create_employees_bulk_service(rows: List[Dict], chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> List[int]:
+    """
+    Create many employees using one batched INSERT and one commit per chunk.
+    
+    Args:
+        rows: Validated employee dictionaries (full_name, job_title, country, salary)
+        chunk_size: Number of rows inserted per transaction
+        
+    Returns:
+        List of new employee IDs, in the same order as rows
+    """
+    ids = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        chunk_ids = _insert_employees(chunk)
+        db.session.commit()
+        record_employee_changes([
+            (employee_id, None, (row['country'], row['job_title'], row['salary']))
+            for employee_id, row in zip(chunk_ids, chunk)
+        ])
+        ids.extend(chunk_ids)
+    return ids
+
+
+def _insert_employees(rows: List[Dict]) -> List[int]:
+    """Insert rows with one batched INSERT in the current transaction and return their IDs"""
+    result = db.session.execute(
+        insert(Employee).returning(Employee.id, sort_by_parameter_order=True),
+        rows
+    )
+    return list(result.scalars().all())
+
+
+def get_import_checkpoint_service(fingerprint: str) -> Optional[ImportCheckpoint]:
+    """
+    Get the progress of a previous import of the same file.
+    
+    Args:
+        fingerprint: Content hash of the import file
+        
+    Returns:
+        ImportCheckpoint object or None if the file was never imported
+    """
+    return db.session.get(ImportCheckpoint, fingerprint)
+
+
+def import_employees_chunk_service(fingerprint: str, source: str, rows: List[Dict],
+                                   rows_processed: int) -> List[int]:
+    """
+    Insert one chunk of an import and advance its checkpoint in the same transaction.
+    
+    Because the checkpoint commits together with the rows, a crashed import can
+    resume after the last committed chunk without duplicating employees.
+    
+    Args:
+        fingerprint: Content hash of the import file
+        source: File name, for reporting
+        rows: Validated employee dictionaries in this chunk (may be empty)
+        rows_processed: Data rows of the file handled once this chunk commits
+        
+    Returns:
+        List of new employee IDs
+    """
+    ids = _insert_employees(rows) if rows else []
+    
+    checkpoint = db.session.get(ImportCheckpoint, fingerprint)
+    if checkpoint is None:
+        checkpoint = ImportCheckpoint(fingerprint=fingerprint, source=source)
+        db.session.add(checkpoint)
+    checkpoint.rows_processed = rows_processed
+    checkpoint.employees_created = (checkpoint.employees_created or 0) + len(ids)
+    db.session.commit()
+    
+    record_employee_changes([
+        (employee_id, None, (row['country'], row['job_title'], row['salary']))
+        for employee_id, row in zip(ids, rows)
+    ])
+    return ids
+
+
+def complete_import_service(fingerprint: str, source: str) -> None:
+    """
+    Mark an import as finished so it is not run again.
+    
+    Args:
+        fingerprint: Content hash of the import file
+        source: File name, for reporting
+    """
+    checkpoint = db.session.get(ImportCheckpoint, fingerprint)
+    if checkpoint is None:
+        checkpoint = ImportCheckpoint(fingerprint=fingerprint, source=source, rows_processed=0, employees_created=0)
+        db.session.add(checkpoint)
+    checkpoint.completed = True
+    db.session.commit()
+
+
+def reset_import_service(fingerprint: str) -> None:
+    """
+    Forget the progress of an import so the file is processed from the start.
+    
+    Args:
+        fingerprint: Content hash of the import file
+    """
+    checkpoint = db.session.get(ImportCheckpoint, fingerprint)
+    if checkpoint is not None:
+        db.session.delete(checkpoint)
+        db.session.commit()
+
+
+def get_employee_service(employee_id: int) -> Optional[Employee]:
+    """
+    Get an employee by ID.
+    
+    Args:
+        employee_id: Employee ID
+        
+    Returns:
+        Employee object or None if not found
+    """
+    return Employee.query.get(employee_id)
+
+
+def _cached_employee_entry(employee_id: int) -> Optional[Dict]:
+    """
+    Get the cache entry of one employee, reading it from the database on a miss.
+    
+    Entries remember the version they were read at, so an entry filled
+    concurrently with a write is never served after that write. The versions
+    are caught up with the change log every EMPLOYEE_CACHE_SYNC_INTERVAL, so
+    writes by other processes invalidate entries within that interval (and
+    immediately for an employee whose ETag was just read).
+    """
+    _sync_data_versions()
+    version, entry = lookup_cached_employee(employee_id)
+    if entry is not None:
+        return entry
+    
+    employee = get_employee_service(employee_id)
+    return store_cached_employee(employee_id, version, employee.to_dict()) if employee else None
+
+
+def lookup_cached_employee(employee_id: int) -> Tuple[int, Optional[Dict]]:
+    """
+    Look up an employee in the LRU cache.
+    
+    Returns:
+        Tuple of (version to store with an entry read now, cache entry or None on a miss)
+    """
+    tracker = get_version_tracker()
+    entry = get_employee_cache().get(employee_id)
+    if entry is not None and tracker.row_version(employee_id) <= entry['version']:
+        return entry['version'], entry
+    return tracker.read_version(employee_id), None
+
+
+def store_cached_employee(employee_id: int, version: int, employee: Dict) -> Dict:
+    """
+    Store an employee read from the database in the LRU cache.
+    
+    Args:
+        employee_id: Employee ID
+        version: Version returned by lookup_cached_employee before the read
+        employee: Employee dictionary
+        
+    Returns:
+        The new cache entry
+    """
+    entry = {'version': version, 'employee': employee}
+    get_employee_cache().set(employee_id, entry)
+    return entry
+
+
+def get_employee_dict_service(employee_id: int) -> Optional[Dict]:
+    """
+    Get an employee as a dictionary through the read-through LRU cache.
+    
+    Args:
+        employee_id: Employee ID
+        
+    Returns:
+        Employee dictionary or None if not found
+    """
+    entry = _cached_employee_entry(employee_id)
+    return entry['employee'] if entry else None
+
+
+def calculate_employee_salary_service(employee_id: int) -> Optional[Dict[str, float]]:
+    """
+    Calculate an employee's net salary, cached alongside the employee.
+    
+    Args:
+        employee_id: Employee ID
+        
+    Returns:
+        Dictionary containing gross_salary, tds, and net_salary, or None if not found
+    """
+    entry = _cached_employee_entry(employee_id)
+    return cached_net_salary(entry) if entry else None
+
+
+def cached_net_salary(entry: Dict) -> Dict[str, float]:
+    """Net salary of a cached employee, computed once per cache entry"""
+    if 'net_salary' not in entry:
+        employee = entry['employee']
+        entry['net_salary'] = calculate_net_salary(employee['salary'], employee['country'])
+    return entry['net_salary']
+
+
+def get_employee_cache_stats_service() -> Dict:
+    """
+    Get hit/miss/eviction counters of the single-employee cache.
+    
+    Returns:
+        Dictionary of cache counters
+    """
+    return get_employee_cache().stats()
+
+
+def get_request_metrics_service() -> str:
+    """
+    Get the request latency and SQL metrics.
+    
+    Returns:
+        Metrics in Prometheus text exposition format
+    """
+    return get_request_metrics().render()
+
+
+def get_all_employees_service() -> List[Employee]:
+    """
+    Get all employees.
+    
+    Returns:
+        List of Employee objects
+    """
+    return Employee.query.all()
+
+
+def _employee_filters(country: Optional[str] = None, job_title: Optional[str] = None,
+                      min_salary: Optional[float] = None, max_salary: Optional[float] = None) -> List:
+    """
+    Build WHERE clauses for the optional employee list filters.
+    
+    Each filter matches a leading index column, so filtered reads use
+    index searches instead of table scans.
+    """
+    conditions = []
+    if country is not None:
+        conditions.append(Employee.country == country)
+    if job_title is not None:
+        conditions.append(Employee.job_title == job_title)
+    if min_salary is not None:
+        conditions.append(Employee.salary >= min_salary)
+    if max_salary is not None:
+        conditions.append(Employee.salary <= max_salary)
+    return conditions
+
+
+def get_employees_page_service(limit: Optional[int] = None, after: Optional[int] = None,
+                               fields: Optional[List[str]] = None, country: Optional[str] = None,
+                               job_title: Optional[str] = None, min_salary: Optional[float] = None,
+                               max_salary: Optional[float] = None) -> List[Dict]:
+    """
+    Get employees ordered by ID using keyset pagination.
+    
+    Rows are read as plain column tuples, so no ORM objects are built.
+    
+    Args:
+        limit: Maximum number of employees to return (None for no limit)
+        after: Only return employees with an ID greater than this cursor
+        fields: Columns to return (None for all columns); 'id' is always included
+        country: Only return employees in this country
+        job_title: Only return employees with this job title
+        min_salary: Only return employees earning at least this much
+        max_salary: Only return employees earning at most this much
+        
+    Returns:
+        List of employee dictionaries
+    """
+    names, query = build_employees_page_query(limit, after, fields, country, job_title, min_salary, max_salary)
+    return [dict(zip(names, row)) for row in db.session.execute(query)]
+
+
+def build_employees_page_query(limit: Optional[int] = None, after: Optional[int] = None,
+                               fields: Optional[List[str]] = None, country: Optional[str] = None,
+                               job_title: Optional[str] = None, min_salary: Optional[float] = None,
+                               max_salary: Optional[float] = None) -> Tuple[List[str], Select]:
+    """
+    Build the keyset pagination query used by get_employees_page_service.
+    
+    Returns:
+        Tuple of (selected column names, SELECT statement)
+    """
+    names = _employee_field_names(fields)
+    query = select(*(getattr(Employee, name) for name in names)).order_by(Employee.id)
+    query = query.where(*_employee_filters(country, job_title, min_salary, max_salary))
+    if after is not None:
+        query = query.where(Employee.id > after)
+    if limit is not None:
+        query = query.limit(limit)
+    return names, query
+
+
+def _employee_field_names(fields: Optional[List[str]]) -> List[str]:
+    """Columns returned for a fields= projection; 'id' always comes first"""
+    return list(EMPLOYEE_FIELDS) if not fields else ['id'] + [name for name in fields if name != 'id']
+
+
+def _cached_employee_entries(employee_ids: List[int], chunk_size: int = ID_LOOKUP_CHUNK_SIZE) -> Dict[int, Dict]:
+    """
+    Get the cache entries of many employees, reading all misses with chunked IN queries.
+    
+    Returns:
+        Employee ID -> cache entry, for the employees that exist
+    """
+    _sync_data_versions()
+    entries = {}
+    miss_versions = {}
+    for employee_id in employee_ids:
+        version, entry = lookup_cached_employee(employee_id)
+        if entry is None:
+            miss_versions[employee_id] = version
+        else:
+            entries[employee_id] = entry
+    
+    misses = list(miss_versions)
+    for start in range(0, len(misses), chunk_size):
+        names, query = build_employees_by_ids_query(misses[start:start + chunk_size])
+        for row in db.session.execute(query):
+            employee = dict(zip(names, row))
+            entries[employee['id']] = store_cached_employee(employee['id'], miss_versions[employee['id']], employee)
+    return entries
+
+
+def build_employees_by_ids_query(employee_ids: List[int]) -> Tuple[List[str], Select]:
+    """
+    Build the IN query used by batch lookups for one chunk of IDs.
+    
+    Returns:
+        Tuple of (selected column names, SELECT statement)
+    """
+    names = list(EMPLOYEE_FIELDS)
+    return names, select(*(getattr(Employee, name) for name in names)).where(Employee.id.in_(employee_ids))
+
+
+def project_cached_employees(entries: Dict[int, Dict], employee_ids: List[int],
+                             fields: Optional[List[str]] = None) -> Tuple[List[Dict], List[int]]:
+    """
+    Pick the requested employees out of cache entries.
+    
+    Returns:
+        Tuple of (employee dictionaries in the requested order, IDs not found)
+    """
+    names = _employee_field_names(fields)
+    employees = [
+        {name: entries[employee_id]['employee'][name] for name in names}
+        for employee_id in employee_ids if employee_id in entries
+    ]
+    return employees, [employee_id for employee_id in employee_ids if employee_id not in entries]
+
+
+def get_employees_by_ids_service(employee_ids: List[int],
+                                 fields: Optional[List[str]] = None) -> Tuple[List[Dict], List[int]]:
+    """
+    Get many employees by ID, through the LRU cache and one IN query per chunk of misses.
+    
+    Args:
+        employee_ids: Employee IDs (without duplicates)
+        fields: Columns to return (None for all columns); 'id' is always included
+        
+    Returns:
+        Tuple of (employee dictionaries in the requested order, IDs not found)
+    """
+    return project_cached_employees(_cached_employee_entries(employee_ids), employee_ids, fields)
+
+
+def calculate_salaries_by_ids_service(employee_ids: List[int]) -> Tuple[List[Dict], List[int]]:
+    """
+    Calculate net salaries for many employees in one vectorized batch.
+    
+    Results are identical to calculate_net_salary for each employee.
+    
+    Args:
+        employee_ids: Employee IDs (without duplicates)
+        
+    Returns:
+        Tuple of (payroll rows with id, country, gross_salary, tds and
+        net_salary in the requested order, IDs not found)
+    """
+    entries = _cached_employee_entries(employee_ids)
+    found = [employee_id for employee_id in employee_ids if employee_id in entries]
+    employees = [entries[employee_id]['employee'] for employee_id in found]
+    salaries = np.array([employee['salary'] for employee in employees], dtype=float)
+    countries = [employee['country'] for employee in employees]
+    tds, net = compute_payroll(salaries, countries, get_tax_rules())
+    rows = payroll_rows(np.array(found, dtype=np.int64), salaries, tds, net, countries)
+    return rows, [employee_id for employee_id in employee_ids if employee_id not in entries]
+
+
+def iter_employees_service(chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Stream every employee ordered by ID through a server-side cursor.
+    
+    Rows are fetched chunk_size at a time, so memory use does not grow
+    with the size of the table.
+    
+    Args:
+        chunk_size: Number of rows fetched per round-trip
+        
+    Yields:
+        Employee dictionaries
+    """
+    names = list(EMPLOYEE_FIELDS)
+    query = select(*(getattr(Employee, name) for name in names)).order_by(Employee.id)
+    result = db.session.execute(query, execution_options={'yield_per': chunk_size})
+    for row in result:
+        yield dict(zip(names, row))
+
+
+def search_employees_service(query_text: str, country: Optional[str] = None, job_title: Optional[str] = None,
+                             limit: int = DEFAULT_SEARCH_LIMIT) -> List[Dict]:
+    """
+    Search employees by name, best matches first.
+    
+    Every word of the query must match the start of a word in the name
+    (so "jo sm" finds "John Smith"), case- and accent-insensitively. On
+    SQLite this is an FTS5 prefix-index lookup ranked by bm25; other
+    databases fall back to unranked LIKE matching.
+    
+    Every match is ranked, so the best matches are returned however broad
+    the query; bm25 costs about a microsecond per matching row, and the
+    ORDER BY ... LIMIT keeps only the top rows while sorting.
+    
+    Args:
+        query_text: Search text
+        country: Only return employees in this country
+        job_title: Only return employees with this job title
+        limit: Maximum number of employees to return
+        
+    Returns:
+        List of employee dictionaries
+    """
+    terms = re.findall(r'\w+', query_text)
+    if not terms:
+        return []
+    names = list(EMPLOYEE_FIELDS)
+    columns = [getattr(Employee, name) for name in names]
+    filters = _employee_filters(country, job_title)
+    
+    if db.engine.dialect.name == 'sqlite':
+        match = ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        # likely() stops the planner from driving the join from the country /
+        # job title indexes, which would probe the FTS table once per row
+        query = (
+            select(*columns)
+            .join_from(employees_fts, Employee, Employee.id == employees_fts.c.rowid)
+            .where(literal_column('employees_fts').match(match), *(func.likely(condition) for condition in filters))
+            .order_by(employees_fts.c.rank, Employee.id)
+            .limit(limit)
+        )
+    else:
+        query = select(*columns).where(*filters, *(
+            or_(Employee.full_name.istartswith(term, autoescape=True),
+                Employee.full_name.icontains(f' {term}', autoescape=True))
+            for term in terms
+        )).order_by(Employee.full_name, Employee.id).limit(limit)
+    return [dict(zip(names, row)) for row in db.session.execute(query)]
+
+
+def ensure_search_index_service() -> bool:
+    """
+    Create and fill the name search index if the database predates it.
+    
+    Returns:
+        True if the index was created
+    """
+    if db.engine.dialect.name != 'sqlite' or inspect(db.engine).has_table('employees_fts'):
+        return False
+    rebuild_search_index_service()
+    return True
+
+
+def rebuild_search_index_service() -> None:
+    """
+    Create the name search index and its triggers if missing, and rebuild it
+    from the employees table.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    for statement in EMPLOYEE_SEARCH_DDL:
+        db.session.execute(text(statement))
+    db.session.execute(text("INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')"))
+    db.session.commit()
+
+
+def change_log_maintained_service() -> bool:
+    """Whether employee_changes is written by triggers (SQLite only)"""
+    return db.engine.dialect.name == 'sqlite'
+
+
+def _change_log_state() -> ChangeLogState:
+    state = db.session.get(ChangeLogState, 1)
+    if state is None:
+        state = ChangeLogState(id=1, purged_through=0)
+        db.session.add(state)
+    return state
+
+
+def get_latest_change_cursor_service() -> int:
+    """
+    Get the cursor of the newest change, to start following the feed after a full sync.
+    
+    Returns:
+        Sequence number of the newest change (0 if there has been none)
+    """
+    latest, purged_through = db.session.execute(build_latest_change_cursor_query()).one()
+    return max(latest or 0, purged_through or 0)
+
+
+def build_latest_change_cursor_query() -> Select:
+    """
+    Build the query used by get_latest_change_cursor_service.
+    
+    Returns:
+        SELECT of one (newest sequence number, purge point) row; the cursor is
+        the larger of the two, and either may be NULL
+    """
+    purged = select(ChangeLogState.purged_through).where(ChangeLogState.id == 1).scalar_subquery()
+    return select(func.max(EmployeeChange.seq), purged)
+
+
+def get_employee_changes_service(since: int = 0, limit: int = DEFAULT_CHANGES_LIMIT) -> Optional[Dict]:
+    """
+    Get employee changes made after a cursor, in commit order.
+    
+    Compaction keeps only the newest change of each employee, so a page
+    may skip sequence numbers; replaying it still yields the current rows.
+    
+    Args:
+        since: Cursor of the last change already applied (0 for the start of the log)
+        limit: Maximum number of changes
+        
+    Returns:
+        Dictionary with changes (cursor, op, employee_id, employee row or
+        None for deletes, changed_at), next_cursor and has_more, or None if
+        changes after the cursor were removed by retention
+    """
+    state = db.session.get(ChangeLogState, 1)
+    if state is not None and since < state.purged_through:
+        return None
+    
+    rows = db.session.execute(
+        select(EmployeeChange).where(EmployeeChange.seq > since).order_by(EmployeeChange.seq).limit(limit + 1)
+    ).scalars().all()
+    changes = [
+        {
+            'cursor': change.seq,
+            'op': change.op,
+            'employee_id': change.employee_id,
+            'employee': None if change.op == 'delete' else {
+                'id': change.employee_id,
+                'full_name': change.full_name,
+                'job_title': change.job_title,
+                'country': change.country,
+                'salary': change.salary
+            },
+            'changed_at': _isoformat(change.changed_at)
+        }
+        for change in rows[:limit]
+    ]
+    return {
+        'changes': changes,
+        'next_cursor': changes[-1]['cursor'] if changes else since,
+        'has_more': len(rows) > limit
+    }
+
+
+def compact_change_log_service(retention_days: int) -> Dict[str, int]:
+    """
+    Compact the change log and apply retention.
+    
+    Compaction drops every change superseded by a newer change of the same
+    employee, which is safe for every cursor since changes carry whole rows.
+    Retention then drops all changes older than retention_days; cursors
+    before the newest dropped change are expired.
+    
+    Args:
+        retention_days: Days of changes to keep
+        
+    Returns:
+        Dictionary with compacted and expired change counts and purged_through
+    """
+    newer = aliased(EmployeeChange)
+    compacted = db.session.execute(
+        delete(EmployeeChange).where(
+            exists().where(newer.employee_id == EmployeeChange.employee_id, newer.seq > EmployeeChange.seq)
+        ),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    
+    cutoff = _utcnow() - timedelta(days=retention_days)
+    through = db.session.execute(
+        select(func.max(EmployeeChange.seq)).where(EmployeeChange.changed_at < cutoff)
+    ).scalar()
+    expired = 0
+    state = _change_log_state()
+    if through is not None:
+        expired = db.session.execute(
+            delete(EmployeeChange).where(EmployeeChange.seq <= through),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        state.purged_through = max(state.purged_through, through)
+    db.session.commit()
+    return {'compacted': compacted, 'expired': expired, 'purged_through': state.purged_through}
+
+
+def ensure_change_log_service() -> bool:
+    """
+    Create the change log and its triggers if the database predates them.
+    
+    The log starts empty; mirrors of such a database start with a full sync.
+    
+    Returns:
+        True if the change log was created
+    """
+    if not change_log_maintained_service() or inspect(db.engine).has_table(EmployeeChange.__tablename__):
+        return False
+    EmployeeChange.__table__.create(db.session.connection(), checkfirst=True)
+    ChangeLogState.__table__.create(db.session.connection(), checkfirst=True)
+    for statement in CHANGE_LOG_TRIGGER_DDL:
+        db.session.execute(text(statement))
+    db.session.commit()
+    return True
+
+
+def rebuild_analytics_snapshot_service(chunk_size: int = EXPORT_CHUNK_SIZE) -> ColumnarSnapshot:
+    """
+    Rebuild the columnar analytics snapshot from the employees table.
+    
+    The change log cursor is read before the rows, so changes committed
+    during the rebuild are replayed by the next sync.
+    
+    Returns:
+        The application's snapshot, or a new one when ANALYTICS_ENGINE is 'sql'
+    """
+    snapshot = get_analytics_snapshot() or ColumnarSnapshot()
+    cursor = get_latest_change_cursor_service() if change_log_maintained_service() else 0
+    result = db.session.execute(
+        select(Employee.id, Employee.salary, Employee.country, Employee.job_title).order_by(Employee.id),
+        execution_options={'yield_per': chunk_size}
+    )
+    snapshot.rebuild((zip(*partition) for partition in result.partitions()), cursor)
+    return snapshot
+
+
+def _sync_analytics_snapshot(snapshot: ColumnarSnapshot, chunk_size: int = EXPORT_CHUNK_SIZE) -> None:
+    """Replay the change log since the snapshot's cursor, or rebuild if those changes were purged"""
+    state = db.session.get(ChangeLogState, 1)
+    if state is not None and snapshot.cursor < state.purged_through:
+        rebuild_analytics_snapshot_service(chunk_size)
+        return
+    while True:
+        rows = db.session.execute(
+            select(
+                EmployeeChange.seq,
+                EmployeeChange.employee_id,
+                EmployeeChange.op,
+                EmployeeChange.country,
+                EmployeeChange.job_title,
+                EmployeeChange.salary
+            ).where(EmployeeChange.seq > snapshot.cursor).order_by(EmployeeChange.seq).limit(chunk_size)
+        ).all()
+        snapshot.apply(
+            (seq, employee_id, None if op == 'delete' else (country, job_title, salary))
+            for seq, employee_id, op, country, job_title, salary in rows
+        )
+        if len(rows) < chunk_size:
+            return
+
+
+def _analytics_snapshot() -> Optional[ColumnarSnapshot]:
     """
-    Get an employee by ID.
+    Get the analytics snapshot, current with the database, or None when
+    ANALYTICS_ENGINE is 'sql'.
     
-    Args:
-        employee_id: Employee ID
-        
-    Returns:
-        Employee object or None if not found
+    On first use the snapshot is loaded from ANALYTICS_SNAPSHOT_PATH (SQLite
+    only, as it is caught up from the change log) or rebuilt. On SQLite every
+    use then replays the changes since its cursor, so writes by other
+    processes are seen; elsewhere record_employee_changes applies this
+    process's writes.
     """
-    return Employee.query.get(employee_id)
+    snapshot = get_analytics_snapshot()
+    if snapshot is None:
+        return None
+    maintained = change_log_maintained_service()
+    if not snapshot.loaded:
+        if not (maintained and snapshot.path and snapshot.load(snapshot.path)):
+            rebuild_analytics_snapshot_service()
+    if maintained:
+        _sync_analytics_snapshot(snapshot)
+    return snapshot
 
 
-def get_all_employees_service() -> List[Employee]:
+def save_analytics_snapshot_service(path: str) -> Dict[str, int]:
     """
-    Get all employees.
+    Rebuild the analytics snapshot and save it for new processes to load.
+    
+    Args:
+        path: Directory to save the snapshot in
     
     Returns:
-        List of Employee objects
+        The snapshot's stats (rows and memory footprint)
     """
-    return Employee.query.all()
+    snapshot = rebuild_analytics_snapshot_service()
+    snapshot.save(path)
+    return snapshot.stats()
 
 
 def update_employee_service(employee_id: int, data: Dict) -> Optional[Employee]:
@@ -70,6 +934,24 @@ def update_employee_service(employee_id: int, data: Dict) -> Optional[Employee]:
     if not employee:
         return None
     
+    change = apply_employee_update(employee, data)
+    db.session.commit()
+    record_employee_changes([change])
+    return employee
+
+
+def apply_employee_update(employee: Employee, data: Dict) -> Tuple[int, Tuple[str, str, float], Tuple[str, str, float]]:
+    """
+    Copy updated fields onto an employee without committing.
+    
+    Args:
+        employee: Employee object to modify
+        data: Dictionary with fields to update
+        
+    Returns:
+        (employee_id, old, new) change record for record_employee_changes
+    """
+    old = (employee.country, employee.job_title, employee.salary)
     if 'full_name' in data:
         employee.full_name = data['full_name']
     if 'job_title' in data:
@@ -78,9 +960,7 @@ def update_employee_service(employee_id: int, data: Dict) -> Optional[Employee]:
         employee.country = data['country']
     if 'salary' in data:
         employee.salary = float(data['salary'])
-    
-    db.session.commit()
-    return employee
+    return employee.id, old, (employee.country, employee.job_title, employee.salary)
 
 
 def delete_employee_service(employee_id: int) -> bool:
@@ -97,25 +977,125 @@ def delete_employee_service(employee_id: int) -> bool:
     if not employee:
         return False
     
+    old = (employee.country, employee.job_title, employee.salary)
     db.session.delete(employee)
     db.session.commit()
+    record_employee_changes([(employee_id, old, None)])
     return True
 
 
+def _begin_write_transaction() -> None:
+    """
+    Take the database write lock before reads that a following write relies on.
+    
+    SQLite ignores SELECT ... FOR UPDATE and only locks at the first write, so
+    another connection could commit between the reads and the write (and, in
+    WAL mode, the write then fails with SQLITE_BUSY_SNAPSHOT). BEGIN IMMEDIATE
+    takes the lock up front, waiting up to busy_timeout for other writers.
+    Other databases lock the rows with FOR UPDATE instead.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    connection = db.session.connection()
+    if not connection.connection.dbapi_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+
+def bulk_adjust_salaries_service(country: Optional[str] = None, job_title: Optional[str] = None,
+                                 min_salary: Optional[float] = None, max_salary: Optional[float] = None,
+                                 percent: Optional[float] = None, amount: Optional[float] = None,
+                                 dry_run: bool = False) -> Dict:
+    """
+    Raise (or cut) the salary of every matching employee with one UPDATE statement.
+    
+    New salaries are salary * (1 + percent / 100) or salary + amount, rounded
+    to cents. The affected rows are read (and locked, with BEGIN IMMEDIATE on
+    SQLite or SELECT ... FOR UPDATE elsewhere) in the same transaction as the
+    UPDATE, so the aggregates and employee cache can be updated exactly and
+    no other writer can commit in between. Nothing is written on a dry run,
+    or when a salary would become negative.
+    
+    Args:
+        country: Only adjust employees in this country
+        job_title: Only adjust employees with this job title
+        min_salary: Only adjust employees earning at least this much
+        max_salary: Only adjust employees earning at most this much
+        percent: Percentage raise (negative for a cut); exclusive with amount
+        amount: Fixed raise (negative for a cut); exclusive with percent
+        dry_run: Only report the impact
+        
+    Returns:
+        Dictionary with affected, total_before, total_after, delta,
+        min_salary_after, max_salary_after, dry_run and applied
+    """
+    if percent is not None:
+        new_salary = func.round(Employee.salary * (1 + percent / 100), 2)
+    else:
+        new_salary = func.round(Employee.salary + amount, 2)
+    conditions = _employee_filters(country, job_title, min_salary, max_salary)
+    if not dry_run:
+        _begin_write_transaction()
+    
+    affected, total_before, total_after, lowest, highest = db.session.execute(
+        select(func.count(), func.coalesce(func.sum(Employee.salary), 0.0),
+               func.coalesce(func.sum(new_salary), 0.0), func.min(new_salary), func.max(new_salary))
+        .where(*conditions)
+    ).one()
+    impact = {
+        'affected': affected,
+        'total_before': round(total_before, 2),
+        'total_after': round(total_after, 2),
+        'delta': round(total_after - total_before, 2),
+        'min_salary_after': lowest,
+        'max_salary_after': highest,
+        'dry_run': dry_run,
+        'applied': False
+    }
+    if dry_run or not affected or lowest < 0:
+        db.session.rollback()
+        return impact
+    
+    old_rows = {
+        employee_id: (row_country, row_job_title, salary)
+        for employee_id, row_country, row_job_title, salary in db.session.execute(
+            select(Employee.id, Employee.country, Employee.job_title, Employee.salary)
+            .where(*conditions).with_for_update()
+        )
+    }
+    updated = db.session.execute(
+        update(Employee).where(*conditions).values(salary=new_salary).returning(Employee.id, Employee.salary),
+        execution_options={'synchronize_session': False}
+    ).all()
+    db.session.commit()
+    
+    changes = []
+    for employee_id, salary in updated:
+        old = old_rows.get(employee_id)
+        if old is None:
+            # Row inserted concurrently after the pre-read: its old salary was
+            # never counted, so reload the aggregates instead of patching them
+            get_aggregate_store().invalidate()
+            changes.append((employee_id, None, None))
+        else:
+            changes.append((employee_id, old, (old[0], old[1], salary)))
+    record_employee_changes(changes)
+    impact.update(affected=len(updated), applied=True)
+    return impact
+
+
 # Business logic functions
 def calculate_tds(gross_salary: float, country: str) -> float:
     """
-    Calculate TDS (Tax Deducted at Source) based on country.
+    Calculate TDS (Tax Deducted at Source) from the country's tax slabs.
     
     Args:
         gross_salary: The gross salary amount
         country: The country name
         
     Returns:
-        The TDS amount
+        The TDS amount (0 for countries without a tax table)
     """
-    tds_rate = TDS_RATES.get(country, 0.0)
-    return gross_salary * tds_rate
+    return get_tax_rules().tax(gross_salary, country)
 
 
 def calculate_net_salary(gross_salary: float, country: str) -> Dict[str, float]:
@@ -139,54 +1119,811 @@ def calculate_net_salary(gross_salary: float, country: str) -> Dict[str, float]:
     }
 
 
-def get_salary_metrics_by_country(country: str) -> Optional[Dict[str, float]]:
+def run_payroll_service(country: Optional[str] = None, job_title: Optional[str] = None,
+                        min_salary: Optional[float] = None, max_salary: Optional[float] = None,
+                        chunk_size: int = PAYROLL_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Compute gross, TDS and net salary for every matching employee.
+    
+    Salaries and countries are read as columns chunk_size rows at a time
+    (from the analytics snapshot with the columnar engine) and each chunk is
+    computed in one vectorized pass.
+    
+    Args:
+        country: Optional country filter
+        job_title: Optional job title filter
+        min_salary: Optional lower salary bound (inclusive)
+        max_salary: Optional upper salary bound (inclusive)
+        chunk_size: Number of employees computed per batch
+        
+    Yields:
+        {'employees': [...]} for each batch, then one final
+        {'totals': {country: {...}}, 'employee_count': n}
+    """
+    totals = PayrollTotals()
+    for ids, countries, salaries in _payroll_batches(country, job_title, min_salary, max_salary, chunk_size):
+        tds, net = compute_payroll(salaries, countries, get_tax_rules())
+        totals.add(salaries, tds, net, countries)
+        yield {'employees': payroll_rows(ids, salaries, tds, net, countries)}
+    
+    yield {'totals': totals.to_dict(), 'employee_count': totals.employee_count}
+
+
+def _payroll_batches(country: Optional[str], job_title: Optional[str], min_salary: Optional[float],
+                     max_salary: Optional[float], chunk_size: int) -> Iterator[Tuple[np.ndarray, List[str], np.ndarray]]:
+    """(ids, countries, salaries) of the matching employees in ID order, chunk_size at a time"""
+    snapshot = _analytics_snapshot()
+    if snapshot is not None:
+        columns, names = snapshot.view()
+        mask = filter_mask(snapshot, columns, country, job_title, min_salary, max_salary)
+        for rows in iter_row_batches(columns, mask, chunk_size):
+            yield columns.ids[rows], names['country'][columns.country[rows]].tolist(), columns.salaries[rows]
+        return
+    
+    query = select(Employee.id, Employee.country, Employee.salary).where(
+        *_employee_filters(country, job_title, min_salary, max_salary)
+    ).order_by(Employee.id)
+    result = db.session.execute(query, execution_options={'yield_per': chunk_size})
+    for partition in result.partitions():
+        ids, countries, salaries = zip(*partition)
+        yield np.array(ids, dtype=np.int64), countries, np.array(salaries, dtype=np.float64)
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, the way DateTime columns store it"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() + 'Z' if value is not None else None
+
+
+def create_payroll_job_service(filters: Dict, partition_size: int = PAYROLL_JOB_PARTITION_SIZE) -> int:
+    """
+    Plan a background payroll run over the employees matching filters and start it.
+    
+    The ID range of the matching employees is split into partitions of
+    partition_size IDs, each computed and stored by the job runner.
+    
+    Args:
+        filters: country, job_title, min_salary and max_salary filters
+        partition_size: Employee IDs per partition
+        
+    Returns:
+        The job ID
+    """
+    lowest, highest = db.session.execute(
+        select(func.min(Employee.id), func.max(Employee.id)).where(*_employee_filters(**filters))
+    ).one()
+    starts = range(lowest, highest + 1, partition_size) if lowest is not None else range(0)
+    job = PayrollJob(filters=filters, partition_size=partition_size, partition_count=len(starts),
+                     created_at=_utcnow())
+    db.session.add(job)
+    db.session.flush()
+    if starts:
+        db.session.execute(insert(PayrollPartition), [
+            {'job_id': job.id, 'number': number, 'start_id': start, 'end_id': start + partition_size}
+            for number, start in enumerate(starts)
+        ])
+    db.session.commit()
+    start_payroll_job_service(job.id)
+    return job.id
+
+
+def start_payroll_job_service(job_id: int) -> None:
+    """
+    (Re)start a payroll job, queueing every partition that has not completed.
+    
+    Args:
+        job_id: Payroll job ID
+    """
+    job = db.session.get(PayrollJob, job_id)
+    job.status = 'running'
+    job.started_at = _utcnow()
+    job.finished_at = job.error = None
+    pending = db.session.execute(
+        select(PayrollPartition.number).where(
+            PayrollPartition.job_id == job_id,
+            PayrollPartition.completed_at.is_(None)
+        ).order_by(PayrollPartition.number)
+    ).scalars().all()
+    db.session.commit()
+    
+    runner = get_job_runner()
+    for number in pending:
+        runner.submit(job_id, run_payroll_partition_service, job_id, number)
+    if not pending:
+        _finish_payroll_job(job_id)
+
+
+def run_payroll_partition_service(job_id: int, number: int) -> int:
+    """
+    Compute and store the payslips of one partition of a running payroll job.
+    
+    Payslips are written in batches in one transaction that also marks the
+    partition completed. The partition is claimed before anything is
+    written, so a partition that another worker already finished is
+    skipped. A failure marks the whole job failed.
+    
+    Args:
+        job_id: Payroll job ID
+        number: Partition number
+        
+    Returns:
+        Number of payslips written
+    """
+    job = db.session.get(PayrollJob, job_id)
+    partition = db.session.get(PayrollPartition, (job_id, number))
+    if job.status != 'running' or partition.completed_at is not None:
+        return 0
+    
+    try:
+        # Read and compute before writing, so the write transaction stays short
+        rows = db.session.execute(
+            select(Employee.id, Employee.country, Employee.salary).where(
+                *_employee_filters(**job.filters),
+                Employee.id >= partition.start_id,
+                Employee.id < partition.end_id
+            ).order_by(Employee.id)
+        ).all()
+        payslips = []
+        if rows:
+            ids, countries, salaries = zip(*rows)
+            salaries = np.array(salaries, dtype=np.float64)
+            tds, net = compute_payroll(salaries, countries, get_tax_rules())
+            payslips = [
+                {'job_id': job_id, 'employee_id': row.pop('id'), **row}
+                for row in payroll_rows(np.array(ids, dtype=np.int64), salaries, tds, net, countries)
+            ]
+        
+        claimed = db.session.execute(
+            update(PayrollPartition).where(
+                PayrollPartition.job_id == job_id,
+                PayrollPartition.number == number,
+                PayrollPartition.completed_at.is_(None)
+            ).values(completed_at=_utcnow(), payslip_count=len(payslips)),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        if not claimed:
+            db.session.rollback()
+            return 0
+        for start in range(0, len(payslips), PAYSLIP_INSERT_BATCH_SIZE):
+            db.session.execute(insert(Payslip), payslips[start:start + PAYSLIP_INSERT_BATCH_SIZE])
+        db.session.commit()
+    except Exception as error:
+        db.session.rollback()
+        db.session.execute(
+            update(PayrollJob).where(PayrollJob.id == job_id).values(
+                status='failed', error=f'Partition {number}: {error}', finished_at=_utcnow()
+            ),
+            execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+        raise
+    
+    _finish_payroll_job(job_id)
+    return len(payslips)
+
+
+def _finish_payroll_job(job_id: int) -> None:
+    """Mark a running job completed once none of its partitions is pending"""
+    pending = exists().where(PayrollPartition.job_id == job_id, PayrollPartition.completed_at.is_(None))
+    db.session.execute(
+        update(PayrollJob).where(PayrollJob.id == job_id, PayrollJob.status == 'running', ~pending)
+        .values(status='completed', finished_at=_utcnow()),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.commit()
+
+
+def get_payroll_job_service(job_id: int) -> Optional[Dict]:
+    """
+    Get the status, progress and throughput of a payroll job.
+    
+    Args:
+        job_id: Payroll job ID
+        
+    Returns:
+        Dictionary with id, status, active (work queued in this process),
+        filters, timestamps, error, partition counts, progress (0-1),
+        payslips written, elapsed_seconds and payslips_per_second of the
+        latest (re)start, or None if not found
+    """
+    job = db.session.get(PayrollJob, job_id, populate_existing=True)
+    if not job:
+        return None
+    completed, payslips, run_payslips = db.session.execute(
+        select(
+            func.count(PayrollPartition.completed_at),
+            func.coalesce(func.sum(PayrollPartition.payslip_count), 0),
+            func.coalesce(func.sum(case(
+                (PayrollPartition.completed_at >= job.started_at, PayrollPartition.payslip_count), else_=0
+            )), 0)
+        ).where(PayrollPartition.job_id == job_id)
+    ).one()
+    elapsed = ((job.finished_at or _utcnow()) - job.started_at).total_seconds() if job.started_at else 0.0
+    
+    return {
+        'id': job.id,
+        'status': job.status,
+        'active': get_job_runner().is_active(job.id),
+        'filters': job.filters,
+        'created_at': _isoformat(job.created_at),
+        'started_at': _isoformat(job.started_at),
+        'finished_at': _isoformat(job.finished_at),
+        'error': job.error,
+        'partitions': {'total': job.partition_count, 'completed': completed},
+        'progress': round(completed / job.partition_count, 4) if job.partition_count else 1.0,
+        'payslips': payslips,
+        'elapsed_seconds': round(elapsed, 3),
+        'payslips_per_second': round(run_payslips / elapsed, 1) if elapsed > 0 else None
+    }
+
+
+def get_payslips_service(job_id: int, limit: int = DEFAULT_PAYSLIP_LIMIT, after: Optional[int] = None) -> List[Dict]:
+    """
+    Get the stored payslips of a payroll job ordered by employee ID (keyset pagination).
+    
+    Args:
+        job_id: Payroll job ID
+        limit: Maximum number of payslips
+        after: Only return payslips of employees with an ID greater than this
+        
+    Returns:
+        List of payslip dictionaries with employee_id, country, gross_salary,
+        tds and net_salary
+    """
+    names = ['employee_id', 'country', 'gross_salary', 'tds', 'net_salary']
+    query = select(*(getattr(Payslip, name) for name in names)).where(Payslip.job_id == job_id)
+    if after is not None:
+        query = query.where(Payslip.employee_id > after)
+    query = query.order_by(Payslip.employee_id).limit(limit)
+    return [dict(zip(names, row)) for row in db.session.execute(query)]
+
+
+def rebuild_salary_aggregates_service() -> None:
+    """
+    Reload the in-process salary aggregates from the database.
+    """
+    rows = db.session.execute(select(Employee.country, Employee.job_title, Employee.salary))
+    get_aggregate_store().rebuild(rows)
+
+
+def _salary_aggregates() -> SalaryAggregateStore:
+    """Get the salary aggregate store, loading it from the database on first use"""
+    store = get_aggregate_store()
+    if not store.loaded:
+        rebuild_salary_aggregates_service()
+    return store
+
+
+def verify_salary_aggregates_service() -> List[Dict]:
+    """
+    Compare the in-process salary aggregates with live SQL aggregates.
+    
+    Returns:
+        List of mismatches, each with dimension, group, cached and actual
+        aggregates (None where a side has no such group). Empty if consistent.
+    """
+    cached = _salary_aggregates().snapshot()
+    return [
+        mismatch
+        for dimension in DIMENSIONS
+        for mismatch in _diff_salary_aggregates(dimension, cached[dimension], _live_salary_aggregates(dimension))
+    ]
+
+
+def _live_salary_aggregates(dimension: str, keys: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Count, sum, min and max per group of a dimension, aggregated from the employees table"""
+    column = getattr(Employee, dimension)
+    query = select(
+        column,
+        func.count(),
+        func.sum(Employee.salary),
+        func.min(Employee.salary),
+        func.max(Employee.salary)
+    ).group_by(column).order_by(column)
+    if keys is not None:
+        query = query.where(column.in_(keys))
+    return {
+        key: {'count': count, 'sum': float(total), 'min': float(minimum), 'max': float(maximum)}
+        for key, count, total, minimum, maximum in db.session.execute(query)
+    }
+
+
+def _diff_salary_aggregates(dimension: str, cached: Dict[str, Dict], actual: Dict[str, Dict]) -> List[Dict]:
+    """Groups whose stored aggregates are missing, extra or differ from the live ones"""
+    mismatches = []
+    for key in sorted(set(actual) | set(cached)):
+        expected, stored = actual.get(key), cached.get(key)
+        consistent = expected is not None and stored is not None and all(
+            math.isclose(expected[name], stored[name], rel_tol=1e-9) for name in expected
+        )
+        if not consistent:
+            mismatches.append({'dimension': dimension, 'group': key, 'cached': stored, 'actual': expected})
+    return mismatches
+
+
+def _salary_summary_maintained() -> bool:
+    """Whether salary_summary is kept up to date by triggers (SQLite only)"""
+    return db.engine.dialect.name == 'sqlite'
+
+
+def _salary_summary(dimension: str, keys: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Count, sum, min and max per group of a dimension from salary_summary.
+    
+    Every process reads the same table, so the result is coherent across
+    app processes. Backends without the triggers aggregate the employees
+    table instead.
+    """
+    if not _salary_summary_maintained():
+        return _live_salary_aggregates(dimension, keys)
+    query = select(
+        SalarySummary.group_key,
+        SalarySummary.employee_count,
+        SalarySummary.salary_sum,
+        SalarySummary.min_salary,
+        SalarySummary.max_salary
+    ).where(SalarySummary.dimension == dimension).order_by(SalarySummary.group_key)
+    if keys is not None:
+        query = query.where(SalarySummary.group_key.in_(keys))
+    return {
+        key: {'count': count, 'sum': total, 'min': minimum, 'max': maximum}
+        for key, count, total, minimum, maximum in db.session.execute(query)
+    }
+
+
+def ensure_salary_summary_service() -> bool:
+    """
+    Create and fill the salary summary if the database predates it.
+    
+    The summary is also rebuilt when its table exists but is empty while
+    there are employees (db.create_all() creates it empty on older databases).
+    
+    Returns:
+        True if the summary was rebuilt
+    """
+    if not _salary_summary_maintained():
+        return False
+    if inspect(db.engine).has_table(SalarySummary.__tablename__) and (
+        db.session.execute(select(exists().select_from(SalarySummary))).scalar()
+        or not db.session.execute(select(exists().select_from(Employee))).scalar()
+    ):
+        return False
+    rebuild_salary_summary_service()
+    return True
+
+
+def rebuild_salary_summary_service() -> None:
+    """
+    Create the salary summary table and its triggers if missing, and refill
+    it from the employees table in one transaction.
+    """
+    if not _salary_summary_maintained():
+        return
+    SalarySummary.__table__.create(db.session.connection(), checkfirst=True)
+    for statement in SALARY_SUMMARY_TRIGGER_DDL:
+        db.session.execute(text(statement))
+    db.session.execute(delete(SalarySummary))
+    for dimension in SALARY_SUMMARY_DIMENSIONS:
+        column = getattr(Employee, dimension)
+        db.session.execute(insert(SalarySummary).from_select(
+            ['dimension', 'group_key', 'employee_count', 'salary_sum', 'min_salary', 'max_salary'],
+            select(
+                literal(dimension),
+                column,
+                func.count(),
+                func.sum(Employee.salary),
+                func.min(Employee.salary),
+                func.max(Employee.salary)
+            ).group_by(column)
+        ))
+    db.session.commit()
+
+
+def verify_salary_summary_service() -> List[Dict]:
+    """
+    Compare salary_summary with live SQL aggregates.
+    
+    Returns:
+        List of mismatches, each with dimension, group, cached (summary) and
+        actual aggregates (None where a side has no such group). Empty if consistent.
+    """
+    if not _salary_summary_maintained():
+        return []
+    return [
+        mismatch
+        for dimension in SALARY_SUMMARY_DIMENSIONS
+        for mismatch in _diff_salary_aggregates(dimension, _salary_summary(dimension),
+                                                _live_salary_aggregates(dimension))
+    ]
+
+
+def _grouped_salary_metrics(*columns) -> List[Dict]:
+    """Run one GROUP BY over the given columns and format min/max/avg/count per group"""
+    rows = db.session.execute(
+        select(
+            *columns,
+            func.count().label('count'),
+            func.min(Employee.salary).label('min_salary'),
+            func.max(Employee.salary).label('max_salary'),
+            func.avg(Employee.salary).label('avg_salary')
+        ).group_by(*columns).order_by(*columns)
+    )
+    return [
+        {
+            **{column.key: row._mapping[column.key] for column in columns},
+            'count': row.count,
+            'minimum_salary': float(row.min_salary),
+            'maximum_salary': float(row.max_salary),
+            'average_salary': round(float(row.avg_salary), 2)
+        }
+        for row in rows
+    ]
+
+
+def _summary_salary_metrics(dimension: str) -> List[Dict]:
+    """Format min/max/avg/count per group of a dimension like _grouped_salary_metrics"""
+    return [
+        {
+            dimension: key,
+            'count': aggregates['count'],
+            'minimum_salary': float(aggregates['min']),
+            'maximum_salary': float(aggregates['max']),
+            'average_salary': round(aggregates['sum'] / aggregates['count'], 2)
+        }
+        for key, aggregates in _salary_summary(dimension).items()
+    ]
+
+
+def _columnar_salary_metrics(columns: Columns, names: Dict[str, np.ndarray], dimensions: Tuple[str, ...]) -> List[Dict]:
+    """Format min/max/avg/count per group of the analytics snapshot like _grouped_salary_metrics"""
+    return [
+        {
+            **dict(zip(dimensions, values)),
+            'count': count,
+            'minimum_salary': minimum,
+            'maximum_salary': maximum,
+            'average_salary': round(total / count, 2)
+        }
+        for values, count, total, minimum, maximum in group_aggregates(columns, names, dimensions)
+    ]
+
+
+def get_salary_metrics_summary(include_pairs: bool = False) -> Dict[str, List[Dict]]:
+    """
+    Get salary metrics (count, min, max, average) for every group at once.
+    
+    Countries and job titles are read from salary_summary; pairs are
+    computed with a single GROUP BY query. With the columnar engine every
+    grouping is a vectorized group-by over the analytics snapshot.
+    
+    Args:
+        include_pairs: Also return metrics per (country, job_title) pair
+        
+    Returns:
+        Dictionary with 'countries' and 'job_titles' lists, plus
+        'country_job_titles' when include_pairs is set
+    """
+    snapshot = _analytics_snapshot()
+    if snapshot is not None:
+        columns, names = snapshot.view()
+        summary = {
+            'countries': _columnar_salary_metrics(columns, names, ('country',)),
+            'job_titles': _columnar_salary_metrics(columns, names, ('job_title',))
+        }
+        if include_pairs:
+            summary['country_job_titles'] = _columnar_salary_metrics(columns, names, ('country', 'job_title'))
+        return summary
+    
+    summary = {
+        'countries': _summary_salary_metrics('country'),
+        'job_titles': _summary_salary_metrics('job_title')
+    }
+    if include_pairs:
+        summary['country_job_titles'] = _grouped_salary_metrics(Employee.country, Employee.job_title)
+    return summary
+
+
+def _salary_distribution(dimension: str, keys: List[str], exact: bool = False) -> Optional[Dict]:
+    """
+    Aggregate metrics plus median and percentiles for one or more groups of a dimension.
+    
+    Count, min, max and average come from salary_summary. Percentiles come
+    from this process's aggregate store. When the store disagrees with the
+    summary, another process has written to the groups since: they are
+    reloaded from the database once, so later reads are served from memory
+    again (and read exactly from the salary index if yet another write lands
+    during the reload). The columnar engine computes everything, percentiles
+    exactly, from the analytics snapshot.
+    """
+    qs = [percentile / 100 for percentile in SALARY_PERCENTILES]
+    snapshot = _analytics_snapshot()
+    if snapshot is not None:
+        return _columnar_salary_distribution(snapshot, dimension, keys, qs)
+    
+    groups = _salary_summary(dimension, list(dict.fromkeys(keys)))
+    if not groups:
+        return None
+    count = sum(group['count'] for group in groups.values())
+    
+    store = _salary_aggregates()
+    stats = store.combine(dimension, keys, qs, exact=exact)
+    if not _store_agrees(stats, groups):
+        _reload_salary_aggregates(dimension, list(dict.fromkeys(keys)))
+        stats = store.combine(dimension, keys, qs, exact=exact)
+        if not _store_agrees(stats, groups):
+            stats = _indexed_quantiles(dimension, list(groups), qs, count)
+    
+    return _format_salary_distribution(
+        count,
+        min(group['min'] for group in groups.values()),
+        max(group['max'] for group in groups.values()),
+        sum(group['sum'] for group in groups.values()),
+        stats,
+        qs
+    )
+
+
+def _store_agrees(stats: Optional[Dict], groups: Dict[str, Dict[str, float]]) -> bool:
+    """Whether combined aggregate store stats match the salary_summary rows of the same groups"""
+    return stats is not None and (
+        stats['count'] == sum(group['count'] for group in groups.values())
+        and stats['min'] == min(group['min'] for group in groups.values())
+        and stats['max'] == max(group['max'] for group in groups.values())
+        and math.isclose(stats['sum'], sum(group['sum'] for group in groups.values()))
+    )
+
+
+def _reload_salary_aggregates(dimension: str, keys: List[str]) -> None:
+    """Reload some groups of the aggregate store from the database (one indexed read of their salaries)"""
+    column = getattr(Employee, dimension)
+    rows = db.session.execute(select(column, Employee.salary).where(column.in_(keys)))
+    get_aggregate_store().reload(dimension, keys, rows)
+
+
+def _columnar_salary_distribution(snapshot: ColumnarSnapshot, dimension: str, keys: List[str],
+                                  qs: List[float]) -> Optional[Dict]:
+    """_salary_distribution over the analytics snapshot, exact (like exact_quantiles) from one partial sort"""
+    columns, _ = snapshot.view()
+    salaries = columns.salaries[np.isin(getattr(columns, dimension), snapshot.codes_of(dimension, keys))]
+    if not len(salaries):
+        return None
+    
+    last = len(salaries) - 1
+    ranks = {q: int(q * last) for q in qs}
+    middle = (last // 2, (last + 1) // 2)
+    ordered = np.partition(salaries, sorted({*ranks.values(), *middle}))
+    stats = {
+        'method': 'exact',
+        'median': float(ordered[middle[0]] + ordered[middle[1]]) / 2,
+        'quantiles': {q: float(ordered[rank]) for q, rank in ranks.items()}
+    }
+    return _format_salary_distribution(len(salaries), salaries.min(), salaries.max(), salaries.sum(), stats, qs)
+
+
+def _format_salary_distribution(count: int, minimum: float, maximum: float, total: float, stats: Dict,
+                                qs: List[float]) -> Dict:
+    """Format the metrics returned by _salary_distribution"""
+    return {
+        'count': count,
+        'minimum_salary': float(minimum),
+        'maximum_salary': float(maximum),
+        'average_salary': round(float(total) / count, 2),
+        'median_salary': round(stats['median'], 2),
+        'percentiles': {
+            f'p{percentile}': round(stats['quantiles'][q], 2)
+            for percentile, q in zip(SALARY_PERCENTILES, qs)
+        },
+        'quantile_method': stats['method']
+    }
+
+
+def _indexed_quantiles(dimension: str, keys: List[str], qs: List[float], count: int) -> Dict:
+    """
+    Exact median and quantiles of some groups (same rules as the columnar
+    engine: quantiles like exact_quantiles, the median averages the two middle
+    salaries of an even count), one ordered index read per distinct rank.
+    """
+    column = getattr(Employee, dimension)
+    last = count - 1
+    ranks = {q: int(q * last) for q in qs}
+    middle = (last // 2, (last + 1) // 2)
+    values = {}
+    for rank in sorted({*ranks.values(), *middle}):
+        values[rank] = float(db.session.execute(
+            select(Employee.salary).where(column.in_(keys)).order_by(Employee.salary).offset(rank).limit(1)
+        ).scalar())
+    return {
+        'method': 'exact',
+        'median': (values[middle[0]] + values[middle[1]]) / 2,
+        'quantiles': {q: values[rank] for q, rank in ranks.items()}
+    }
+
+
+def build_histogram_edges(lower: float, upper: float, bucket_count: int, scale: str = 'linear') -> List[float]:
+    """
+    Build evenly spaced histogram bucket edges between two salaries.
+    
+    Args:
+        lower: Lowest salary to cover
+        upper: Highest salary to cover
+        bucket_count: Number of buckets
+        scale: 'linear' for equal-width buckets, 'log' for equal-ratio buckets
+        
+    Returns:
+        List of bucket_count + 1 increasing edges
+    """
+    if scale == 'log':
+        # Log buckets cannot start at zero; begin at 1 or the lowest salary
+        lower = max(lower, 1.0)
+        upper = max(upper, lower * 2)
+        ratio = (upper / lower) ** (1 / bucket_count)
+        edges = [lower * ratio ** index for index in range(bucket_count)]
+    else:
+        upper = max(upper, lower + 1)
+        width = (upper - lower) / bucket_count
+        edges = [lower + width * index for index in range(bucket_count)]
+    return [round(edge, 2) for edge in edges] + [upper]
+
+
+def get_salary_histogram(edges: Optional[List[float]] = None, bucket_count: int = DEFAULT_HISTOGRAM_BUCKETS,
+                         scale: str = 'linear', country: Optional[str] = None,
+                         job_title: Optional[str] = None) -> Dict:
+    """
+    Get a salary histogram, counted in SQL with one bucketed GROUP BY (or
+    with one searchsorted over the analytics snapshot).
+    
+    Buckets are [edge_i, edge_i+1), except the last, which includes its upper
+    edge. Salaries outside the edges are counted as underflow / overflow.
+    
+    Args:
+        edges: Increasing bucket edges; built from the group's min and max
+            salary with bucket_count and scale when omitted
+        bucket_count: Number of buckets when edges are omitted
+        scale: 'linear' or 'log' when edges are omitted
+        country: Optional country filter
+        job_title: Optional job title filter
+        
+    Returns:
+        Dictionary with buckets (lower, upper, count), underflow, overflow and total
+    """
+    snapshot = _analytics_snapshot()
+    if snapshot is not None:
+        edges, counts = _columnar_histogram_counts(snapshot, edges, bucket_count, scale, country, job_title)
+    else:
+        edges, counts = _histogram_counts(edges, bucket_count, scale, country, job_title)
+    
+    last = len(edges) - 1
+    buckets = [
+        {'lower': edges[index], 'upper': edges[index + 1], 'count': counts.get(index, 0)}
+        for index in range(last)
+    ]
+    return {
+        'buckets': buckets,
+        'underflow': counts.get(-1, 0),
+        'overflow': counts.get(last, 0),
+        'total': sum(counts.values())
+    }
+
+
+def _histogram_counts(edges: Optional[List[float]], bucket_count: int, scale: str, country: Optional[str],
+                      job_title: Optional[str]) -> Tuple[List[float], Dict[int, int]]:
+    """Bucket edges and {bucket index: count}, with -1 for underflow and len(edges) - 1 for overflow"""
+    filters = _employee_filters(country, job_title)
+    if edges is None:
+        # Separate MIN and MAX queries each resolve to a single index seek
+        lower = db.session.execute(select(func.min(Employee.salary)).where(*filters)).scalar()
+        upper = db.session.execute(select(func.max(Employee.salary)).where(*filters)).scalar()
+        edges = build_histogram_edges(lower or 0.0, upper or 0.0, bucket_count, scale)
+    
+    last = len(edges) - 1
+    bucket = case(
+        *[(Employee.salary < edge, index - 1) for index, edge in enumerate(edges[:-1])],
+        (Employee.salary <= edges[-1], last - 1),
+        else_=last
+    ).label('bucket')
+    return edges, dict(db.session.execute(select(bucket, func.count()).where(*filters).group_by(bucket)).all())
+    
+
+def _columnar_histogram_counts(snapshot: ColumnarSnapshot, edges: Optional[List[float]], bucket_count: int,
+                               scale: str, country: Optional[str],
+                               job_title: Optional[str]) -> Tuple[List[float], Dict[int, int]]:
+    """_histogram_counts over the analytics snapshot"""
+    columns, _ = snapshot.view()
+    mask = filter_mask(snapshot, columns, country, job_title)
+    salaries = columns.salaries if mask is None else columns.salaries[mask]
+    if edges is None:
+        lower, upper = (float(salaries.min()), float(salaries.max())) if len(salaries) else (0.0, 0.0)
+        edges = build_histogram_edges(lower, upper, bucket_count, scale)
+    
+    last = len(edges) - 1
+    buckets = np.searchsorted(np.asarray(edges, dtype=np.float64), salaries, side='right') - 1
+    # The last bucket includes its upper edge
+    buckets[salaries == edges[-1]] = last - 1
+    counts = np.bincount(buckets + 1, minlength=last + 2)
+    return edges, {index - 1: int(count) for index, count in enumerate(counts.tolist()) if count}
+
+
+def get_salary_metrics_by_country(country: str, exact: bool = False) -> Optional[Dict[str, float]]:
     """
-    Get salary metrics (min, max, average) for a specific country.
+    Get salary metrics (min, max, average, median, percentiles) for a specific country.
+    
+    Percentiles are exact for small groups and sketch estimates within
+    QUANTILE_RELATIVE_ACCURACY otherwise; quantile_method says which.
     
     Args:
         country: The country name
+        exact: Always compute exact percentiles
         
     Returns:
-        Dictionary with country, minimum_salary, maximum_salary, and average_salary
+        Dictionary with country, minimum_salary, maximum_salary, average_salary,
+        median_salary, percentiles and quantile_method
         Returns None if no employees found for the country
     """
-    result = db.session.query(
-        func.min(Employee.salary).label('min_salary'),
-        func.max(Employee.salary).label('max_salary'),
-        func.avg(Employee.salary).label('avg_salary')
-    ).filter(Employee.country == country).first()
-    
-    if not result or result.min_salary is None:
+    metrics = _salary_distribution('country', [country], exact=exact)
+    if not metrics:
         return None
     
     return {
         'country': country,
-        'minimum_salary': float(result.min_salary),
-        'maximum_salary': float(result.max_salary),
-        'average_salary': round(float(result.avg_salary), 2)
+        'minimum_salary': metrics['minimum_salary'],
+        'maximum_salary': metrics['maximum_salary'],
+        'average_salary': metrics['average_salary'],
+        'median_salary': metrics['median_salary'],
+        'percentiles': metrics['percentiles'],
+        'quantile_method': metrics['quantile_method']
     }
 
 
-def get_average_salary_by_job_title(job_title: str) -> Optional[Dict[str, float]]:
+def get_average_salary_by_job_title(job_title: str, exact: bool = False) -> Optional[Dict[str, float]]:
     """
-    Get average salary for a specific job title.
+    Get average, median and percentile salaries for a specific job title.
     
     Args:
         job_title: The job title
+        exact: Always compute exact percentiles
         
     Returns:
-        Dictionary with job_title and average_salary
+        Dictionary with job_title, average_salary, median_salary, percentiles
+        and quantile_method
         Returns None if no employees found for the job title
     """
-    result = db.session.query(
-        func.avg(Employee.salary).label('avg_salary')
-    ).filter(Employee.job_title == job_title).first()
-    
-    if not result or result.avg_salary is None:
+    metrics = _salary_distribution('job_title', [job_title], exact=exact)
+    if not metrics:
         return None
     
     return {
         'job_title': job_title,
-        'average_salary': round(float(result.avg_salary), 2)
+        'average_salary': metrics['average_salary'],
+        'median_salary': metrics['median_salary'],
+        'percentiles': metrics['percentiles'],
+        'quantile_method': metrics['quantile_method']
     }
 
+
+def get_combined_salary_metrics(dimension: str, keys: List[str], exact: bool = False) -> Optional[Dict]:
+    """
+    Get salary metrics for several countries or job titles taken as one group.
+    
+    The per-group quantile sketches are merged, so percentiles of the combined
+    group cost the same as for a single group.
+    
+    Args:
+        dimension: 'country' or 'job_title'
+        keys: Group values to combine
+        exact: Always compute exact percentiles
+        
+    Returns:
+        Dictionary with the group values ('countries' or 'job_titles'), count,
+        minimum_salary, maximum_salary, average_salary, median_salary,
+        percentiles and quantile_method
+        Returns None if none of the groups has employees
+    """
+    metrics = _salary_distribution(dimension, keys, exact=exact)
+    if not metrics:
+        return None
+    
+    label = 'countries' if dimension == 'country' else 'job_titles'
+    return {label: keys, **metrics}
@@ -0,0 +1,112 @@
+"""Mergeable quantile sketch used for salary percentiles"""
+
+import math
+from collections import Counter
+from typing import Dict, Iterable
+
+
+class QuantileSketch:
+    """
+    DDSketch-style quantile sketch over non-negative values.
+    
+    Values are counted in logarithmic buckets: bucket i holds values in
+    (gamma^(i-1), gamma^i] where gamma = (1 + alpha) / (1 - alpha). Every
+    quantile is answered with the midpoint of its bucket, so for a true
+    rank-q value x the returned value v satisfies |v - x| <= alpha * x.
+    
+    Because the state is only bucket counters, the sketch supports removal
+    (employee updates and deletes) and two sketches merge by adding counts.
+    Memory grows with log(max / min) / alpha, not with the number of values.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Counter = Counter()
+        self.zero_count = 0
+        self.count = 0
+    
+    def add(self, value: float):
+        """Add one value"""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            self._buckets[self._key(value)] += 1
+    
+    def remove(self, value: float):
+        """Remove one previously added value"""
+        self.count -= 1
+        if value <= 0:
+            self.zero_count -= 1
+            return
+        key = self._key(value)
+        self._buckets[key] -= 1
+        if not self._buckets[key]:
+            del self._buckets[key]
+    
+    def merge(self, other: 'QuantileSketch'):
+        """Add the contents of another sketch with the same accuracy into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError('Cannot merge sketches with different relative accuracy')
+        self._buckets.update(other._buckets)
+        self.zero_count += other.zero_count
+        self.count += other.count
+    
+    def copy(self) -> 'QuantileSketch':
+        """Get an independent copy of the sketch"""
+        sketch = QuantileSketch(self.relative_accuracy)
+        sketch.merge(self)
+        return sketch
+    
+    def quantiles(self, qs: Iterable[float]) -> Dict[float, float]:
+        """
+        Estimate several quantiles in one pass over the buckets.
+        
+        Args:
+            qs: Quantiles between 0 and 1
+        
+        Returns:
+            Dictionary mapping each quantile to its estimate
+        """
+        if not self.count:
+            raise ValueError('Cannot compute quantiles of an empty sketch')
+        wanted = sorted(qs)
+        results = {}
+        ranks = iter((q, q * (self.count - 1)) for q in wanted)
+        q, rank = next(ranks)
+        seen = self.zero_count
+        try:
+            while seen > rank:
+                results[q] = 0.0
+                q, rank = next(ranks)
+            for key in sorted(self._buckets):
+                seen += self._buckets[key]
+                while seen > rank:
+                    results[q] = self._value(key)
+                    q, rank = next(ranks)
+        except StopIteration:
+            pass
+        return results
+    
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+    
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+
+def exact_quantiles(sorted_values, qs: Iterable[float]) -> Dict[float, float]:
+    """
+    Exact quantiles using the same rank rule as QuantileSketch.
+    
+    Args:
+        sorted_values: Values in ascending order
+        qs: Quantiles between 0 and 1
+    
+    Returns:
+        Dictionary mapping each quantile to the value at rank floor(q * (n - 1))
+    """
+    last = len(sorted_values) - 1
+    return {q: float(sorted_values[int(q * last)]) for q in qs}
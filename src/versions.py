@@ -0,0 +1,103 @@
+"""Data version tracking - monotonically increasing row versions that validate the employee cache"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from flask import current_app
+
+
+class DataVersionTracker:
+    """
+    Table version plus per-employee versions, behind the employee cache.
+    
+    With the employee change log (SQLite), versions are change log sequence
+    numbers: advance() catches the tracker up with the log, so writes by other
+    processes, the import CLI or raw SQL all move the versions. version is the
+    newest sequence seen and a row version is the sequence of the last change
+    to that employee (or the floor, for employees not changed since the
+    tracker started or since changes it never saw were purged). Catching up
+    costs a query, so it runs at most once per sync_interval seconds.
+    
+    Without a change log, bump() counts this process's writes only, so the
+    versions cannot prove that the data is current.
+    
+    A cache entry read at version v is current while the employee's row
+    version is at most v. The versions are local to the process; ETags are
+    read from the change log itself so that every process agrees on them.
+    """
+    
+    def __init__(self, sync_interval: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.version = 0
+        self.synced = False
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._synced_at = 0.0
+        self._floor = 0
+        self._lock = threading.Lock()
+        self._row_versions: Dict[int, int] = {}
+    
+    def bump(self, employee_ids: Iterable[int]):
+        """Record a committed write touching the given employees (backends without a change log)"""
+        with self._lock:
+            self.version += 1
+            for employee_id in employee_ids:
+                self._row_versions[employee_id] = self.version
+    
+    def sync_due(self) -> bool:
+        """Whether the change log should be read again (never read, or read over sync_interval ago)"""
+        return not self.synced or self._clock() - self._synced_at >= self.sync_interval
+    
+    def start(self, cursor: int):
+        """Start following the change log at a cursor (only changes after it move versions)"""
+        with self._lock:
+            if not self.synced:
+                self.version = self._floor = cursor
+                self.synced = True
+            self._synced_at = self._clock()
+    
+    def advance(self, cursor: int, changes: Iterable[Tuple[int, Optional[int]]]):
+        """
+        Apply change log rows read after a cursor.
+        
+        Args:
+            cursor: The version the rows were read after
+            changes: (seq, employee_id) per change; employee_id None means the
+                changes up to seq were purged unseen, which moves every row
+                version up to seq
+        """
+        changes = list(changes)
+        with self._lock:
+            self._synced_at = self._clock()
+            if not changes or cursor != self.version:
+                return  # nothing new, or another thread applied these changes already
+            purged = [seq for seq, employee_id in changes if employee_id is None]
+            if purged:
+                self._floor = max(purged)
+                self._row_versions = {
+                    employee_id: seq for employee_id, seq in self._row_versions.items() if seq > self._floor
+                }
+            for seq, employee_id in changes:
+                self._observe(employee_id, seq)
+            self.version = max(seq for seq, _ in changes)
+    
+    def observe(self, employee_id: int, seq: int):
+        """Record the last change of one employee read from the change log outside advance()"""
+        with self._lock:
+            self._observe(employee_id, seq)
+    
+    def _observe(self, employee_id: Optional[int], seq: int):
+        if employee_id is not None and seq > self._row_versions.get(employee_id, self._floor):
+            self._row_versions[employee_id] = seq
+    
+    def row_version(self, employee_id: int) -> int:
+        """Version of the last write to one employee"""
+        return self._row_versions.get(employee_id, self._floor)
+    
+    def read_version(self, employee_id: int) -> int:
+        """Version to record for an employee read from the database now"""
+        return max(self.version, self.row_version(employee_id))
+
+
+def get_version_tracker() -> DataVersionTracker:
+    """Get the data version tracker of the current application"""
+    return current_app.extensions['data_version']
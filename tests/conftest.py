@@ -0,0 +1,20 @@
+import pytest
+from app import create_app, db
+from config import TestingConfig
+
+
+@pytest.fixture
+def app():
+    """Create application for testing"""
+    app = create_app(TestingConfig)
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Create test client"""
+    return app.test_client()
@@ -0,0 +1,306 @@
+import pytest
+from sqlalchemy import event, text
+from app import db
+from aggregates import GroupAggregate, get_aggregate_store
+from constants import EXACT_QUANTILE_THRESHOLD, QUANTILE_RELATIVE_ACCURACY
+from services import (
+    rebuild_salary_aggregates_service,
+    verify_salary_aggregates_service,
+    verify_salary_summary_service
+)
+
+
+def test_group_aggregate_min_max_survive_deletes():
+    """Test min/max stay correct as the current extremes are removed"""
+    group = GroupAggregate()
+    for salary in [50.0, 10.0, 30.0, 10.0, 90.0]:
+        group.add(salary)
+    
+    group.remove(10.0)
+    assert (group.minimum, group.maximum) == (10.0, 90.0)
+    
+    group.remove(10.0)
+    group.remove(90.0)
+    assert (group.minimum, group.maximum) == (30.0, 50.0)
+    assert group.count == 2
+    assert group.total == 80.0
+
+
+def test_group_aggregate_compacts_removed_values():
+    """Test heaps do not keep growing under insert/delete churn"""
+    group = GroupAggregate()
+    for salary in range(1000):
+        group.add(float(salary))
+        group.remove(float(salary))
+    group.add(7.0)
+    
+    assert len(group._min_heap) < 100
+    assert (group.minimum, group.maximum) == (7.0, 7.0)
+
+
+def test_metrics_follow_updates_and_deletes(client):
+    """Test salary metrics stay correct through create, update and delete"""
+    ids = [
+        client.post('/api/employees', json={
+            'full_name': f'Employee {salary}',
+            'job_title': 'Developer',
+            'country': 'India',
+            'salary': salary
+        }).get_json()['id']
+        for salary in (80000, 100000, 120000)
+    ]
+    client.get('/api/salary-metrics?country=India')
+    
+    client.delete(f'/api/employees/{ids[2]}')
+    client.put(f'/api/employees/{ids[0]}', json={'salary': 60000})
+    client.put(f'/api/employees/{ids[1]}', json={'country': 'Canada'})
+    
+    india = client.get('/api/salary-metrics?country=India').get_json()
+    assert (india['minimum_salary'], india['maximum_salary'], india['average_salary']) == (60000, 60000, 60000)
+    canada = client.get('/api/salary-metrics?country=Canada').get_json()
+    assert canada['average_salary'] == 100000
+    developer = client.get('/api/salary-metrics?job_title=Developer').get_json()
+    assert developer['average_salary'] == 80000
+    assert verify_salary_aggregates_service() == []
+
+
+def test_metrics_reads_only_query_salary_summary(client):
+    """Test metrics are one salary_summary lookup plus the loaded aggregate store (and the ETag version check)"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 80000
+    })
+    rebuild_salary_aggregates_service()
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        response = client.get('/api/salary-metrics?country=India')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    
+    assert response.status_code == 200
+    statements = [statement for statement in statements if 'employee_changes' not in statement]
+    assert len(statements) == 1
+    assert 'FROM salary_summary' in statements[0]
+
+
+def test_verify_detects_drift(client):
+    """Test the consistency check reports groups that differ from SQL"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 80000
+    })
+    rebuild_salary_aggregates_service()
+    get_aggregate_store().add('India', 'Developer', 1.0)
+    
+    mismatches = verify_salary_aggregates_service()
+    
+    assert {(row['dimension'], row['group']) for row in mismatches} == {('country', 'India'), ('job_title', 'Developer')}
+    rebuild_salary_aggregates_service()
+    assert verify_salary_aggregates_service() == []
+
+
+def test_metrics_percentiles_exact_for_small_groups(client):
+    """Test small groups get exact median and percentiles"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {salary}', 'job_title': 'Developer', 'country': 'India', 'salary': salary}
+        for salary in (10000, 20000, 30000, 40000)
+    ])
+    
+    data = client.get('/api/salary-metrics?country=India').get_json()
+    
+    assert data['quantile_method'] == 'exact'
+    assert data['median_salary'] == 25000
+    assert data['percentiles'] == {'p50': 20000, 'p90': 30000, 'p99': 30000}
+
+
+def test_metrics_percentiles_from_sketch_for_large_groups(client):
+    """Test large groups use the sketch and stay within its error bound"""
+    salaries = [1000.0 + 10 * i for i in range(EXACT_QUANTILE_THRESHOLD + 500)]
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {i}', 'job_title': 'Clerk', 'country': 'India', 'salary': salary}
+        for i, salary in enumerate(salaries)
+    ])
+    
+    estimate = client.get('/api/salary-metrics?job_title=Clerk').get_json()
+    exact = client.get('/api/salary-metrics?job_title=Clerk&exact=true').get_json()
+    
+    assert estimate['quantile_method'] == 'sketch'
+    assert exact['quantile_method'] == 'exact'
+    for name in ('p50', 'p90', 'p99'):
+        assert estimate['percentiles'][name] == pytest.approx(exact['percentiles'][name], rel=QUANTILE_RELATIVE_ACCURACY)
+
+
+def test_metrics_for_combined_countries(client):
+    """Test repeating country combines the groups"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 80000},
+        {'full_name': 'John Smith', 'job_title': 'Developer', 'country': 'United States', 'salary': 120000},
+        {'full_name': 'Alice Brown', 'job_title': 'Designer', 'country': 'Canada', 'salary': 90000}
+    ])
+    
+    data = client.get('/api/salary-metrics?country=India&country=United States').get_json()
+    
+    assert data['countries'] == ['India', 'United States']
+    assert (data['count'], data['minimum_salary'], data['maximum_salary']) == (2, 80000, 120000)
+    assert data['median_salary'] == 100000
+
+
+def test_salary_summary_follows_writes(client):
+    """Test the triggers keep salary_summary equal to live aggregates through every kind of write"""
+    created = client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {salary}', 'job_title': title, 'country': country, 'salary': salary}
+        for salary, title, country in [(10000, 'Developer', 'India'), (20000, 'Manager', 'India'),
+                                       (30000, 'Developer', 'Canada'), (40000, 'Manager', 'Canada')]
+    ]).get_json()['created']
+    ids = [row['id'] for row in created]
+    
+    client.put(f'/api/employees/{ids[0]}', json={'salary': 50000})
+    client.put(f'/api/employees/{ids[3]}', json={'country': 'India'})
+    client.post('/api/employees/bulk-adjust', json={'country': 'India', 'percent': 10})
+    client.delete(f'/api/employees/{ids[2]}')
+    db.session.execute(text("DELETE FROM employees WHERE salary = 22000"))
+    db.session.commit()
+    
+    assert verify_salary_summary_service() == []
+    assert client.get('/api/salary-metrics?country=India').get_json()['minimum_salary'] == 44000
+    assert client.get('/api/salary-metrics/summary').get_json()['countries'] == [
+        {'country': 'India', 'count': 2, 'minimum_salary': 44000, 'maximum_salary': 55000, 'average_salary': 49500}
+    ]
+
+
+def test_salary_metrics_coherent_with_other_processes(client):
+    """Test writes made outside this process's aggregate store still show up in metrics"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 80000
+    })
+    rebuild_salary_aggregates_service()
+    # Another app process inserting directly into the shared database
+    db.session.execute(text(
+        "INSERT INTO employees (full_name, job_title, country, salary) VALUES "
+        "('Priya Sharma', 'Developer', 'India', 20000), ('Amit Shah', 'Developer', 'India', 50000)"
+    ))
+    db.session.commit()
+    
+    data = client.get('/api/salary-metrics?country=India').get_json()
+    
+    assert (data['minimum_salary'], data['average_salary'], data['median_salary']) == (20000, 50000, 50000)
+    assert data['quantile_method'] == 'exact'
+
+
+def _metrics_statements(client, url):
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        data = client.get(url).get_json()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    return data, [statement for statement in statements if 'employee_changes' not in statement]
+
+
+def test_store_catches_up_with_writes_by_other_processes(client):
+    """Test groups another process wrote to are reloaded once, then served from memory again"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 100
+    })
+    rebuild_salary_aggregates_service()
+    db.session.execute(text(
+        "INSERT INTO employees (full_name, job_title, country, salary) VALUES ('Priya Sharma', 'Developer', 'India', 200)"
+    ))
+    db.session.commit()
+    
+    data, statements = _metrics_statements(client, '/api/salary-metrics?country=India')
+    assert (data['median_salary'], data['quantile_method']) == (150, 'exact')
+    assert len(statements) == 2  # salary_summary, then the reload of the India group
+    data, statements = _metrics_statements(client, '/api/salary-metrics?country=India')
+    assert data['median_salary'] == 150
+    assert len(statements) == 1 and 'FROM salary_summary' in statements[0]
+    
+    # A salary change elsewhere leaves the count alone but is still caught
+    db.session.execute(text("UPDATE employees SET salary = 300 WHERE id = 2"))
+    db.session.commit()
+    assert client.get('/api/salary-metrics?country=India').get_json()['median_salary'] == 200
+    assert len(_metrics_statements(client, '/api/salary-metrics?country=India')[1]) == 1
+
+
+def test_indexed_median_matches_store_for_even_counts(client, monkeypatch):
+    """Test the median read from the salary index averages the two middle salaries, as the store does"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 100
+    })
+    rebuild_salary_aggregates_service()
+    db.session.execute(text(
+        "INSERT INTO employees (full_name, job_title, country, salary) VALUES ('Priya Sharma', 'Developer', 'India', 200)"
+    ))
+    db.session.commit()
+    # Another write landing during every reload leaves only the salary index
+    monkeypatch.setattr('services._reload_salary_aggregates', lambda dimension, keys: None)
+    
+    indexed = client.get('/api/salary-metrics?country=India').get_json()
+    rebuild_salary_aggregates_service()
+    rebuilt = client.get('/api/salary-metrics?country=India').get_json()
+    
+    assert indexed['median_salary'] == rebuilt['median_salary'] == 150
+    assert indexed['percentiles'] == rebuilt['percentiles']
+
+
+def test_store_rebuilds_after_writing_rows_created_elsewhere(client):
+    """Test updating and deleting rows written outside this process invalidates the store instead of failing"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 80000
+    })
+    rebuild_salary_aggregates_service()
+    # A new group, then a salary the existing group never held
+    db.session.execute(text(
+        "INSERT INTO employees (full_name, job_title, country, salary) VALUES ('Anna Schmidt', 'Developer', 'Germany', 70000)"
+    ))
+    db.session.commit()
+    assert client.put('/api/employees/2', json={'salary': 75000}).status_code == 200
+    assert not get_aggregate_store().loaded
+    
+    rebuild_salary_aggregates_service()
+    db.session.execute(text(
+        "INSERT INTO employees (full_name, job_title, country, salary) VALUES ('Priya Sharma', 'Developer', 'India', 20000)"
+    ))
+    db.session.commit()
+    assert client.delete('/api/employees/3').status_code in (200, 204)
+    assert not get_aggregate_store().loaded
+    
+    data = client.get('/api/salary-metrics?job_title=Developer').get_json()
+    assert (data['average_salary'], data['median_salary']) == (77500, 77500)
+    assert get_aggregate_store().get('country', 'Germany')['max'] == 75000
+    assert verify_salary_aggregates_service() == []
+
+
+def test_rebuild_salary_summary_repairs_drift(app, client):
+    """Test verification reports a drifted summary and a rebuild repairs it"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 80000
+    })
+    db.session.execute(text("UPDATE salary_summary SET employee_count = 5 WHERE group_key = 'India'"))
+    db.session.commit()
+    
+    assert [(row['dimension'], row['group']) for row in verify_salary_summary_service()] == [('country', 'India')]
+    runner = app.test_cli_runner()
+    assert runner.invoke(args=['verify-salary-summary']).exit_code == 1
+    assert runner.invoke(args=['rebuild-salary-summary']).exit_code == 0
+    assert runner.invoke(args=['verify-salary-summary']).exit_code == 0
+    assert verify_salary_summary_service() == []
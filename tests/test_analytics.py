@@ -0,0 +1,125 @@
+import json
+import random
+import numpy as np
+from app import create_app, db
+from analytics import ColumnarSnapshot, group_aggregates
+from services import get_employee_changes_service
+
+
+def _file_app(tmp_path, **config):
+    return create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'employees.db'}",
+        'PAYROLL_JOB_WORKERS': 0,
+        **config
+    })
+
+
+def _payroll(client, **filters):
+    response = client.post('/api/payroll/run', json=filters)
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def _reads(client):
+    return [
+        client.get('/api/salary-metrics/summary?include_pairs=true').get_json(),
+        client.get('/api/salary-metrics?country=India&country=Canada&exact=true').get_json(),
+        client.get('/api/salary-metrics?job_title=Manager&exact=true').get_json(),
+        client.get('/api/salary-metrics/histogram?buckets=7').get_json(),
+        client.get('/api/salary-metrics/histogram?edges=20000,50000,90000&country=India').get_json(),
+        _payroll(client),
+        _payroll(client, job_title='Developer', min_salary=40000)
+    ]
+
+
+def test_columnar_engine_matches_sql(tmp_path):
+    """Test every analytics read gives the SQL result, including after writes by another process"""
+    sql_app = _file_app(tmp_path)
+    columnar_app = _file_app(tmp_path, ANALYTICS_ENGINE='columnar')
+    with sql_app.app_context():
+        db.create_all()
+    sql, columnar = sql_app.test_client(), columnar_app.test_client()
+    generator = random.Random(7)
+    sql.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {index}', 'job_title': generator.choice(['Developer', 'Manager', 'Designer']),
+         'country': generator.choice(['India', 'United States', 'Canada']), 'salary': generator.randrange(10, 100) * 1000}
+        for index in range(300)
+    ])
+    
+    assert _reads(columnar) == _reads(sql)
+    
+    # Writes through the SQL app reach the columnar app through the change log
+    sql.put('/api/employees/5', json={'country': 'Germany', 'salary': 150000})
+    sql.delete('/api/employees/7')
+    sql.post('/api/employees/bulk-adjust', json={'country': 'India', 'percent': 10})
+    sql.post('/api/employees', json={'full_name': 'New', 'job_title': 'Manager', 'country': 'Canada', 'salary': 5000})
+    
+    assert _reads(columnar) == _reads(sql)
+    with columnar_app.app_context():
+        assert columnar_app.extensions['analytics_snapshot'].cursor == get_employee_changes_service(0, 1000)['next_cursor']
+
+
+def test_snapshot_applies_upserts_and_deletes():
+    """Test changes keep the rows ordered by ID and compact deleted rows"""
+    snapshot = ColumnarSnapshot()
+    snapshot.rebuild([([2, 4], [20.0, 40.0], ['India', 'Canada'], ['Developer', 'Manager'])], cursor=10)
+    
+    snapshot.apply([
+        (11, 3, ('Germany', 'Developer', 30.0)),  # new ID between existing rows
+        (12, 4, None),
+        (9, 2, None),  # at or before the cursor, skipped
+        (None, 1, ('India', 'Manager', 10.0))
+    ])
+    
+    columns, names = snapshot.view()
+    assert columns.ids.tolist() == [1, 2, 3]
+    assert columns.salaries.tolist() == [10.0, 20.0, 30.0]
+    assert names['country'][columns.country].tolist() == ['India', 'India', 'Germany']
+    assert snapshot.cursor == 12
+    assert group_aggregates(columns, names, ('country',)) == [
+        (('Germany',), 1, 30.0, 30.0, 30.0), (('India',), 2, 30.0, 10.0, 20.0)
+    ]
+    assert snapshot.stats()['dead_rows'] == 1
+    
+    snapshot.apply([(13, 1, None)])  # two dead rows of four are compacted
+    
+    assert snapshot.stats()['dead_rows'] == 0
+    assert snapshot.view()[0].ids.tolist() == [2, 3]
+
+
+def test_snapshot_saved_and_loaded_memory_mapped(tmp_path):
+    """Test a new process loads the saved snapshot and replays only the changes made since"""
+    path = str(tmp_path / 'snapshot')
+    app = _file_app(tmp_path)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {index}', 'job_title': 'Developer', 'country': 'India', 'salary': 1000 * (index + 1)}
+        for index in range(10)
+    ])
+    
+    result = app.test_cli_runner().invoke(args=['save-analytics-snapshot', '--path', path])
+    assert result.exit_code == 0, result.output
+    assert 'Saved 10 employees' in result.output
+    client.put('/api/employees/1', json={'salary': 50000})
+    
+    warm_app = _file_app(tmp_path, ANALYTICS_ENGINE='columnar', ANALYTICS_SNAPSHOT_PATH=path)
+    data = warm_app.test_client().get('/api/salary-metrics?country=India').get_json()
+    
+    assert (data['minimum_salary'], data['maximum_salary']) == (2000, 50000)
+    columns, _ = warm_app.extensions['analytics_snapshot'].view()
+    assert isinstance(columns.ids, np.memmap)
+
+
+def test_snapshot_follows_own_writes_without_change_log(app, client, monkeypatch):
+    """Test backends without the change log apply this process's writes directly"""
+    app.extensions['analytics_snapshot'] = ColumnarSnapshot()
+    monkeypatch.setattr('services.change_log_maintained_service', lambda: False)
+    client.post('/api/employees', json={'full_name': 'A', 'job_title': 'Developer', 'country': 'India', 'salary': 1000})
+    assert client.get('/api/salary-metrics?country=India').get_json()['average_salary'] == 1000
+    
+    client.put('/api/employees/1', json={'salary': 3000})
+    client.post('/api/employees', json={'full_name': 'B', 'job_title': 'Developer', 'country': 'India', 'salary': 2000})
+    
+    data = client.get('/api/salary-metrics?country=India').get_json()
+    assert (data['minimum_salary'], data['average_salary'], data['median_salary']) == (2000, 2500, 2500)
@@ -0,0 +1,135 @@
+import inspect
+import threading
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app import create_app, db
+from services import update_employee_service
+
+
+@pytest.fixture
+def async_app(tmp_path):
+    """App running the async views on a file database"""
+    app = create_app({
+        'TESTING': True,
+        'ASYNC_MODE': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'async.db'}",
+        'PAYROLL_JOB_WORKERS': 0
+    })
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def async_client(async_app):
+    """Test client for the async app"""
+    return async_app.test_client()
+
+
+def _create(client, name='John Doe', salary=100000):
+    response = client.post('/api/employees', json={
+        'full_name': name,
+        'job_title': 'Software Engineer',
+        'country': 'India',
+        'salary': salary
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+
+def test_async_mode_swaps_in_async_views(async_app):
+    """Test ASYNC_MODE serves the employee endpoints with coroutine views"""
+    for endpoint in ('employees.get_employee', 'employees.get_all_employees', 'salary.calculate_salary'):
+        assert inspect.iscoroutinefunction(async_app.view_functions[endpoint])
+
+
+def test_async_employee_crud(async_client):
+    """Test create, read, update, list and delete through the async views"""
+    employee_id = _create(async_client)
+    
+    response = async_client.get(f'/api/employees/{employee_id}')
+    assert response.status_code == 200
+    assert response.get_json()['full_name'] == 'John Doe'
+    
+    response = async_client.put(f'/api/employees/{employee_id}', json={'salary': 200000})
+    assert response.get_json()['salary'] == 200000
+    
+    response = async_client.get(f'/api/employees/{employee_id}/calculate-salary')
+    assert response.get_json() == {'gross_salary': 200000, 'tds': 20000, 'net_salary': 180000}
+    
+    response = async_client.get('/api/employees?limit=10&fields=id,salary')
+    assert response.get_json() == {'employees': [{'id': employee_id, 'salary': 200000}], 'next_after': None}
+    
+    response = async_client.get(f'/api/employees?ids={employee_id},999')
+    assert response.get_json()['missing'] == [999]
+    
+    assert async_client.delete(f'/api/employees/{employee_id}').status_code == 204
+    assert async_client.get(f'/api/employees/{employee_id}').status_code == 404
+
+
+def test_async_views_keep_conditional_get(async_client):
+    """Test async views issue the same ETags as the sync views and answer If-None-Match with 304"""
+    employee_id = _create(async_client)
+    
+    response = async_client.get(f'/api/employees/{employee_id}')
+    etag = response.headers['ETag']
+    response = async_client.get(f'/api/employees/{employee_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    
+    async_client.put(f'/api/employees/{employee_id}', json={'salary': 1})
+    response = async_client.get(f'/api/employees/{employee_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['salary'] == 1
+
+
+def test_async_engine_pools_connections_across_requests(async_app, async_client):
+    """Test one async engine per app, on the process-wide loop, whose pooled connection every request reuses"""
+    engine = async_app.extensions['async_engine']
+    assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+    connects = []
+    event.listen(engine.sync_engine, 'connect', lambda *args: connects.append(threading.current_thread().name))
+    
+    employee_id = _create(async_client)
+    for _ in range(5):
+        async_client.get(f'/api/employees/{employee_id}')
+        async_client.get('/api/employees?limit=5')
+    
+    assert async_app.extensions['async_engine'] is engine
+    assert connects == ['async-services']
+
+
+def test_async_views_serve_concurrent_requests(async_app):
+    """Test requests from many threads share the event loop and the pool"""
+    client = async_app.test_client()
+    ids = [_create(client, name=f'Employee {i}', salary=1000 + i) for i in range(20)]
+    errors = []
+    
+    def read(employee_id):
+        response = async_app.test_client().get(f'/api/employees/{employee_id}/calculate-salary')
+        if response.status_code != 200 or response.get_json()['gross_salary'] != 1000 + ids.index(employee_id):
+            errors.append(employee_id)
+    
+    threads = [threading.Thread(target=read, args=(employee_id,)) for employee_id in ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_sync_writes_invalidate_async_reads(async_app, async_client):
+    """Test the sync and async paths share the employee cache and its versions"""
+    employee_id = _create(async_client)
+    assert async_client.get(f'/api/employees/{employee_id}').get_json()['salary'] == 100000
+    
+    with async_app.app_context():
+        update_employee_service(employee_id, {'salary': 300000})
+    
+    assert async_client.get(f'/api/employees/{employee_id}').get_json()['salary'] == 300000
+
+
+def test_async_mode_rejects_in_memory_sqlite():
+    """Test ASYNC_MODE refuses a database the async engine could not share"""
+    with pytest.raises(ValueError, match='in-memory'):
+        create_app({'ASYNC_MODE': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
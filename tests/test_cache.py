@@ -0,0 +1,114 @@
+from sqlalchemy import event, text
+from app import create_app, db
+from cache import LRUCache, get_employee_cache
+from versions import DataVersionTracker
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test the cache evicts the least recently used entry when full"""
+    cache = LRUCache(maxsize=2)
+    cache.set(1, 'a')
+    cache.set(2, 'b')
+    cache.get(1)
+    cache.set(3, 'c')
+    
+    assert cache.get(2) is None
+    assert (cache.get(1), cache.get(3)) == ('a', 'c')
+    assert cache.stats()['evictions'] == 1
+
+
+def test_lru_cache_expires_entries_after_ttl():
+    """Test entries older than the TTL count as misses"""
+    now = [0.0]
+    cache = LRUCache(maxsize=10, ttl=5, clock=lambda: now[0])
+    cache.set(1, 'a')
+    
+    now[0] = 4.0
+    assert cache.get(1) == 'a'
+    now[0] = 6.0
+    assert cache.get(1) is None
+    
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 1, 1)
+
+
+def test_employee_lookups_hit_cache_and_writes_invalidate(client):
+    """Test repeated lookups are served from cache and writes invalidate exactly"""
+    employee_id = client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 100000
+    }).get_json()['id']
+    
+    client.get(f'/api/employees/{employee_id}')
+    client.get(f'/api/employees/{employee_id}')
+    assert client.get(f'/api/employees/{employee_id}/calculate-salary').get_json()['net_salary'] == 90000
+    stats = client.get('/api/employees/cache-stats').get_json()
+    assert (stats['hits'], stats['misses'], stats['size']) == (2, 1, 1)
+    
+    client.put(f'/api/employees/{employee_id}', json={'salary': 200000})
+    assert get_employee_cache().stats()['size'] == 0
+    assert client.get(f'/api/employees/{employee_id}').get_json()['salary'] == 200000
+    assert client.get(f'/api/employees/{employee_id}/calculate-salary').get_json()['net_salary'] == 180000
+    
+    client.delete(f'/api/employees/{employee_id}')
+    assert client.get(f'/api/employees/{employee_id}').status_code == 404
+    assert client.get(f'/api/employees/{employee_id}/calculate-salary').status_code == 404
+
+
+def _statements(app, request):
+    statements = []
+    capture = lambda conn, cursor, statement, *args: statements.append(statement)
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            request()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+    return statements
+
+
+def test_cached_employees_invalidated_by_other_processes(tmp_path):
+    """Test cache entries are not served once the change log shows another process changed the employee"""
+    config = {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'employees.db'}", 'PAYROLL_JOB_WORKERS': 0}
+    reader, writer = create_app(config), create_app(config)
+    now = [0.0]
+    reader.extensions['data_version'] = DataVersionTracker(sync_interval=0.5, clock=lambda: now[0])
+    with writer.app_context():
+        db.create_all()
+    reader_client, writer_client = reader.test_client(), writer.test_client()
+    writer_client.post('/api/employees/bulk', json=[
+        {'full_name': name, 'job_title': 'Developer', 'country': 'India', 'salary': 100000} for name in ('A', 'B')
+    ])
+    assert reader_client.get('/api/employees/1').get_json()['salary'] == 100000
+    assert reader_client.post('/api/employees/calculate-salary', json={'ids': [1, 2]}).status_code == 200
+    
+    writer_client.put('/api/employees/1', json={'salary': 200000})
+    with writer.app_context():
+        db.session.execute(text("UPDATE employees SET salary = 300000 WHERE id = 2"))
+        db.session.commit()
+    
+    # The ETag check reads employee 1's last change, so its entry is refreshed at once
+    assert reader_client.get('/api/employees/1').get_json()['salary'] == 200000
+    # Batch lookups catch up with the change log once the sync interval has passed
+    now[0] += 1
+    salaries = reader_client.post('/api/employees/calculate-salary', json={'ids': [1, 2]}).get_json()['salaries']
+    assert [row['gross_salary'] for row in salaries] == [200000, 300000]
+
+
+def test_cache_hits_within_sync_interval_skip_the_change_log(tmp_path):
+    """Test a cache hit costs no more SQL than the ETag check, and batch hits none at all"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'employees.db'}", 'PAYROLL_JOB_WORKERS': 0})
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post('/api/employees', json={'full_name': 'A', 'job_title': 'Developer', 'country': 'India', 'salary': 1})
+    client.get('/api/employees/1')
+    client.post('/api/employees/calculate-salary', json={'ids': [1]})
+    
+    for url in ('/api/employees/1', '/api/employees/1/calculate-salary'):
+        statements = _statements(app, lambda: client.get(url))
+        assert len(statements) == 1 and 'employee_changes' in statements[0]
+    assert _statements(app, lambda: client.post('/api/employees/calculate-salary', json={'ids': [1]})) == []
+    assert app.extensions['employee_cache'].stats()['hits'] >= 3
@@ -0,0 +1,93 @@
+from sqlalchemy import text
+from app import db
+from services import compact_change_log_service
+
+
+def _changes(client, since, limit=100):
+    return client.get(f'/api/employees/changes?since={since}&limit={limit}')
+
+
+def test_change_feed_replays_writes_in_order(client):
+    """Test every write path appears in the feed in commit order"""
+    created = client.post('/api/employees', json={
+        'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 80000
+    }).get_json()
+    client.post('/api/employees/bulk', json=[
+        {'full_name': 'John Smith', 'job_title': 'Manager', 'country': 'United States', 'salary': 120000}
+    ])
+    client.put(f"/api/employees/{created['id']}", json={'salary': 90000})
+    client.put(f"/api/employees/{created['id']}", json={'salary': 90000})  # no-op, not logged
+    client.post('/api/employees/bulk-adjust', json={'country': 'United States', 'percent': 10})
+    client.delete(f"/api/employees/{created['id']}")
+    
+    page = _changes(client, 0).get_json()
+    
+    assert [(change['op'], change['employee_id']) for change in page['changes']] == [
+        ('insert', 1), ('insert', 2), ('update', 1), ('update', 2), ('delete', 1)
+    ]
+    assert page['changes'][2]['employee'] == {
+        'id': 1, 'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 90000
+    }
+    assert page['changes'][3]['employee']['salary'] == 132000
+    assert page['changes'][4]['employee'] is None
+    assert (page['next_cursor'], page['has_more']) == (page['changes'][-1]['cursor'], False)
+
+
+def test_change_feed_pages_with_cursor(client):
+    """Test the next cursor continues where the previous page stopped"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {index}', 'job_title': 'Developer', 'country': 'India', 'salary': 1000}
+        for index in range(5)
+    ])
+    
+    first = _changes(client, 0, limit=3).get_json()
+    second = _changes(client, first['next_cursor'], limit=3).get_json()
+    
+    assert [change['employee_id'] for change in first['changes']] == [1, 2, 3]
+    assert first['has_more'] is True
+    assert [change['employee_id'] for change in second['changes']] == [4, 5]
+    assert second['has_more'] is False
+    assert _changes(client, 'latest').get_json() == {'changes': [], 'next_cursor': 5, 'has_more': False}
+    assert _changes(client, 'abc').status_code == 400
+    assert _changes(client, 0, limit=0).status_code == 400
+
+
+def test_compaction_keeps_latest_change_per_employee(app, client):
+    """Test compaction drops superseded changes and readers still converge on current rows"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {index}', 'job_title': 'Developer', 'country': 'India', 'salary': 1000}
+        for index in range(3)
+    ])
+    for salary in (2000, 3000, 4000):
+        client.put('/api/employees/1', json={'salary': salary})
+    client.delete('/api/employees/2')
+    
+    result = app.test_cli_runner().invoke(args=['compact-change-log'])
+    
+    assert result.exit_code == 0
+    assert 'Compacted 4 superseded and expired 0' in result.output
+    page = _changes(client, 0).get_json()
+    assert [(change['op'], change['employee_id']) for change in page['changes']] == [
+        ('insert', 3), ('update', 1), ('delete', 2)
+    ]
+    assert page['changes'][1]['employee']['salary'] == 4000
+
+
+def test_retention_expires_old_cursors(client):
+    """Test changes past retention are dropped and cursors before them get 410"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {index}', 'job_title': 'Developer', 'country': 'India', 'salary': 1000}
+        for index in range(3)
+    ])
+    db.session.execute(text("UPDATE employee_changes SET changed_at = '2000-01-01 00:00:00' WHERE seq <= 2"))
+    db.session.commit()
+    client.put('/api/employees/1', json={'salary': 2000})
+    
+    result = compact_change_log_service(retention_days=30)
+    
+    assert result == {'compacted': 1, 'expired': 1, 'purged_through': 2}
+    assert _changes(client, 0).status_code == 410
+    assert _changes(client, 1).status_code == 410
+    page = _changes(client, 2).get_json()
+    assert [(change['op'], change['employee_id']) for change in page['changes']] == [('insert', 3), ('update', 1)]
+    assert _changes(client, 'latest').get_json()['next_cursor'] == 4
@@ -0,0 +1,50 @@
+from sqlalchemy import text
+from app import create_app, db
+from config import TestingConfig
+from database import engine_options, sqlite_pragmas
+
+
+def test_sqlite_connections_get_configured_pragmas(tmp_path):
+    """Test new SQLite connections run in WAL mode with the configured pragmas"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'employees.db'}"})
+    with app.app_context():
+        pragma = lambda name: db.session.execute(text(f'PRAGMA {name}')).scalar()
+        assert pragma('journal_mode') == 'wal'
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('busy_timeout') == app.config['SQLITE_BUSY_TIMEOUT']
+        assert pragma('cache_size') == app.config['SQLITE_CACHE_SIZE']
+
+
+def test_create_app_accepts_config_objects_and_names():
+    """Test create_app takes a config object or its name"""
+    assert create_app(TestingConfig).config['SQLALCHEMY_DATABASE_URI'] == 'sqlite:///:memory:'
+    assert create_app('testing').config['TESTING'] is True
+
+
+def test_create_app_reads_database_url_from_environment(monkeypatch):
+    """Test FLASK_-prefixed environment variables override the defaults"""
+    monkeypatch.setenv('FLASK_SQLALCHEMY_DATABASE_URI', 'sqlite:///:memory:')
+    monkeypatch.setenv('FLASK_SQLITE_BUSY_TIMEOUT', '1234')
+    app = create_app()
+    assert app.config['SQLALCHEMY_DATABASE_URI'] == 'sqlite:///:memory:'
+    assert sqlite_pragmas(app.config)['busy_timeout'] == 1234
+
+
+def test_engine_options_pool_settings_only_for_server_databases():
+    """Test pool settings apply to server databases and explicit options win"""
+    config = {
+        'DB_POOL_SIZE': 5, 'DB_MAX_OVERFLOW': 7, 'DB_POOL_TIMEOUT': 3,
+        'DB_POOL_RECYCLE': 60, 'DB_POOL_PRE_PING': True
+    }
+    sqlite = engine_options({**config, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///employees.db'})
+    assert sqlite == {}
+    
+    postgres = engine_options({
+        **config,
+        'SQLALCHEMY_DATABASE_URI': 'postgresql://user@db/employees',
+        'SQLALCHEMY_ENGINE_OPTIONS': {'pool_size': 20}
+    })
+    assert postgres == {
+        'pool_size': 20, 'max_overflow': 7, 'pool_timeout': 3,
+        'pool_recycle': 60, 'pool_pre_ping': True
+    }
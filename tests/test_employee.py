@@ -1,25 +1,13 @@
+import csv
+import io
+import json
+import sqlite3
 import pytest
+from sqlalchemy import event, text
 from app import create_app, db
 from models import Employee
-
-
-@pytest.fixture
-def app():
-    """Create application for testing"""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.drop_all()
-
-
-@pytest.fixture
-def client(app):
-    """Create test client"""
-    return app.test_client()
+from services import compact_change_log_service
+from constants import ID_LOOKUP_CHUNK_SIZE
 
 
 def test_create_employee(client):
@@ -40,6 +28,49 @@ def test_create_employee(client):
     assert 'id' in data
 
 
+def test_create_employees_bulk(client):
+    """Test creating many employees in one request"""
+    response = client.post('/api/employees/bulk', json=[
+        {'full_name': 'Asha Rao', 'job_title': 'Developer', 'country': 'India', 'salary': 70000},
+        {'full_name': 'Missing Salary', 'job_title': 'Developer', 'country': 'India'},
+        {'full_name': 'Tom Hardy', 'job_title': 'Designer', 'country': 'Canada', 'salary': 85000},
+        {'full_name': 'Negative Pay', 'job_title': 'Designer', 'country': 'Canada', 'salary': -1}
+    ])
+    
+    assert response.status_code == 201
+    data = response.get_json()
+    assert [row['index'] for row in data['created']] == [0, 2]
+    assert data['errors'] == [
+        {'index': 1, 'error': 'Missing required fields'},
+        {'index': 3, 'error': 'Salary must be a positive number'}
+    ]
+    
+    # Verify the returned ids point at the right rows
+    get_response = client.get(f"/api/employees/{data['created'][1]['id']}")
+    assert get_response.get_json()['full_name'] == 'Tom Hardy'
+
+
+def test_create_employees_bulk_in_chunks(app):
+    """Test bulk creation across several insert chunks keeps ids in order"""
+    from services import create_employees_bulk_service
+    
+    rows = [
+        {'full_name': f'Employee {i}', 'job_title': 'Clerk', 'country': 'India', 'salary': 1000.0 + i}
+        for i in range(7)
+    ]
+    ids = create_employees_bulk_service(rows, chunk_size=3)
+    
+    assert len(ids) == 7
+    assert [db.session.get(Employee, employee_id).salary for employee_id in ids] == [row['salary'] for row in rows]
+
+
+def test_create_employees_bulk_invalid_payload(client):
+    """Test bulk creation rejects payloads that are not a list"""
+    response = client.post('/api/employees/bulk', json={'full_name': 'Not A List'})
+    
+    assert response.status_code == 400
+
+
 def test_get_employee(client):
     """Test retrieving an employee by ID"""
     # First create an employee
@@ -85,6 +116,159 @@ def test_get_all_employees(client):
     assert len(data) == 2
 
 
+def test_get_employees_keyset_pagination(client):
+    """Test paging through employees with limit/after cursors"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {i}', 'job_title': 'Clerk', 'country': 'India', 'salary': 1000 + i}
+        for i in range(5)
+    ])
+    
+    first = client.get('/api/employees?limit=2').get_json()
+    assert [emp['full_name'] for emp in first['employees']] == ['Employee 0', 'Employee 1']
+    
+    second = client.get(f"/api/employees?limit=2&after={first['next_after']}").get_json()
+    assert [emp['full_name'] for emp in second['employees']] == ['Employee 2', 'Employee 3']
+    
+    last = client.get(f"/api/employees?limit=2&after={second['next_after']}").get_json()
+    assert [emp['full_name'] for emp in last['employees']] == ['Employee 4']
+    assert last['next_after'] is None
+
+
+def test_get_employees_field_projection(client):
+    """Test returning only the requested fields"""
+    client.post('/api/employees', json={
+        'full_name': 'Alice Johnson',
+        'job_title': 'Designer',
+        'country': 'Canada',
+        'salary': 90000
+    })
+    
+    response = client.get('/api/employees?fields=full_name,salary')
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    assert set(data[0]) == {'id', 'full_name', 'salary'}
+    assert data[0]['salary'] == 90000
+
+
+@pytest.mark.parametrize("query", ['limit=0', 'limit=abc', 'after=x', 'fields=password'])
+def test_get_employees_invalid_parameters(client, query):
+    """Test invalid pagination and projection parameters"""
+    response = client.get(f'/api/employees?{query}')
+    
+    assert response.status_code == 400
+
+
+def test_get_employees_filters(client):
+    """Test filtering employees by country, job title and salary range"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 80000},
+        {'full_name': 'Priya Sharma', 'job_title': 'Manager', 'country': 'India', 'salary': 120000},
+        {'full_name': 'John Smith', 'job_title': 'Developer', 'country': 'United States', 'salary': 110000}
+    ])
+    
+    by_country = client.get('/api/employees?country=India').get_json()
+    assert [emp['full_name'] for emp in by_country] == ['Raj Kumar', 'Priya Sharma']
+    
+    by_title = client.get('/api/employees?job_title=Developer&min_salary=90000').get_json()
+    assert [emp['full_name'] for emp in by_title] == ['John Smith']
+    
+    by_range = client.get('/api/employees?min_salary=80000&max_salary=110000').get_json()
+    assert [emp['full_name'] for emp in by_range] == ['Raj Kumar', 'John Smith']
+    
+    assert client.get('/api/employees?min_salary=lots').status_code == 400
+
+
+@pytest.mark.parametrize("url", [
+    '/api/employees?country=India',
+    '/api/employees?job_title=Developer&limit=10',
+    '/api/employees?country=India&min_salary=1000&max_salary=5000',
+    '/api/employees?min_salary=1000&max_salary=5000'
+])
+def test_filtered_queries_use_indexes(client, url):
+    """Test filtered reads and aggregates never fall back to a full table scan"""
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        # Skip the ETag's change log version check (a rowid range read)
+        if statement.lstrip().upper().startswith('SELECT') and 'employee_changes' not in statement:
+            statements.append((statement, parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        client.get(url)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    
+    assert statements
+    for statement, parameters in statements:
+        plan = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+        details = ' | '.join(row[-1] for row in plan)
+        assert 'SCAN employees' not in details, details
+        assert 'USING' in details and 'INDEX' in details, details
+
+
+def test_export_employees_ndjson(client):
+    """Test streaming export as NDJSON with net salary"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 100000},
+        {'full_name': 'Alice Brown', 'job_title': 'Designer', 'country': 'Canada', 'salary': 90000}
+    ])
+    
+    response = client.get('/api/employees/export?format=ndjson&include=net_salary')
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['full_name'] for row in rows] == ['Raj Kumar', 'Alice Brown']
+    assert rows[0]['tds'] == 10000
+    assert rows[0]['net_salary'] == 90000
+    assert rows[1]['net_salary'] == 90000
+
+
+def test_export_employees_csv(client):
+    """Test streaming export as CSV"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 100000
+    })
+    
+    response = client.get('/api/employees/export?format=csv')
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 1
+    assert rows[0]['full_name'] == 'Raj Kumar'
+    assert float(rows[0]['salary']) == 100000
+
+
+def test_export_employees_invalid_format(client):
+    """Test export rejects unknown formats"""
+    response = client.get('/api/employees/export?format=xml')
+    
+    assert response.status_code == 400
+
+
+def test_export_employees_empty_format_defaults_to_ndjson(client):
+    """Test an empty format parameter falls back to NDJSON"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 100000
+    })
+    
+    response = client.get('/api/employees/export?format=')
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=employees.ndjson'
+    assert json.loads(response.get_data(as_text=True))['full_name'] == 'Raj Kumar'
+
+
 def test_update_employee(client):
     """Test updating an employee"""
     # Create an employee
@@ -302,3 +486,410 @@ def test_average_salary_by_job_title_no_employees(client):
     
     assert response.status_code == 404
 
+
+
+def test_salary_metrics_summary(client):
+    """Test metrics for every country and job title in one call"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 80000},
+        {'full_name': 'Priya Sharma', 'job_title': 'Manager', 'country': 'India', 'salary': 120000},
+        {'full_name': 'John Smith', 'job_title': 'Developer', 'country': 'United States', 'salary': 110000}
+    ])
+    
+    response = client.get('/api/salary-metrics/summary?include_pairs=true')
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['countries'] == [
+        {'country': 'India', 'count': 2, 'minimum_salary': 80000, 'maximum_salary': 120000, 'average_salary': 100000},
+        {'country': 'United States', 'count': 1, 'minimum_salary': 110000, 'maximum_salary': 110000,
+         'average_salary': 110000}
+    ]
+    assert [(row['job_title'], row['count']) for row in data['job_titles']] == [('Developer', 2), ('Manager', 1)]
+    assert [(row['country'], row['job_title']) for row in data['country_job_titles']] == [
+        ('India', 'Developer'), ('India', 'Manager'), ('United States', 'Developer')
+    ]
+
+
+def test_salary_metrics_summary_without_pairs(client):
+    """Test the summary omits country x job title pairs unless requested"""
+    response = client.get('/api/salary-metrics/summary')
+    
+    assert response.status_code == 200
+    assert response.get_json() == {'countries': [], 'job_titles': []}
+
+
+def test_salary_histogram_with_edges(client):
+    """Test histogram counts with explicit bucket edges"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {salary}', 'job_title': 'Developer', 'country': 'India', 'salary': salary}
+        for salary in (5000, 20000, 40000, 50000, 90000, 100000, 250000)
+    ])
+    
+    response = client.get('/api/salary-metrics/histogram?country=India&edges=10000,50000,100000')
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['country'] == 'India'
+    assert data['buckets'] == [
+        {'lower': 10000, 'upper': 50000, 'count': 2},
+        {'lower': 50000, 'upper': 100000, 'count': 3}
+    ]
+    assert (data['underflow'], data['overflow'], data['total']) == (1, 1, 7)
+
+
+def test_salary_histogram_log_scale(client):
+    """Test log-scale buckets cover the group's whole salary range"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {salary}', 'job_title': 'Developer', 'country': 'India', 'salary': salary}
+        for salary in (1000, 10000, 100000, 1000000)
+    ])
+    
+    data = client.get('/api/salary-metrics/histogram?scale=log&buckets=3').get_json()
+    
+    assert [bucket['lower'] for bucket in data['buckets']] == pytest.approx([1000, 10000, 100000])
+    assert [bucket['count'] for bucket in data['buckets']] == [1, 1, 2]
+    assert (data['underflow'], data['overflow']) == (0, 0)
+
+
+@pytest.mark.parametrize("query", ['edges=5,1', 'edges=a,b', 'edges=nan,1,2', 'edges=0,inf', 'edges=-inf,0',
+                                   'buckets=0', 'scale=cubic'])
+def test_salary_histogram_invalid_parameters(client, query):
+    """Test invalid histogram parameters"""
+    response = client.get(f'/api/salary-metrics/histogram?{query}')
+    
+    assert response.status_code == 400
+
+
+def test_get_employee_conditional_get(client):
+    """Test single-employee ETags answer If-None-Match with 304 until the row changes"""
+    employee_id = client.post('/api/employees', json={
+        'full_name': 'Jane Smith',
+        'job_title': 'Product Manager',
+        'country': 'United States',
+        'salary': 120000
+    }).get_json()['id']
+    other_id = client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 80000
+    }).get_json()['id']
+    
+    first = client.get(f'/api/employees/{employee_id}')
+    etag = first.headers['ETag']
+    
+    cached = client.get(f'/api/employees/{employee_id}', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.get_data() == b''
+    
+    # Writes to other employees keep the row ETag valid
+    client.put(f'/api/employees/{other_id}', json={'salary': 85000})
+    assert client.get(f'/api/employees/{employee_id}', headers={'If-None-Match': etag}).status_code == 304
+    
+    client.put(f'/api/employees/{employee_id}', json={'salary': 130000})
+    changed = client.get(f'/api/employees/{employee_id}', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.get_json()['salary'] == 130000
+    assert changed.headers['ETag'] != etag
+
+
+def test_list_and_metrics_conditional_get(client):
+    """Test list and metrics ETags change with every write"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 80000
+    })
+    
+    for url in ('/api/employees', '/api/salary-metrics?country=India'):
+        etag = client.get(url).headers['ETag']
+        assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+    
+    list_etag = client.get('/api/employees').headers['ETag']
+    client.post('/api/employees', json={
+        'full_name': 'Priya Sharma',
+        'job_title': 'Manager',
+        'country': 'India',
+        'salary': 120000
+    })
+    response = client.get('/api/employees', headers={'If-None-Match': list_etag})
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+
+
+def test_conditional_get_sees_writes_from_other_processes(tmp_path):
+    """Test ETags follow writes made by another app process, raw SQL and change log purges"""
+    config = {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'employees.db'}"}
+    reader, writer = create_app(config), create_app(config)
+    with writer.app_context():
+        db.create_all()
+    reader_client, writer_client = reader.test_client(), writer.test_client()
+    writer_client.post('/api/employees', json={
+        'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 80000
+    })
+    list_etag = reader_client.get('/api/employees').headers['ETag']
+    row_etag = reader_client.get('/api/employees/1').headers['ETag']
+    
+    writer_client.put('/api/employees/1', json={'salary': 90000})
+    
+    response = reader_client.get('/api/employees/1', headers={'If-None-Match': row_etag})
+    assert (response.status_code, response.get_json()['salary']) == (200, 90000)
+    assert reader_client.get('/api/employees', headers={'If-None-Match': list_etag}).status_code == 200
+    
+    row_etag = response.headers['ETag']
+    with writer.app_context():
+        db.session.execute(text("UPDATE employees SET salary = 95000 WHERE id = 1"))
+        db.session.commit()
+        # Purge the logged change before the reader has seen it
+        compact_change_log_service(retention_days=-1)
+    response = reader_client.get('/api/employees/1', headers={'If-None-Match': row_etag})
+    assert (response.status_code, response.get_json()['salary']) == (200, 95000)
+
+
+def test_etags_shared_between_app_processes(tmp_path):
+    """Test a tag issued by one app process is accepted by another serving the same database"""
+    config = {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'employees.db'}"}
+    first, second = create_app(config), create_app(config)
+    with first.app_context():
+        db.create_all()
+    first_client, second_client = first.test_client(), second.test_client()
+    first_client.post('/api/employees', json={
+        'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 80000
+    })
+    
+    for url in ('/api/employees', '/api/employees/1', '/api/employees/1/calculate-salary',
+                '/api/salary-metrics?country=India'):
+        etag = first_client.get(url).headers['ETag']
+        assert second_client.get(url).headers['ETag'] == etag
+        assert second_client.get(url, headers={'If-None-Match': etag}).status_code == 304
+    
+    # A restarted process still accepts tags issued before the restart
+    etag = first_client.get('/api/employees/1').headers['ETag']
+    restarted = create_app(config).test_client()
+    assert restarted.get('/api/employees/1', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_conditional_get_disabled_without_change_log(client, monkeypatch):
+    """Test no ETag is issued when writes by other processes cannot be detected"""
+    monkeypatch.setattr('services.change_log_maintained_service', lambda: False)
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 80000
+    })
+    
+    for url in ('/api/employees', '/api/employees/1'):
+        response = client.get(url, headers={'If-None-Match': '*'})
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+
+
+def test_conditional_get_skips_database(client):
+    """Test a 304 answer runs no SQL besides the change log version check"""
+    client.post('/api/employees', json={
+        'full_name': 'Raj Kumar',
+        'job_title': 'Developer',
+        'country': 'India',
+        'salary': 80000
+    })
+    etag = client.get('/api/employees').headers['ETag']
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        response = client.get('/api/employees', headers={'If-None-Match': etag})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    
+    assert response.status_code == 304
+    assert len(statements) == 1 and 'employee_changes' in statements[0]
+
+
+def test_bulk_adjust_salaries_by_percent(client):
+    """Test a percentage raise updates only the matching group"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': 'A', 'job_title': 'Engineer', 'country': 'India', 'salary': 1000},
+        {'full_name': 'B', 'job_title': 'Engineer', 'country': 'India', 'salary': 2000},
+        {'full_name': 'C', 'job_title': 'Engineer', 'country': 'United States', 'salary': 3000}
+    ])
+    
+    response = client.post('/api/employees/bulk-adjust', json={'country': 'India', 'percent': 10})
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'affected': 2, 'total_before': 3000, 'total_after': 3300, 'delta': 300,
+        'min_salary_after': 1100, 'max_salary_after': 2200, 'dry_run': False, 'applied': True
+    }
+    salaries = [employee['salary'] for employee in client.get('/api/employees').get_json()]
+    assert salaries == [1100, 2200, 3000]
+
+
+def test_bulk_adjust_salaries_keeps_cache_metrics_and_etags_consistent(client):
+    """Test cached employees, metrics and ETags reflect a bulk adjustment"""
+    client.post('/api/employees', json={
+        'full_name': 'A', 'job_title': 'Engineer', 'country': 'India', 'salary': 1000
+    })
+    employee_etag = client.get('/api/employees/1').headers['ETag']
+    assert client.get('/api/salary-metrics?country=India').get_json()['average_salary'] == 1000
+    
+    client.post('/api/employees/bulk-adjust', json={'job_title': 'Engineer', 'amount': 500})
+    
+    response = client.get('/api/employees/1', headers={'If-None-Match': employee_etag})
+    assert response.status_code == 200
+    assert response.get_json()['salary'] == 1500
+    assert client.get('/api/employees/1/calculate-salary').get_json()['gross_salary'] == 1500
+    assert client.get('/api/salary-metrics?country=India').get_json()['average_salary'] == 1500
+
+
+def test_bulk_adjust_salaries_dry_run_does_not_write(client):
+    """Test a dry run reports the impact without changing salaries"""
+    client.post('/api/employees', json={
+        'full_name': 'A', 'job_title': 'Engineer', 'country': 'India', 'salary': 1000
+    })
+    
+    response = client.post('/api/employees/bulk-adjust', json={'percent': -5, 'dry_run': True})
+    assert response.get_json()['total_after'] == 950
+    assert response.get_json()['applied'] is False
+    assert client.get('/api/employees/1').get_json()['salary'] == 1000
+
+
+def test_bulk_adjust_salaries_holds_the_write_lock_while_reading(tmp_path):
+    """Test no other connection can commit between the impact reads and the UPDATE of a bulk adjustment"""
+    path = tmp_path / 'employees.db'
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'PAYROLL_JOB_WORKERS': 0})
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post('/api/employees/bulk', json=[
+        {'full_name': name, 'job_title': 'Engineer', 'country': 'India', 'salary': 1000} for name in ('A', 'B')
+    ])
+    other = sqlite3.connect(path, timeout=0)
+    attempts = []
+    
+    def write_from_other_connection(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith('SELECT') and 'FROM employees' in statement:
+            try:
+                other.execute("UPDATE employees SET salary = 5000 WHERE id = 2")
+                other.commit()
+                attempts.append('committed')
+            except sqlite3.OperationalError:
+                attempts.append('locked')
+    
+    with app.app_context():
+        event.listen(db.engine, 'after_cursor_execute', write_from_other_connection)
+        try:
+            response = client.post('/api/employees/bulk-adjust', json={'country': 'India', 'percent': 10})
+        finally:
+            event.remove(db.engine, 'after_cursor_execute', write_from_other_connection)
+    
+    assert response.status_code == 200
+    assert attempts and set(attempts) == {'locked'}
+    other.execute("UPDATE employees SET salary = 5000 WHERE id = 2")
+    other.commit()
+    other.close()
+    data = client.get('/api/salary-metrics?country=India').get_json()
+    assert (data['minimum_salary'], data['maximum_salary'], data['median_salary']) == (1100, 5000, 3050)
+
+
+def test_bulk_adjust_salaries_validation(client):
+    """Test bulk adjustments reject bad input and negative results"""
+    client.post('/api/employees', json={
+        'full_name': 'A', 'job_title': 'Engineer', 'country': 'India', 'salary': 1000
+    })
+    
+    assert client.post('/api/employees/bulk-adjust', json={'country': 'India'}).status_code == 400
+    assert client.post('/api/employees/bulk-adjust', json={'percent': 5, 'amount': 5}).status_code == 400
+    assert client.post('/api/employees/bulk-adjust', json={'percent': '5'}).status_code == 400
+    assert client.post('/api/employees/bulk-adjust', json={'percent': 5, 'department': 'HR'}).status_code == 400
+    
+    response = client.post('/api/employees/bulk-adjust', json={'amount': -2000})
+    assert response.status_code == 400
+    assert client.get('/api/employees/1').get_json()['salary'] == 1000
+
+
+def test_get_employees_by_ids(client):
+    """Test batch lookup returns employees in request order and reports missing ids"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': name, 'job_title': 'Engineer', 'country': 'India', 'salary': 1000}
+        for name in ('A', 'B', 'C')
+    ])
+    client.get('/api/employees/2')  # cached entry served alongside database reads
+    
+    response = client.get('/api/employees?ids=3,99,2,3&fields=full_name')
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'employees': [{'id': 3, 'full_name': 'C'}, {'id': 2, 'full_name': 'B'}],
+        'missing': [99]
+    }
+
+
+def test_get_employees_by_ids_validation(client):
+    """Test batch lookup rejects bad id lists and other list parameters"""
+    assert client.get('/api/employees?ids=1,x').status_code == 400
+    assert client.get('/api/employees?ids=').status_code == 400
+    assert client.get('/api/employees?ids=1&limit=5').status_code == 400
+    too_many = ','.join(str(i) for i in range(1, 1100))
+    assert client.get(f'/api/employees?ids={too_many}').status_code == 400
+
+
+@pytest.mark.parametrize('method, url, body, status_code', [
+    ('get', '/api/employees?ids=99999999999999999999', None, 400),
+    ('get', f'/api/employees?ids={2 ** 63}&fields=salary', None, 400),
+    ('get', '/api/employees?limit=5&after=99999999999999999999', None, 400),
+    ('get', f'/api/employees?limit=5&after={-2 ** 64}', None, 400),
+    ('post', '/api/employees/calculate-salary', f'{{"ids": [{2 ** 70}]}}', 400),
+    ('get', f'/api/employees/changes?since={2 ** 63}', None, 400),
+    ('get', f'/api/payroll/jobs/1/payslips?after={2 ** 64}', None, 400),
+    ('get', '/api/employees/99999999999999999999', None, 404),
+    ('put', '/api/employees/99999999999999999999', '{"salary": 1}', 404),
+    ('delete', '/api/employees/99999999999999999999', None, 404),
+    ('get', f'/api/employees/{2 ** 63}/calculate-salary', None, 404),
+    ('get', f'/api/payroll/jobs/{2 ** 64}', None, 404)
+])
+def test_ids_beyond_64_bits_rejected(client, method, url, body, status_code):
+    """Test IDs and cursors too large for an INTEGER column are client errors, not overflows"""
+    response = getattr(client, method)(url, data=body, content_type='application/json')
+    
+    assert response.status_code == status_code
+
+
+def test_get_employees_by_ids_chunks_large_lists(app, client):
+    """Test large id lists are read with one IN query per chunk"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'E{i}', 'job_title': 'Engineer', 'country': 'India', 'salary': 1000}
+        for i in range(ID_LOOKUP_CHUNK_SIZE + 10)
+    ])
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        ids = ','.join(str(i) for i in range(1, ID_LOOKUP_CHUNK_SIZE + 11))
+        employees = client.get(f'/api/employees?ids={ids}').get_json()['employees']
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    
+    assert len(employees) == ID_LOOKUP_CHUNK_SIZE + 10
+    assert len([statement for statement in statements if statement.startswith('SELECT') and 'FROM employees' in statement]) == 2
+
+
+def test_calculate_salaries_for_many_employees(client):
+    """Test batch net salary calculation matches the single-employee endpoint"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': 'A', 'job_title': 'Engineer', 'country': 'India', 'salary': 1234.55},
+        {'full_name': 'B', 'job_title': 'Engineer', 'country': 'United States', 'salary': 2000},
+        {'full_name': 'C', 'job_title': 'Engineer', 'country': 'Germany', 'salary': 3000}
+    ])
+    
+    response = client.post('/api/employees/calculate-salary', json={'ids': [2, 1, 42, 3]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['missing'] == [42]
+    assert [row['id'] for row in body['salaries']] == [2, 1, 3]
+    for row in body['salaries']:
+        single = client.get(f"/api/employees/{row['id']}/calculate-salary").get_json()
+        assert {key: row[key] for key in single} == single
+    
+    assert client.post('/api/employees/calculate-salary', json={'ids': [1, True]}).status_code == 400
+    assert client.post('/api/employees/calculate-salary', json=[1, 2]).status_code == 400
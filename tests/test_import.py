@@ -0,0 +1,60 @@
+import cli
+from app import db
+from models import Employee, ImportCheckpoint
+
+
+def _write_csv(tmp_path, rows):
+    path = tmp_path / 'employees.csv'
+    lines = ['full_name,job_title,country,salary'] + [','.join(map(str, row)) for row in rows]
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+def test_import_employees_validates_and_commits_in_chunks(app, tmp_path):
+    """Test the CSV import inserts valid rows and reports invalid ones"""
+    path = _write_csv(tmp_path, [
+        ('Raj Kumar', 'Developer', 'India', 80000),
+        ('No Salary', 'Developer', 'India', ''),
+        ('Alice Brown', 'Designer', 'Canada', 90000.5),
+        ('Bad Salary', 'Designer', 'Canada', 'lots'),
+        ('John Smith', 'Manager', 'United States', 120000)
+    ])
+    
+    result = app.test_cli_runner().invoke(args=['import-employees', path, '--chunk-size', '2'])
+    
+    assert result.exit_code == 0, result.output
+    assert 'Row 2: Missing required fields' in result.output
+    assert 'Row 4: Salary must be a positive number' in result.output
+    assert 'Imported employees.csv: 3 created, 2 invalid' in result.output
+    assert [emp.salary for emp in Employee.query.order_by(Employee.id)] == [80000, 90000.5, 120000]
+    
+    again = app.test_cli_runner().invoke(args=['import-employees', path])
+    assert 'already imported' in again.output
+    assert Employee.query.count() == 3
+
+
+def test_import_employees_resumes_after_crash(app, tmp_path, monkeypatch):
+    """Test a crashed import resumes after the last committed chunk"""
+    path = _write_csv(tmp_path, [(f'Employee {i}', 'Clerk', 'India', 1000 + i) for i in range(7)])
+    original = cli.import_employees_chunk_service
+    calls = []
+    
+    def crash_on_third_chunk(*args):
+        calls.append(args)
+        if len(calls) == 3:
+            raise RuntimeError('worker killed')
+        return original(*args)
+    
+    monkeypatch.setattr(cli, 'import_employees_chunk_service', crash_on_third_chunk)
+    crashed = app.test_cli_runner().invoke(args=['import-employees', path, '--chunk-size', '2'])
+    assert isinstance(crashed.exception, RuntimeError)
+    db.session.rollback()
+    assert Employee.query.count() == 4
+    
+    monkeypatch.setattr(cli, 'import_employees_chunk_service', original)
+    resumed = app.test_cli_runner().invoke(args=['import-employees', path, '--chunk-size', '2'])
+    
+    assert resumed.exit_code == 0, resumed.output
+    assert 'Resuming employees.csv after row 4' in resumed.output
+    assert [emp.full_name for emp in Employee.query.order_by(Employee.id)] == [f'Employee {i}' for i in range(7)]
+    assert ImportCheckpoint.query.one().employees_created == 7
@@ -0,0 +1,64 @@
+import logging
+from app import create_app
+from instrumentation import Histogram
+
+
+def _metric_value(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(' ', 1)[1])
+    raise AssertionError(f'{line_prefix} not found in metrics')
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test histogram buckets are cumulative and end with +Inf"""
+    histogram = Histogram('latency', 'Latency.', ('endpoint',), (0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(('a',), value)
+    
+    assert histogram.render()[2:] == [
+        'latency_bucket{endpoint="a",le="0.1"} 1',
+        'latency_bucket{endpoint="a",le="1.0"} 3',
+        'latency_bucket{endpoint="a",le="+Inf"} 4',
+        'latency_sum{endpoint="a"} 6.05',
+        'latency_count{endpoint="a"} 4'
+    ]
+
+
+def test_metrics_endpoint_reports_latency_and_sql_per_endpoint(client):
+    """Test /metrics exposes request counts and SQL statements per endpoint"""
+    client.post('/api/employees', json={
+        'full_name': 'John Doe', 'job_title': 'Engineer', 'country': 'India', 'salary': 1000
+    })
+    client.get('/api/employees?limit=10')
+    client.get('/api/employees?limit=10&after=1')
+    
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    
+    labels = 'method="GET",endpoint="employees.get_all_employees",status="200"'
+    assert _metric_value(text, f'http_request_duration_seconds_count{{{labels}}}') == 2
+    assert _metric_value(text, 'http_request_sql_queries_count{endpoint="employees.get_all_employees"}') == 2
+    # Each list request is one version check for the ETag plus one page query
+    assert _metric_value(text, 'http_request_sql_queries_sum{endpoint="employees.get_all_employees"}') == 4
+    assert _metric_value(text, 'http_request_sql_queries_sum{endpoint="employees.create_employee"}') >= 1
+
+
+def test_slow_requests_are_logged_with_their_sql(app, client, caplog):
+    """Test requests over the threshold are logged together with the SQL they ran"""
+    app.config['SLOW_REQUEST_THRESHOLD_MS'] = 1e-6
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        client.get('/api/employees?limit=5')
+    
+    messages = [record.getMessage() for record in caplog.records]
+    assert any('Slow request GET /api/employees?limit=5 -> 200' in message and 'SELECT' in message
+               for message in messages)
+
+
+def test_metrics_can_be_disabled():
+    """Test METRICS_ENABLED=False removes the endpoint and the hooks"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'METRICS_ENABLED': False})
+    assert 'request_metrics' not in app.extensions
+    assert app.test_client().get('/metrics').status_code == 404
@@ -0,0 +1,148 @@
+import json
+import random
+import numpy as np
+import pytest
+import services
+from app import create_app, db
+from payroll import compute_payroll, payroll_rows
+from services import calculate_net_salary
+from tax import get_tax_rules
+
+
+def test_vectorized_payroll_matches_calculate_net_salary(app):
+    """Test the batch engine gives exactly the same values as the per-employee function"""
+    rng = random.Random(7)
+    countries = [rng.choice(['India', 'United States', 'Canada']) for _ in range(5000)]
+    salaries = np.array([round(rng.uniform(1000, 500000), 2) for _ in range(5000)])
+    
+    tds, net = compute_payroll(salaries, countries, get_tax_rules())
+    rows = payroll_rows(np.arange(5000), salaries, tds, net, countries)
+    
+    for row, salary, country in zip(rows, salaries.tolist(), countries):
+        expected = calculate_net_salary(salary, country)
+        assert (row['gross_salary'], row['tds'], row['net_salary']) == \
+            (expected['gross_salary'], expected['tds'], expected['net_salary'])
+
+
+def test_payroll_run_streams_rows_and_totals(client):
+    """Test the payroll run streams one line per employee and totals per country"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 100000},
+        {'full_name': 'Priya Sharma', 'job_title': 'Manager', 'country': 'India', 'salary': 50000},
+        {'full_name': 'John Smith', 'job_title': 'Manager', 'country': 'United States', 'salary': 120000},
+        {'full_name': 'Alice Brown', 'job_title': 'Designer', 'country': 'Canada', 'salary': 90000}
+    ])
+    
+    response = client.post('/api/payroll/run')
+    
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['net_salary'] for line in lines[:-1]] == [90000, 45000, 105600, 90000]
+    assert lines[-1]['employee_count'] == 4
+    assert lines[-1]['totals']['India'] == {
+        'employee_count': 2, 'gross_salary': 150000, 'tds': 15000, 'net_salary': 135000
+    }
+    assert lines[-1]['totals']['Canada']['tds'] == 0
+
+
+def test_payroll_run_with_filters(client):
+    """Test payroll runs can be limited with filters"""
+    client.post('/api/employees/bulk', json=[
+        {'full_name': 'Raj Kumar', 'job_title': 'Developer', 'country': 'India', 'salary': 100000},
+        {'full_name': 'John Smith', 'job_title': 'Manager', 'country': 'United States', 'salary': 120000}
+    ])
+    
+    response = client.post('/api/payroll/run', json={'job_title': 'Manager', 'min_salary': 1000})
+    
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['id'] for line in lines[:-1]] == [2]
+    assert list(lines[-1]['totals']) == ['United States']
+    assert client.post('/api/payroll/run', json={'department': 'HR'}).status_code == 400
+
+
+@pytest.mark.parametrize('body', [
+    '{"min_salary": true}',
+    '{"max_salary": "1000"}',
+    '{"min_salary": Infinity}',
+    '{"max_salary": NaN}',
+    '{"country": ["India"]}',
+    '{"job_title": {"name": "Manager"}}',
+    '{"country": 1}'
+])
+def test_payroll_rejects_invalid_filters(client, body):
+    """Test payroll runs and jobs reject filters of the wrong type with 400"""
+    for url in ('/api/payroll/run', '/api/payroll/jobs'):
+        response = client.post(url, data=body, content_type='application/json')
+        assert response.status_code == 400
+        assert 'must be a' in response.get_json()['error']
+
+
+def _add_employees(client, count):
+    client.post('/api/employees/bulk', json=[
+        {'full_name': f'Employee {index}', 'job_title': 'Developer',
+         'country': ('India', 'United States', 'Canada')[index % 3], 'salary': 10000 + index * 1000}
+        for index in range(count)
+    ])
+
+
+def test_payroll_job_stores_payslips(client):
+    """Test a payroll job computes every partition and stores one payslip per employee"""
+    _add_employees(client, 5)
+    
+    response = client.post('/api/payroll/jobs', json={'min_salary': 11000})
+    
+    assert response.status_code == 202
+    job = response.get_json()
+    assert (job['status'], job['progress'], job['payslips']) == ('completed', 1.0, 4)
+    page = client.get(f"/api/payroll/jobs/{job['id']}/payslips?limit=3").get_json()
+    assert [payslip['employee_id'] for payslip in page['payslips']] == [2, 3, 4]
+    assert page['payslips'][0] == {'employee_id': 2, **calculate_net_salary(11000, 'United States'),
+                                   'country': 'United States'}
+    rest = client.get(f"/api/payroll/jobs/{job['id']}/payslips?after={page['next_after']}").get_json()
+    assert [payslip['employee_id'] for payslip in rest['payslips']] == [5]
+    assert client.get('/api/payroll/jobs/99').status_code == 404
+    assert client.post('/api/payroll/jobs', json={'department': 'HR'}).status_code == 400
+
+
+def test_payroll_job_resumes_after_failure(client, monkeypatch):
+    """Test a failed job restarts from the partitions that did not complete"""
+    _add_employees(client, 10)
+    calls = []
+    
+    def fail_on_third_partition(salaries, countries, rules):
+        calls.append(len(salaries))
+        if len(calls) == 3:
+            raise RuntimeError('worker crashed')
+        return compute_payroll(salaries, countries, rules)
+    
+    monkeypatch.setattr(services, 'compute_payroll', fail_on_third_partition)
+    job_id = services.create_payroll_job_service({}, partition_size=3)
+    
+    job = client.get(f'/api/payroll/jobs/{job_id}').get_json()
+    assert job['status'] == 'failed'
+    assert 'worker crashed' in job['error']
+    assert (job['partitions'], job['payslips']) == ({'total': 4, 'completed': 2}, 6)
+    
+    calls.clear()
+    response = client.post(f'/api/payroll/jobs/{job_id}/resume')
+    
+    assert response.status_code == 202
+    assert (response.get_json()['status'], response.get_json()['payslips']) == ('completed', 10)
+    assert calls == [3, 1]
+    assert client.post(f'/api/payroll/jobs/{job_id}/resume').status_code == 409
+
+
+def test_payroll_job_runs_on_worker_threads(tmp_path):
+    """Test partitions run on the job runner's thread pool"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'employees.db'}",
+                      'PAYROLL_JOB_WORKERS': 3})
+    with app.app_context():
+        db.create_all()
+        _add_employees(app.test_client(), 50)
+        
+        job_id = services.create_payroll_job_service({'country': 'India'}, partition_size=7)
+        app.extensions['job_runner'].shutdown(wait=True)
+        
+        job = services.get_payroll_job_service(job_id)
+        assert (job['status'], job['active'], job['payslips']) == ('completed', False, 17)
+        assert job['partitions'] == {'total': 7, 'completed': 7}
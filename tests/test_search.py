@@ -0,0 +1,73 @@
+from sqlalchemy import text
+from app import db
+from services import rebuild_search_index_service
+
+
+def _create(client, *names, country='India'):
+    client.post('/api/employees/bulk', json=[
+        {'full_name': name, 'job_title': 'Engineer', 'country': country, 'salary': 1000}
+        for name in names
+    ])
+
+
+def _names(response):
+    return [employee['full_name'] for employee in response.get_json()['employees']]
+
+
+def test_search_matches_word_prefixes(client):
+    """Test every query word matches the start of a name word, ignoring case and accents"""
+    _create(client, 'John Smith', 'Jöhn Doe', 'Mary Smithers', 'Ann Lee')
+    
+    assert sorted(_names(client.get('/api/employees/search?q=jo'))) == ['John Smith', 'Jöhn Doe']
+    assert _names(client.get('/api/employees/search?q=SMITH jo')) == ['John Smith']
+    assert _names(client.get('/api/employees/search?q=mith')) == []
+
+
+def test_search_ranks_and_filters(client):
+    """Test search ranks closer matches first and applies country / job title filters"""
+    _create(client, 'Lee Ann Marie Smith', 'Ann Lee')
+    _create(client, 'Ann Lee', country='Germany')
+    
+    assert _names(client.get('/api/employees/search?q=ann lee&country=India')) == ['Ann Lee', 'Lee Ann Marie Smith']
+    response = client.get('/api/employees/search?q=ann&country=Germany&limit=1')
+    assert [employee['country'] for employee in response.get_json()['employees']] == ['Germany']
+
+
+def test_search_ranks_every_match(client):
+    """Test the best match is found even behind thousands of weaker matches with lower IDs"""
+    _create(client, *(f'Ann Marie Lee Smith {index}' for index in range(2500)))
+    _create(client, 'Ann Lee')
+    
+    assert _names(client.get('/api/employees/search?q=ann lee&limit=1')) == ['Ann Lee']
+
+
+def test_search_index_follows_updates_and_deletes(client):
+    """Test renamed and deleted employees are reindexed by the triggers"""
+    _create(client, 'John Smith', 'Mary Jones')
+    client.put('/api/employees/1', json={'full_name': 'Johanna Smith'})
+    client.delete('/api/employees/2')
+    
+    assert _names(client.get('/api/employees/search?q=johanna')) == ['Johanna Smith']
+    assert _names(client.get('/api/employees/search?q=john')) == []
+    assert _names(client.get('/api/employees/search?q=mary')) == []
+
+
+def test_search_validation(client):
+    """Test search rejects empty queries and bad limits, and quotes FTS syntax"""
+    assert client.get('/api/employees/search').status_code == 400
+    assert client.get('/api/employees/search?q=%22*').status_code == 400
+    assert client.get('/api/employees/search?q=a&limit=500').status_code == 400
+    assert client.get('/api/employees/search?q=NEAR(a OR "b').status_code == 200
+
+
+def test_rebuild_search_index_indexes_existing_rows(app, client):
+    """Test rebuilding the index covers rows written without the triggers"""
+    _create(client, 'John Smith')
+    db.session.execute(text('DROP TABLE employees_fts'))
+    db.session.commit()
+    
+    rebuild_search_index_service()
+    assert _names(client.get('/api/employees/search?q=smith')) == ['John Smith']
+    
+    result = app.test_cli_runner().invoke(args=['rebuild-search-index'])
+    assert 'Rebuilt the employee search index' in result.output
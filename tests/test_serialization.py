@@ -0,0 +1,54 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from flask.json.provider import DefaultJSONProvider
+from app import create_app, db
+from serialization import FastJSONProvider, ndjson_chunks, resolve_encoder
+
+
+SAMPLE = {'salary': 1500.5, 'id': 1, 'full_name': 'Zoë', 'tags': [1, None, True], 'joined': datetime(2024, 1, 2)}
+
+
+@pytest.mark.parametrize('encoder', ['orjson', 'json'])
+def test_fast_provider_matches_default_provider(app, encoder):
+    """Test responses decode to the same data, with sorted keys and Flask's date format"""
+    fast = FastJSONProvider(app, encoder)
+    default = DefaultJSONProvider(app)
+    
+    body = fast.response(SAMPLE).get_data()
+    assert body.endswith(b'\n')
+    assert json.loads(body) == json.loads(default.response(SAMPLE).get_data())
+    assert list(json.loads(body)) == sorted(SAMPLE)
+    assert json.loads(fast.dumps({'amount': Decimal('1.5')})) == {'amount': '1.5'}
+
+
+@pytest.mark.parametrize('encoder', ['orjson', 'json'])
+def test_ndjson_chunks_keep_row_order_and_keys(app, encoder):
+    """Test NDJSON output has one object per line in row key order"""
+    provider = FastJSONProvider(app, encoder)
+    rows = [{'id': i, 'country': 'India'} for i in range(5)]
+    
+    chunks = list(ndjson_chunks(provider, rows, chunk_size=2))
+    assert len(chunks) == 3
+    assert b''.join(chunks).decode().splitlines() == [f'{{"id":{i},"country":"India"}}' for i in range(5)]
+
+
+def test_resolve_encoder_rejects_unknown_names():
+    """Test unknown JSON_ENCODER values fail at startup"""
+    assert resolve_encoder('auto') in ('orjson', 'json')
+    with pytest.raises(ValueError):
+        resolve_encoder('ujson')
+
+
+def test_app_serves_json_with_stdlib_encoder():
+    """Test JSON_ENCODER=json keeps the API working without orjson"""
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'JSON_ENCODER': 'json'})
+    assert app.json.encoder == 'json'
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+        client.post('/api/employees', json={
+            'full_name': 'John Doe', 'job_title': 'Engineer', 'country': 'India', 'salary': 1000
+        })
+        assert client.get('/api/employees').get_json()[0]['full_name'] == 'John Doe'
@@ -0,0 +1,51 @@
+import random
+import pytest
+from sketches import QuantileSketch, exact_quantiles
+
+
+def _skewed_salaries(count, seed):
+    rng = random.Random(seed)
+    return [round(rng.lognormvariate(11, 0.6), 2) for _ in range(count)]
+
+
+def test_quantiles_within_relative_error():
+    """Test sketch estimates stay within the documented relative error"""
+    values = _skewed_salaries(20000, seed=1)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+    
+    qs = [0.5, 0.9, 0.99]
+    estimates = sketch.quantiles(qs)
+    expected = exact_quantiles(sorted(values), qs)
+    
+    for q in qs:
+        assert estimates[q] == pytest.approx(expected[q], rel=0.01)
+
+
+def test_remove_and_merge_match_direct_sketch():
+    """Test removals and merges give the same sketch as adding the surviving values"""
+    left, right = _skewed_salaries(3000, seed=2), _skewed_salaries(3000, seed=3)
+    merged = QuantileSketch()
+    for value in left:
+        merged.add(value)
+    other = QuantileSketch()
+    for value in right + [0.0]:
+        other.add(value)
+    merged.merge(other)
+    for value in left[:1000]:
+        merged.remove(value)
+    
+    direct = QuantileSketch()
+    for value in left[1000:] + right + [0.0]:
+        direct.add(value)
+    
+    qs = [0.0, 0.5, 0.9, 0.99, 1.0]
+    assert merged.count == direct.count
+    assert merged.quantiles(qs) == direct.quantiles(qs)
+
+
+def test_merge_rejects_different_accuracy():
+    """Test sketches with different error bounds cannot be merged"""
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
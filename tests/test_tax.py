@@ -0,0 +1,96 @@
+import json
+import random
+import numpy as np
+import pytest
+from flask import has_app_context
+from app import create_app
+from payroll import compute_payroll, payroll_rows
+from services import calculate_net_salary
+from tax import TaxRules, TaxTable
+
+
+# India-style slabs: 0% up to 300000, 5% to 700000, 10% to 1000000, then 30%
+SLABS = [
+    {'from': 0, 'rate': 0.0},
+    {'from': 300000, 'rate': 0.05},
+    {'from': 700000, 'rate': 0.10},
+    {'from': 1000000, 'rate': 0.30}
+]
+
+
+@pytest.fixture
+def slab_app(tmp_path):
+    """Application whose India TDS uses progressive slabs"""
+    path = tmp_path / 'tax_rules.json'
+    path.write_text(json.dumps({'India': SLABS, 'United States': [{'from': 0, 'rate': 0.12}]}))
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'TAX_RULES_PATH': str(path)})
+    with app.app_context():
+        yield app
+
+
+@pytest.mark.parametrize('gross, expected', [
+    (0, 0), (250000, 0), (300000, 0), (500000, 10000), (700000, 20000),
+    (800000, 30000), (1000000, 50000), (1200000, 110000)
+])
+def test_slab_table_taxes_each_slab_at_its_rate(gross, expected):
+    """Test every part of the salary is taxed at the rate of its slab"""
+    table = TaxTable(SLABS)
+    
+    assert table.tax(gross) == pytest.approx(expected)
+    assert table.tax_array(np.array([float(gross)]))[0] == table.tax(gross)
+
+
+def test_single_slab_is_exactly_the_flat_rate():
+    """Test a one-slab table gives bit-identical results to gross * rate"""
+    table = TaxTable([{'from': 0, 'rate': 0.12}])
+    rng = random.Random(3)
+    salaries = [round(rng.uniform(1000, 500000), 2) for _ in range(1000)]
+    
+    assert [table.tax(salary) for salary in salaries] == [salary * 0.12 for salary in salaries]
+    assert table.tax_array(np.array(salaries)).tolist() == [salary * 0.12 for salary in salaries]
+
+
+@pytest.mark.parametrize('slabs', [
+    [],
+    [{'from': 1000, 'rate': 0.1}],
+    [{'from': 0, 'rate': 0.1}, {'from': 0, 'rate': 0.2}],
+    [{'from': 0, 'rate': 1.5}],
+    [{'rate': 0.1}]
+])
+def test_invalid_slabs_are_rejected(slabs):
+    """Test tables must start at 0, increase and use rates between 0 and 1"""
+    with pytest.raises(ValueError, match='Invalid tax slabs for India'):
+        TaxRules.from_dict({'India': slabs})
+
+
+def test_vectorized_taxes_match_scalar_taxes():
+    """Test searchsorted over a batch gives the same values as one bisect per employee"""
+    rules = TaxRules.from_dict({'India': SLABS, 'United States': [{'from': 0, 'rate': 0.12}]})
+    rng = random.Random(11)
+    countries = [rng.choice(['India', 'United States', 'Canada']) for _ in range(5000)]
+    salaries = [round(rng.uniform(0, 2000000), 2) for _ in range(5000)] + [300000.0, 1000000.0]
+    countries += ['India', 'India']
+    
+    batch = rules.tax_array(np.array(salaries), countries)
+    
+    assert batch.tolist() == [rules.tax(salary, country) for salary, country in zip(salaries, countries)]
+
+
+def test_net_salary_uses_configured_slabs(slab_app):
+    """Test calculate_net_salary and the batch payroll both go through the slab tables"""
+    assert calculate_net_salary(1200000, 'India') == {'gross_salary': 1200000, 'tds': 110000, 'net_salary': 1090000}
+    assert calculate_net_salary(100000, 'United States')['tds'] == 12000
+    
+    salaries = np.array([1200000.0, 500000.0, 100000.0])
+    countries = ['India', 'India', 'Canada']
+    tds, net = compute_payroll(salaries, countries, slab_app.extensions['tax_rules'])
+    rows = payroll_rows(np.arange(3), salaries, tds, net, countries)
+    assert [row['tds'] for row in rows] == [110000, 10000, 0]
+
+
+def test_net_salary_without_an_application():
+    """Test calculate_net_salary stays usable as a plain function, with the shipped rules"""
+    assert not has_app_context()
+    
+    assert calculate_net_salary(100000, 'India') == {'gross_salary': 100000, 'tds': 10000, 'net_salary': 90000}
+    assert calculate_net_salary(100000, 'Germany')['tds'] == 0